@@ -3,7 +3,26 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from bisect import bisect_right
 from datetime import datetime
+from HDT_CORE_INFRASTRUCTURE import json_codec
+from HDT_CORE_INFRASTRUCTURE.extraction import PropertyTable, json_value
+from HDT_CORE_INFRASTRUCTURE.json_stream import iter_response_items
+
+try:
+    import numpy as np
+except ImportError:  # the single-pass glucose response implementation is used without NumPy
+    np = None
+
+# Blood glucose ranges (inclusive, mmol/L) of critical (red) and normal (green) values
+BLOOD_GLUCOSE_COLORED_REGIONS = {
+    "red": [(0, 2.6), (15, 20)],
+    "green": [(4.5, 8)],
+    # Other ranges omitted for brevity
+}
+
+# Below this total number of glucose readings, the single-pass implementation is faster than NumPy
+VECTORIZE_MIN_READINGS = 512
 
 def parse_json_trivia(response_trivia):
     """
@@ -20,6 +39,68 @@ def parse_json_trivia(response_trivia):
 
     Raises:
         No exceptions are raised as they are caught and logged internally
+
+    The response body is decoded incrementally, one activity at a time.
+    """
+    # Check if response is valid
+    if not response_trivia or not hasattr(response_trivia, 'text'):
+        logger.warning("Empty or invalid response received from GameBus API")
+        return parse_trivia_activities([])
+
+    try:
+        return parse_trivia_activities(iter_response_items(response_trivia))
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error parsing trivia response: {str(e)}")
+        return parse_trivia_activities([])
+
+
+def latest_of(latest_activity, activity):
+    """
+    Return the most recent of two activities; on equal dates the one seen first is kept.
+    """
+    if latest_activity is None or activity["date"] > latest_activity["date"]:
+        return activity
+    return latest_activity
+
+
+def count_through_hint(state, value, prop):
+    if value == "true":
+        state["metrics"]["WITH_HINT"]["TRUE"] += 1
+        state["through_hint"] = True
+    elif value == "false":
+        state["metrics"]["WITH_HINT"]["FALSE"] += 1
+        state["through_hint"] = False
+
+
+def count_question_correct(state, value, prop):
+    # Only answers given without a hint are counted
+    if state["through_hint"] is False:
+        if value == "true":
+            state["metrics"]["NO_HINT_TYPE_OF_ANSWER"]["CORRECT"] += 1
+        elif value == "false":
+            state["metrics"]["NO_HINT_TYPE_OF_ANSWER"]["INCORRECT"] += 1
+
+
+TRIVIA_PROPERTIES = PropertyTable("trivia", {
+    "THROUGH_HINT": count_through_hint,
+    "QUESTION_CORRECT": count_question_correct,
+})
+
+
+def parse_trivia_activities(activities):
+    """
+    Compute the trivia metrics of GameBus ANSWER_TRIVIA_DIABETES activities in a single pass.
+
+    Args:
+        activities (iterable): Decoded activity records, as returned by the GameBus API. May be a
+            generator, e.g. from an incrementally decoded response.
+
+    Raises:
+        json.JSONDecodeError, OSError: If `activities` is a decoding generator and the payload is
+            malformed or the connection breaks.
+
+    Returns:
+        tuple: (metrics, latest_activity_info), see parse_json_trivia.
     """
     metrics = {
         "WITH_HINT": {
@@ -32,70 +113,49 @@ def parse_json_trivia(response_trivia):
         }
     }
     latest_activity_info = {"id": None, "timestamp": None}
+    latest_activity = None
+    latest_activity_error = None
+    record_count = 0
+    state = {"metrics": metrics, "through_hint": None}
 
     try:
-        # Check if response is valid
-        if not response_trivia or not hasattr(response_trivia, 'text') or not response_trivia.text:
-            logger.warning("Empty or invalid response received from GameBus API")
-            return metrics, latest_activity_info
-
-        parsed_response_trivia = json.loads(response_trivia.text)
-
-        # Check if we have any activities
-        if not parsed_response_trivia:
-            logger.info("No trivia activities found in the response")
-            return metrics, latest_activity_info
-
-        # Sort by date in descending order to get the most recent activity
-        try:
-            sorted_activities = sorted(parsed_response_trivia, key=lambda x: x["date"], reverse=True)
-            latest_activity = sorted_activities[0]
-            latest_activity_info["id"] = latest_activity["id"]
-            # Convert UNIX timestamp to human-readable format
-            latest_activity_info["timestamp"] = datetime.utcfromtimestamp(latest_activity["date"] / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            logger.info(f"Latest trivia activity found: ID {latest_activity_info['id']} at {latest_activity_info['timestamp']}")
-        except (KeyError, IndexError) as e:
-            logger.error(f"Error extracting latest activity info: {str(e)}")
-
         # Process each record
-        for record_index, record in enumerate(parsed_response_trivia):
-            through_hint = None
+        for record_index, record in enumerate(activities):
+            record_count += 1
+            state["through_hint"] = None
+
+            # Track the most recent activity
+            if latest_activity_error is None:
+                try:
+                    latest_activity = latest_of(latest_activity, record)
+                except KeyError as e:
+                    latest_activity_error = e
 
             if "propertyInstances" not in record:
                 logger.warning(f"Record {record_index} missing propertyInstances")
                 continue
 
-            for element in record["propertyInstances"]:
-                try:
-                    if "property" not in element or "translationKey" not in element["property"]:
-                        continue
-
-                    if element["property"]["translationKey"] == "THROUGH_HINT":
-                        if element["value"] == "true":
-                            metrics["WITH_HINT"]["TRUE"] += 1
-                            through_hint = True
-                        elif element["value"] == "false":
-                            metrics["WITH_HINT"]["FALSE"] += 1
-                            through_hint = False
-                except Exception as e:
-                    logger.error(f"Error parsing THROUGH_HINT in record {record_index}: {str(e)}")
-
-                try:
-                    if (
-                        element["property"]["translationKey"] == "QUESTION_CORRECT"
-                        and through_hint is False
-                    ):
-                        if element["value"] == "true":
-                            metrics["NO_HINT_TYPE_OF_ANSWER"]["CORRECT"] += 1
-                        elif element["value"] == "false":
-                            metrics["NO_HINT_TYPE_OF_ANSWER"]["INCORRECT"] += 1
-                except Exception as e:
-                    logger.error(f"Error parsing QUESTION_CORRECT in record {record_index}: {str(e)}")
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error parsing trivia response: {str(e)}")
+            TRIVIA_PROPERTIES.extract(record["propertyInstances"], state, record_index)
+    except (json.JSONDecodeError, OSError):
+        raise  # errors of the underlying stream (malformed payload, broken connection) are left to the caller
     except Exception as e:
         logger.error(f"Unexpected error parsing trivia response: {str(e)}")
 
+    # Check if we have any activities
+    if not record_count:
+        logger.info("No trivia activities found in the response")
+        return metrics, latest_activity_info
+
+    try:
+        if latest_activity_error is not None:
+            raise latest_activity_error
+        latest_activity_info["id"] = latest_activity["id"]
+        # Convert UNIX timestamp to human-readable format
+        latest_activity_info["timestamp"] = datetime.utcfromtimestamp(latest_activity["date"] / 1000).strftime('%Y-%m-%d %H:%M:%S')
+        logger.info(f"Latest trivia activity found: ID {latest_activity_info['id']} at {latest_activity_info['timestamp']}")
+    except (KeyError, TypeError) as e:
+        logger.error(f"Error extracting latest activity info: {str(e)}")
+
     logger.info(f"Parsed trivia metrics: {metrics}")
     return metrics, latest_activity_info
 
@@ -104,6 +164,107 @@ def parse_json_trivia(response_trivia):
 def parse_json_sugarvita(response_pt, response_hl):
     """
     Parse sugarvita data dynamically from the GameBus API responses for playthrough and engagement logs.
+
+    Both response bodies are decoded incrementally, one activity at a time.
+    """
+    try:
+        return parse_sugarvita_activities(iter_response_items(response_pt), iter_response_items(response_hl))
+    except OSError:
+        raise  # connection errors while streaming the body are handled by the fetcher
+    except Exception as e:
+        logger.error(f"Error parsing sugarvita response: {str(e)}")
+        return parse_sugarvita_activities([], [])
+
+
+def append_int(metric):
+    def append(metrics_per_session, value, prop):
+        metrics_per_session[metric].append(int(value))
+    return append
+
+
+@json_value
+def count_playthrough_paths(metrics_per_session, playthrough_data, prop):
+    metrics_per_session["DAYS_PLAYED"].append(playthrough_data["daysPlayed"])
+    home_path, outdoors_path, work_path = 0, 0, 0
+
+    for turn in playthrough_data["turns"]:
+        if turn["DestinationPathType"] == 1:
+            home_path += 1
+        elif turn["DestinationPathType"] == 2:
+            outdoors_path += 1
+        elif turn["DestinationPathType"] == 3:
+            work_path += 1
+
+    metrics_per_session["HOME_PATH"].append(home_path)
+    metrics_per_session["WORK_PATH"].append(work_path)
+    metrics_per_session["OUTDOORS_PATH"].append(outdoors_path)
+
+
+@json_value
+def collect_engagement_turns(state, engagement_data, prop):
+    metrics_per_session = state["metrics"]
+    current_score = state["current_score"]
+    glucose_values_each_turn = state["glucose_values_each_turn"]
+    turn_time = state["turn_time"]
+
+    append_score, append_glucose, append_time = current_score.append, glucose_values_each_turn.append, turn_time.append
+
+    for gameplaydata in engagement_data["GameplayData"]:
+        # Each gameplay holds its own JSON document; decode it only now that it is needed
+        gameplaydata_values = json_codec.loads(gameplaydata["Values"][0])
+        if gameplaydata_values["aborted"] is False:
+            for turn in gameplaydata_values["turns"]:
+                score = turn["CurrentScore"]
+                if score != 0:
+                    append_score(score)
+                if turn["IsHospitalised"]:
+                    state["is_hospitalised"] += 1
+                if not glucose_values_each_turn and not turn_time:
+                    append_glucose(turn["GlucoseValueStart"])
+                    if turn["GlucoseValueEnd"] != 0.0:
+                        append_glucose(turn["GlucoseValueEnd"])
+                    append_time(turn["MinutesStart"])
+                    if turn["MinutesEnd"] != 0:
+                        append_time(turn["MinutesEnd"])
+                else:
+                    append_glucose(turn["GlucoseValueEnd"])
+                    append_time(turn["MinutesEnd"])
+
+            if current_score and turn_time and glucose_values_each_turn:
+                metrics_per_session["SCORE_VARIATION"].append(current_score[:-1] if current_score[-1] == 0 else current_score)
+                metrics_per_session["TURN_TIME"].append(turn_time[:-1] if turn_time[-1] == 0 else turn_time)
+                metrics_per_session["GLUCOSE_LEVELS"].append(glucose_values_each_turn[:-1] if glucose_values_each_turn[-1] == 0 else glucose_values_each_turn)
+                metrics_per_session["TOTAL_TRIPS_HOSPITAL"].append(state["is_hospitalised"])
+
+
+SUGARVITA_PLAYTHROUGH_PROPERTIES = PropertyTable("sugarvita playthrough", {
+    "SCORE": append_int("SCORES"),
+    "PLAYTIME": append_int("PLAYTIMES"),
+    "GLUCOSE_RANGE_PERCENTAGE": append_int("GLUCOSE_ACCURACY"),
+    "PLAYTHROUGH_DATA": count_playthrough_paths,
+})
+
+SUGARVITA_ENGAGEMENT_PROPERTIES = PropertyTable("sugarvita engagement", {
+    "ENGAGEMENT_DATA": collect_engagement_turns,
+})
+
+
+def parse_sugarvita_activities(playthroughs, engagements):
+    """
+    Compute the SugarVita metrics of GameBus SUGARVITA_PLAYTHROUGH and SUGARVITA_ENGAGEMENT_LOG_1 activities.
+
+    Each activity is processed once, so both arguments may be generators.
+
+    Args:
+        playthroughs (iterable): Decoded SUGARVITA_PLAYTHROUGH activity records.
+        engagements (iterable): Decoded SUGARVITA_ENGAGEMENT_LOG_1 activity records.
+
+    Returns:
+        tuple: (metrics_per_session, latest_activity_info)
+
+    Raises:
+        json.JSONDecodeError, OSError: If an argument is a decoding generator and the payload is
+            malformed or the connection breaks.
     """
     metrics_per_session = {
         "SCORES": [],
@@ -121,200 +282,172 @@ def parse_json_sugarvita(response_pt, response_hl):
     }
     latest_activity_info = {"playthrough": {"id": None, "timestamp": None}, "engagement": {"id": None, "timestamp": None}}
 
+    latest_playthrough, latest_engagement = None, None
+
     try:
-        parsed_response_pt = json.loads(response_pt.text)
-        parsed_response_hl = json.loads(response_hl.text)
+        # Parse playthrough data
+        for record in playthroughs:
+            latest_playthrough = latest_of(latest_playthrough, record)
+            SUGARVITA_PLAYTHROUGH_PROPERTIES.extract(record["propertyInstances"], metrics_per_session)
 
-        # Sort playthrough data by date in descending order
-        if parsed_response_pt:
-            sorted_playthrough = sorted(parsed_response_pt, key=lambda x: x["date"], reverse=True)
-            latest_playthrough = sorted_playthrough[0]
+        if latest_playthrough is not None:
             latest_activity_info["playthrough"]["id"] = latest_playthrough["id"]
             # Convert UNIX timestamp to human-readable format
             latest_activity_info["playthrough"]["timestamp"] = datetime.utcfromtimestamp(latest_playthrough["date"] / 1000).strftime('%Y-%m-%d %H:%M:%S')
 
-        # Sort engagement data by date in descending order
-        if parsed_response_hl:
-            sorted_engagement = sorted(parsed_response_hl, key=lambda x: x["date"], reverse=True)
-            latest_engagement = sorted_engagement[0]
+        # Parse engagement logs
+        for record in engagements:
+            latest_engagement = latest_of(latest_engagement, record)
+            state = {
+                "metrics": metrics_per_session,
+                "current_score": [],
+                "glucose_values_each_turn": [],
+                "turn_time": [],
+                "is_hospitalised": 0,
+            }
+            SUGARVITA_ENGAGEMENT_PROPERTIES.extract(record["propertyInstances"], state)
+
+        if latest_engagement is not None:
             latest_activity_info["engagement"]["id"] = latest_engagement["id"]
             # Convert UNIX timestamp to human-readable format
             latest_activity_info["engagement"]["timestamp"] = datetime.utcfromtimestamp(latest_engagement["date"] / 1000).strftime('%Y-%m-%d %H:%M:%S')
 
-        # Parse playthrough data
-        for record in parsed_response_pt:
-            for element in record["propertyInstances"]:
-                try:
-                    if element["property"]["translationKey"] == "SCORE":
-                        metrics_per_session["SCORES"].append(int(element["value"]))
-                except:
-                    metrics_per_session["SCORES"].append("NaN")
-
-                try:
-                    if element["property"]["translationKey"] == "PLAYTIME":
-                        metrics_per_session["PLAYTIMES"].append(int(element["value"]))
-                except:
-                    metrics_per_session["PLAYTIMES"].append("NaN")
-
-                try:
-                    if element["property"]["translationKey"] == "GLUCOSE_RANGE_PERCENTAGE":
-                        metrics_per_session["GLUCOSE_ACCURACY"].append(
-                            int(element["value"])
-                        )
-                except Exception as e:
-                    logger.error(f"Error parsing GLUCOSE_RANGE_PERCENTAGE: {str(e)}")
-
-                try:
-                    if element["property"]["translationKey"] == "PLAYTHROUGH_DATA":
-                        playthrough_data = json.loads(element["value"])
-                        metrics_per_session["DAYS_PLAYED"].append(playthrough_data["daysPlayed"])
-                        home_path, outdoors_path, work_path = 0, 0, 0
-
-                        for turn in playthrough_data["turns"]:
-                            if turn["DestinationPathType"] == 1:
-                                home_path += 1
-                            elif turn["DestinationPathType"] == 2:
-                                outdoors_path += 1
-                            elif turn["DestinationPathType"] == 3:
-                                work_path += 1
-
-                        metrics_per_session["HOME_PATH"].append(home_path)
-                        metrics_per_session["WORK_PATH"].append(work_path)
-                        metrics_per_session["OUTDOORS_PATH"].append(outdoors_path)
-                except Exception as e:
-                    logger.error(f"Error parsing PLAYTHROUGH_DATA: {str(e)}")
-
-        # Parse engagement logs
-        for record in parsed_response_hl:
-            current_score = []
-            glucose_values_each_turn = []
-            turn_time = []
-            is_hospitalised = 0
-
-            for element in record["propertyInstances"]:
-                try:
-                    if element["property"]["translationKey"] == "ENGAGEMENT_DATA":
-                        engagement_data = json.loads(element["value"])
-                        for gameplaydata in engagement_data["GameplayData"]:
-                            gameplaydata_values = json.loads(gameplaydata["Values"][0])
-                            if gameplaydata_values["aborted"] is False:
-                                for turn in gameplaydata_values["turns"]:
-                                    if turn["CurrentScore"] != 0:
-                                        current_score.append(turn["CurrentScore"])
-                                    if turn["IsHospitalised"]:
-                                        is_hospitalised += 1
-                                    if glucose_values_each_turn == [] and turn_time == []:
-                                        glucose_values_each_turn.append(turn["GlucoseValueStart"])
-                                        if turn["GlucoseValueEnd"] != 0.0:
-                                            glucose_values_each_turn.append(turn["GlucoseValueEnd"])
-                                        turn_time.append(turn["MinutesStart"])
-                                        if turn["MinutesEnd"] != 0:
-                                            turn_time.append(turn["MinutesEnd"])
-                                    else:
-                                        glucose_values_each_turn.append(turn["GlucoseValueEnd"])
-                                        turn_time.append(turn["MinutesEnd"])
-
-                                if current_score and turn_time and glucose_values_each_turn:
-                                    metrics_per_session["SCORE_VARIATION"].append(current_score[:-1] if current_score[-1] == 0 else current_score)
-                                    metrics_per_session["TURN_TIME"].append(turn_time[:-1] if turn_time[-1] == 0 else turn_time)
-                                    metrics_per_session["GLUCOSE_LEVELS"].append(glucose_values_each_turn[:-1] if glucose_values_each_turn[-1] == 0 else glucose_values_each_turn)
-                                    metrics_per_session["TOTAL_TRIPS_HOSPITAL"].append(is_hospitalised)
-                except Exception as e:
-                    logger.error(f"Error parsing ENGAGEMENT_DATA: {str(e)}")
-
         # Calculate critical glucose values
         metrics_per_session["GLUCOSE_CRITICAL_VALUE_RESPONSE"] = get_glucose_critical_value_response(
             metrics_per_session["GLUCOSE_LEVELS"], metrics_per_session["TURN_TIME"]
         )
+    except (json.JSONDecodeError, OSError):
+        raise  # errors of the underlying stream (malformed payload, broken connection) are left to the caller
     except Exception as e:
         logger.error(f"Error parsing sugarvita response: {str(e)}")
 
     return metrics_per_session, latest_activity_info
 
 
-def get_glucose_critical_value_response(glucose_levels, times):
+def get_glucose_critical_value_response(glucose_levels, times, regions=None):
     """
     Calculate critical glucose values dynamically.
 
     This function analyzes glucose level readings and their timestamps to determine
     how quickly a user responds to critical (red) glucose values by bringing them
-    back to normal (green) range.
+    back to normal (green) range. For each playthrough, the first red reading and the
+    first green reading after it are used.
+
+    All playthroughs are processed as one ragged batch with NumPy when it is available and
+    the batch is large enough; otherwise a single pass over each playthrough is made. Both
+    give the same results.
 
     Args:
         glucose_levels (list): List of lists containing glucose readings for each playthrough
         times (list): List of lists containing timestamps for each glucose reading
+        regions (dict): Optional "red" and "green" lists of inclusive (low, high) glucose ranges;
+            defaults to BLOOD_GLUCOSE_COLORED_REGIONS
 
     Returns:
         list: List of response times (in minutes) between red and green glucose values
     """
-    glucose_critical_value_response = []
+    regions = regions or BLOOD_GLUCOSE_COLORED_REGIONS
+    # Skip playthroughs where either list is empty
+    playthroughs = [(glucose, turn_times) for glucose, turn_times in zip(glucose_levels, times) if glucose and turn_times]
 
-    values_to_calculate_critical_value_response = {
-        "red_glucose_value": -1,
-        "closest_green_glucose_value": -1,
-        "time_red": -1,
-        "time_closest_green": -1,
-    }
+    if playthroughs and np is not None and sum(len(glucose) for glucose, _ in playthroughs) >= VECTORIZE_MIN_READINGS:
+        responses = critical_value_response_batch(playthroughs, regions)
+        if responses is not None:
+            return responses
+    return critical_value_response_single_pass(playthroughs, regions)
 
-    blood_glucose_colored_regions = {
-        "red": [(0, 2.6), (15, 20)],
-        "green": [(4.5, 8)],
-        # Other ranges omitted for brevity
-    }
 
-    for glucose_playthrough, times_playthrough in zip(glucose_levels, times):
-        # Skip if either list is empty
-        if not glucose_playthrough or not times_playthrough:
+def region_bounds(ranges):
+    """
+    Merge inclusive (low, high) ranges into sorted, disjoint lists of lower and upper bounds.
+    """
+    lows, highs = [], []
+    for low, high in sorted(r for r in ranges if r[0] <= r[1]):
+        if highs and low <= highs[-1]:
+            highs[-1] = max(highs[-1], high)
+        else:
+            lows.append(low)
+            highs.append(high)
+    return lows, highs
+
+
+def first_in_regions(values, start, bounds):
+    """
+    Return the index of the first value from `start` on that falls in one of the ranges, or None.
+    """
+    lows, highs = bounds
+    for i in range(start, len(values)):
+        value = values[i]
+        k = bisect_right(lows, value)  # the only range that can hold the value starts at lows[k - 1]
+        if k and value <= highs[k - 1]:
+            return i
+    return None
+
+
+def critical_value_response_single_pass(playthroughs, regions):
+    """
+    Find the red-to-green response time of each playthrough with one pass over its readings.
+
+    The ranges are merged into sorted bounds once, so each reading is tested with a single bisection.
+    """
+    red_bounds, green_bounds = region_bounds(regions["red"]), region_bounds(regions["green"])
+    glucose_critical_value_response = []
+
+    for glucose_playthrough, times_playthrough in playthroughs:
+        red_index = first_in_regions(glucose_playthrough, 0, red_bounds)
+        if red_index is None:
+            continue
+        time_red = times_playthrough[red_index]
+
+        # Look for closest green value after the first red value
+        green_index = first_in_regions(glucose_playthrough, red_index + 1, green_bounds)
+        if green_index is None:
             continue
 
-        # Reset values for this playthrough
-        values = reset_dictionary_values(values_to_calculate_critical_value_response.copy())
-
-        # Iterate through glucose values to find red values
-        for i, glucose in enumerate(glucose_playthrough):
-            # Check if glucose is in red region
-            is_red = False
-            for red_range in blood_glucose_colored_regions["red"]:
-                if red_range[0] <= glucose <= red_range[1]:
-                    is_red = True
-                    break
-
-            if is_red and values["red_glucose_value"] == -1:
-                # Found first red value
-                values["red_glucose_value"] = glucose
-                values["time_red"] = times_playthrough[i]
-
-                # Look for closest green value after this red value
-                for j in range(i+1, len(glucose_playthrough)):
-                    next_glucose = glucose_playthrough[j]
-
-                    # Check if next glucose is in green region
-                    is_green = False
-                    for green_range in blood_glucose_colored_regions["green"]:
-                        if green_range[0] <= next_glucose <= green_range[1]:
-                            is_green = True
-                            break
-
-                    if is_green:
-                        # Found green value after red
-                        values["closest_green_glucose_value"] = next_glucose
-                        values["time_closest_green"] = times_playthrough[j]
-                        break
-
-                # If we found both red and green values, calculate response time
-                if values["red_glucose_value"] != -1 and values["closest_green_glucose_value"] != -1:
-                    response_time = values["time_closest_green"] - values["time_red"]
-                    if response_time > 0:  # Ensure positive response time
-                        glucose_critical_value_response.append(response_time)
-                    break
+        response_time = times_playthrough[green_index] - time_red
+        if response_time > 0:  # Ensure positive response time
+            glucose_critical_value_response.append(response_time)
 
     return glucose_critical_value_response
 
 
-def reset_dictionary_values(some_dict) -> dict:
+def critical_value_response_batch(playthroughs, regions):
     """
-    Reset dictionary values to their default state.
+    Find the red-to-green response time of all playthroughs at once with NumPy.
+
+    The readings of all playthroughs are concatenated; the first red index and the first green
+    index after it are found per playthrough with segmented minimum reductions.
+
+    Returns:
+        list: The response times, or None if the readings are not all numeric.
     """
-    for key in some_dict:
-        some_dict[key] = -1
-    return some_dict
+    flat = np.array([glucose for glucose_playthrough, _ in playthroughs for glucose in glucose_playthrough])
+    if flat.dtype.kind not in "biuf":
+        return None  # e.g. strings or None; the single-pass implementation reproduces their errors
+
+    lengths = np.array([len(glucose_playthrough) for glucose_playthrough, _ in playthroughs], dtype=np.intp)
+    offsets = np.concatenate((np.zeros(1, dtype=np.intp), np.cumsum(lengths)[:-1]))
+    positions = np.arange(flat.size)
+    not_found = flat.size
+
+    def mask(ranges):
+        result = np.zeros(flat.size, dtype=bool)
+        for low, high in ranges:
+            result |= (low <= flat) & (flat <= high)
+        return result
+
+    first_red = np.minimum.reduceat(np.where(mask(regions["red"]), positions, not_found), offsets)
+    after_red = positions > np.repeat(first_red, lengths)
+    first_green = np.minimum.reduceat(np.where(mask(regions["green"]) & after_red, positions, not_found), offsets)
+
+    glucose_critical_value_response = []
+    for k in np.flatnonzero(first_red < not_found):
+        times_playthrough = playthroughs[k][1]
+        time_red = times_playthrough[first_red[k] - offsets[k]]
+        if first_green[k] == not_found:
+            continue
+        response_time = times_playthrough[first_green[k] - offsets[k]] - time_red
+        if response_time > 0:  # Ensure positive response time
+            glucose_critical_value_response.append(response_time)
+
+    return glucose_critical_value_response
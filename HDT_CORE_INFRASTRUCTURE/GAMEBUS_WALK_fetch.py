@@ -1,22 +1,24 @@
 import requests
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_activities import iter_activities
+from HDT_CORE_INFRASTRUCTURE.activity_cache import cached_fetch
 from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_parse import parse_walk_activities
 
-def fetch_walk_data(player_id, auth_bearer):
+WALK_GDS = "WALK"
+
+@cached_fetch("GameBus", WALK_GDS)
+def fetch_walk_data(player_id, auth_bearer, start_date=None, end_date=None, columnar=False):
     """
-    Fetch walk activity data for a player from the GameBus API.
+    Fetch walk activity data for a player from the GameBus API, optionally limited to a date range
+    (ISO 8601 start_date/end_date, YYYY-MM-DDTHH:MM:SSZ). With columnar=True the data is returned as
+    columns (see walk_columns).
     """
-    endpoint = f"https://api3-new.gamebus.eu/v2/players/{player_id}/activities?gds=WALK"
-    headers = {"Authorization": f"Bearer {auth_bearer}"}
-
     try:
-        response = requests.get(endpoint, headers=headers)
-        response.raise_for_status()
-        activities_json = response.json()
-        return parse_walk_activities(activities_json)  # Parse the activities
+        # Activities are parsed page by page while they are being downloaded
+        activities = iter_activities(player_id, WALK_GDS, auth_bearer, start_date, end_date)
+        return parse_walk_activities(activities, columnar=columnar)  # Parse the activities
     except requests.exceptions.RequestException as e:
         print(f"Error fetching walk data for player {player_id}: {e}")
         return []
     except Exception as e:
         print(f"Unexpected error while parsing walk data for player {player_id}: {e}")
         return []
-
@@ -1,75 +1,126 @@
 import pytz
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from HDT_CORE_INFRASTRUCTURE.extraction import PropertyTable
+from HDT_CORE_INFRASTRUCTURE.walk_columns import ColumnRow, new_walk_columns
+
+DUTCH_TIMEZONE = pytz.timezone('Europe/Amsterdam')
+
+# Amsterdam changes its UTC offset on whole hours, so the offset is looked up once per UTC hour
+@lru_cache(maxsize=65536)
+def dutch_utc_offset(utc_hour):
+    return int(datetime.fromtimestamp(utc_hour * 3600, tz=DUTCH_TIMEZONE).utcoffset().total_seconds())
+
+@lru_cache(maxsize=65536)
+def format_epoch_day(day):
+    return (date(1970, 1, 1) + timedelta(days=day)).strftime('%Y-%m-%d')
 
 # Convert Unix timestamp to local Dutch time (handling DST).
 def convert_to_local_dutch_time(timestamp):
     """
     Convert a Unix timestamp to local Dutch time (Europe/Amsterdam).
     """
-    timestamp_seconds = timestamp / 1000  # Convert milliseconds to seconds
-    utc_time = datetime.utcfromtimestamp(timestamp_seconds).replace(tzinfo=pytz.utc)
-    dutch_timezone = pytz.timezone('Europe/Amsterdam')
-    local_time = utc_time.astimezone(dutch_timezone)
-    return local_time.strftime('%Y-%m-%d %H:%M:%S')
+    timestamp_seconds = int(timestamp // 1000)  # Convert milliseconds to (whole) seconds
+    local_seconds = timestamp_seconds + dutch_utc_offset(timestamp_seconds // 3600)
+    day, second_of_day = divmod(local_seconds, 86400)
+    hours, remainder = divmod(second_of_day, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{format_epoch_day(day)} {hours:02d}:{minutes:02d}:{seconds:02d}"
 
 # Convert seconds to HH:MM:SS format
 def convert_seconds_to_hms(seconds):
     """
     Convert seconds to HH:MM:SS format.
     """
-    return str(timedelta(seconds=int(seconds)))
+    seconds = int(seconds)
+    if not 0 <= seconds < 86400:
+        return str(timedelta(seconds=seconds))  # e.g. "1 day, 2:03:04"
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+# Conversions of a property value by its baseUnit; values in other units are ignored
+DISTANCE_TO_METERS = {
+    'meters': lambda value: float(value),
+    'centimeters': lambda value: float(value) / 100,
+    'kilometers': lambda value: float(value) * 1000,
+}
+
+DURATION_TO_HMS = {
+    'seconds': lambda value: convert_seconds_to_hms(value),
+    'minutes': lambda value: convert_seconds_to_hms(float(value) * 60),
+    'hours': lambda value: convert_seconds_to_hms(float(value) * 3600),
+}
+
+DURATION_TO_SECONDS = {
+    'seconds': lambda value: float(value),
+    'minutes': lambda value: float(value) * 60,
+    'hours': lambda value: float(value) * 3600,
+}
+
+def set_float(field):
+    def handler(activity_data, value, prop):
+        activity_data[field] = float(value)
+    return handler
+
+def set_by_unit(field, conversions):
+    def handler(activity_data, value, prop):
+        convert = conversions.get(prop['baseUnit'])
+        if convert is not None:
+            activity_data[field] = convert(value)
+    return handler
+
+WALK_PROPERTIES = PropertyTable("walk", {
+    'STEPS': set_float('steps'),
+    'DISTANCE': set_by_unit('distance_meters', DISTANCE_TO_METERS),
+    'DURATION': set_by_unit('duration', DURATION_TO_HMS),
+    'KCALORIES': set_float('kcalories'),
+}, log_errors=False)
+
+# Same properties for the columnar format, with the duration in seconds instead of HH:MM:SS
+WALK_COLUMN_PROPERTIES = PropertyTable("walk", {
+    'STEPS': set_float('steps'),
+    'DISTANCE': set_by_unit('distance_meters', DISTANCE_TO_METERS),
+    'DURATION': set_by_unit('duration_seconds', DURATION_TO_SECONDS),
+    'KCALORIES': set_float('kcalories'),
+}, log_errors=False)
 
 # Parse walk activities data from the GameBus API
-def parse_walk_activities(activities_json):
+def parse_walk_activities(activities_json, columnar=False):
     """
     Parse walk activity data from the GameBus API response.
+
+    With columnar=True, return one list per field instead of one dict per activity (see walk_columns).
     """
+    if columnar:
+        return parse_walk_activity_columns(activities_json)
+
     parsed_activities = []
 
     for activity in activities_json:
-        activity_data = {}
-
-        # Convert and store the activity date
-        activity_data['date'] = convert_to_local_dutch_time(activity['date'])
-
-        # Initialize activity metrics
-        steps = None
-        distance = None
-        duration = None
-        kcalories = None
-
-        # Extract property instances
-        for property_instance in activity.get('propertyInstances', []):
-            prop_key = property_instance['property']['translationKey']
-            value = property_instance['value']
-            base_unit = property_instance['property']['baseUnit']
-
-            if prop_key == 'STEPS':
-                steps = float(value)
-            elif prop_key == 'DISTANCE':
-                if base_unit == 'meters':
-                    distance = float(value)
-                elif base_unit == 'centimeters':
-                    distance = float(value) / 100
-                elif base_unit == 'kilometers':
-                    distance = float(value) * 1000
-            elif prop_key == 'DURATION':
-                if base_unit == 'seconds':
-                    duration = convert_seconds_to_hms(value)
-                elif base_unit == 'minutes':
-                    duration = convert_seconds_to_hms(float(value) * 60)
-                elif base_unit == 'hours':
-                    duration = convert_seconds_to_hms(float(value) * 3600)
-            elif prop_key == 'KCALORIES':
-                kcalories = float(value)
-
-        # Store the parsed metrics
-        activity_data['steps'] = steps
-        activity_data['distance_meters'] = distance
-        activity_data['duration'] = duration
-        activity_data['kcalories'] = kcalories
-
+        # Convert and store the activity date; metrics missing from the activity stay None
+        activity_data = {
+            'date': convert_to_local_dutch_time(activity['date']),
+            'steps': None,
+            'distance_meters': None,
+            'duration': None,
+            'kcalories': None,
+        }
+        WALK_PROPERTIES.extract(activity.get('propertyInstances', []), activity_data)
         parsed_activities.append(activity_data)
 
     return parsed_activities
 
+def parse_walk_activity_columns(activities_json):
+    """
+    Parse walk activity data into columns, keeping the epoch timestamps and numeric durations.
+    """
+    columns = new_walk_columns()
+    row = ColumnRow(columns)
+
+    for activity in activities_json:
+        row.append(activity['date'])
+        WALK_COLUMN_PROPERTIES.extract(activity.get('propertyInstances', []), row)
+
+    return columns
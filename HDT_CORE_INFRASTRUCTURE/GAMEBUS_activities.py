@@ -0,0 +1,220 @@
+import logging
+import os
+from datetime import datetime
+from HDT_CORE_INFRASTRUCTURE.http_client import http_get
+from HDT_CORE_INFRASTRUCTURE.json_stream import iter_response_items
+
+logger = logging.getLogger(__name__)
+
+GAMEBUS_ACTIVITIES_ENDPOINT_TEMPLATE = "https://api3-new.gamebus.eu/v2/players/{player_id}/activities?gds={gds}"
+
+# Paging defaults, overridable with HDT_GAMEBUS_PAGE_SIZE (0 disables paging) and HDT_GAMEBUS_MAX_PAGES
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_MAX_PAGES = 200
+
+
+def format_date_to_dd_mm_yyyy(date_str):
+    """
+    Converts an ISO 8601 date string to DD-MM-YYYY format that the GameBus API expects.
+    """
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ").strftime("%d-%m-%Y")
+    except ValueError:
+        logger.warning(f"Invalid date format: {date_str}. Skipping conversion.")
+        return None
+
+
+def load_paging_settings():
+    """
+    Load the GameBus page size and maximum number of pages per request from the environment.
+    """
+    try:
+        page_size = int(os.getenv("HDT_GAMEBUS_PAGE_SIZE", DEFAULT_PAGE_SIZE))
+        max_pages = int(os.getenv("HDT_GAMEBUS_MAX_PAGES", DEFAULT_MAX_PAGES))
+    except ValueError as e:
+        logger.error(f"Invalid GameBus paging configuration ({e}). Using defaults.")
+        page_size, max_pages = DEFAULT_PAGE_SIZE, DEFAULT_MAX_PAGES
+    return page_size, max_pages
+
+
+def build_activities_endpoint(player_id, gds, start_date=None, end_date=None, page=None, page_size=None):
+    """
+    Build the GameBus activities URL for a player and game descriptor (gds).
+
+    Args:
+        player_id (int): GameBus player ID.
+        gds (str): GameBus game descriptor, e.g. "ANSWER_TRIVIA_DIABETES" or "WALK".
+        start_date (str): Optional ISO 8601 start date (YYYY-MM-DDTHH:MM:SSZ).
+        end_date (str): Optional ISO 8601 end date (YYYY-MM-DDTHH:MM:SSZ).
+        page (int): Optional 0-based page number.
+        page_size (int): Number of activities per page; required with `page`.
+
+    Returns:
+        str: The activities endpoint including the optional date range.
+    """
+    # Convert dates to DD-MM-YYYY format that the GameBus API expects
+    start_date = format_date_to_dd_mm_yyyy(start_date) if start_date else None
+    end_date = format_date_to_dd_mm_yyyy(end_date) if end_date else None
+
+    endpoint = GAMEBUS_ACTIVITIES_ENDPOINT_TEMPLATE.format(player_id=player_id, gds=gds)
+    if start_date:
+        endpoint += f"&start={start_date}"
+    if end_date:
+        endpoint += f"&end={end_date}"
+    if page is not None:
+        endpoint += f"&page={page}&size={page_size}"
+    return endpoint
+
+
+def _iter_unpaged_activities(player_id, gds, auth_bearer, start_date=None, end_date=None):
+    # All activities in one response, decoded one at a time while it is being downloaded
+    endpoint = build_activities_endpoint(player_id, gds, start_date, end_date)
+    headers = {"Authorization": f"Bearer {auth_bearer}"}
+    with http_get(endpoint, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        yield from iter_response_items(response)
+
+
+def _first_activity_id(activities):
+    return activities[0].get("id") if activities and isinstance(activities[0], dict) else None
+
+
+class ActivityPaging:
+    """
+    Paging state of one GameBus activities request, shared by the blocking (iter_activity_pages) and
+    the async (connectors.py) fetchers.
+
+    Paging stops at the first page holding fewer than `page_size` activities. It also stops after
+    `max_pages` pages, which guards against unbounded downloads; the result is then truncated and a
+    warning is logged. If the upstream ignores the paging parameters, that page is the complete
+    result: it is either larger than requested, or the next page starts with the same activity.
+    With a page size of 0 everything is requested in one response.
+
+    Usage:
+        while not paging.done:
+            activities = <decoded activities of paging.endpoint()>
+            if paging.accept(activities):
+                <use activities>
+    """
+    def __init__(self, player_id, gds, start_date=None, end_date=None, page_size=None, max_pages=None):
+        default_page_size, default_max_pages = load_paging_settings()
+        self.player_id = player_id
+        self.gds = gds
+        self.start_date = start_date
+        self.end_date = end_date
+        self.page_size = default_page_size if page_size is None else page_size
+        self.max_pages = default_max_pages if max_pages is None else max_pages
+        self.page = 0
+        self.done = self.paged and self.max_pages <= 0
+        self._previous_first_id = None
+
+    @property
+    def paged(self):
+        return self.page_size > 0
+
+    def endpoint(self):
+        """
+        Return the URL of the next page (or of the single unpaged response).
+        """
+        if not self.paged:
+            return build_activities_endpoint(self.player_id, self.gds, self.start_date, self.end_date)
+        return build_activities_endpoint(self.player_id, self.gds, self.start_date, self.end_date, page=self.page, page_size=self.page_size)
+
+    def accept(self, activities):
+        """
+        Record the decoded activities of the page just received and decide whether to request another.
+
+        Returns:
+            bool: False if the page repeats the previous one and must be discarded.
+        """
+        if not self.paged:
+            self.done = True
+            return True
+
+        first_id = _first_activity_id(activities)
+        if first_id is not None and first_id == self._previous_first_id:
+            # A full page was served again: the upstream ignored the page parameter
+            logger.debug(f"GameBus ignored paging for {self.gds} of player {self.player_id}; received all activities at once.")
+            self.done = True
+            return False
+        self._previous_first_id = first_id
+        self.page += 1
+
+        if len(activities) > self.page_size:
+            logger.debug(f"GameBus ignored paging for {self.gds} of player {self.player_id}; received all activities at once.")
+            self.done = True
+        elif len(activities) < self.page_size:
+            self.done = True
+        elif self.page >= self.max_pages:
+            logger.warning(f"Stopped fetching {self.gds} activities of player {self.player_id} after {self.max_pages} pages of {self.page_size}; the remaining activities are not included.")
+            self.done = True
+        return True
+
+
+def iter_activity_pages(player_id, gds, auth_bearer, start_date=None, end_date=None, page_size=None, max_pages=None):
+    """
+    Yield the activity records of a player page by page, as each page arrives (see ActivityPaging).
+
+    Args:
+        player_id, gds, auth_bearer, start_date, end_date: See fetch_activities.
+        page_size (int): Activities per page; 0 requests everything in one response.
+            Defaults to HDT_GAMEBUS_PAGE_SIZE.
+        max_pages (int): Maximum number of pages to request. Defaults to HDT_GAMEBUS_MAX_PAGES.
+
+    Yields:
+        list: The decoded activity records of one page.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    paging = ActivityPaging(player_id, gds, start_date, end_date, page_size, max_pages)
+    headers = {"Authorization": f"Bearer {auth_bearer}"}
+
+    if not paging.paged:
+        yield list(_iter_unpaged_activities(player_id, gds, auth_bearer, start_date, end_date))
+        return
+
+    while not paging.done:
+        with http_get(paging.endpoint(), headers=headers, stream=True) as response:
+            response.raise_for_status()
+            activities = list(iter_response_items(response))
+        if paging.accept(activities):
+            yield activities
+
+
+def iter_activities(player_id, gds, auth_bearer, start_date=None, end_date=None, page_size=None, max_pages=None):
+    """
+    Yield the raw activity records of a player for one game descriptor as they are received.
+
+    Activities are requested page by page (see iter_activity_pages), so parsers can start before
+    the download finishes and only one page is held in memory at a time. With a page size of 0 the
+    single response is decoded one activity at a time instead.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    if (load_paging_settings()[0] if page_size is None else page_size) <= 0:
+        yield from _iter_unpaged_activities(player_id, gds, auth_bearer, start_date, end_date)
+        return
+    for page in iter_activity_pages(player_id, gds, auth_bearer, start_date, end_date, page_size, max_pages):
+        yield from page
+
+
+def fetch_activities(player_id, gds, auth_bearer, start_date=None, end_date=None):
+    """
+    Fetch the raw activity records of a player for one game descriptor.
+
+    Args:
+        player_id (int): GameBus player ID.
+        gds (str): GameBus game descriptor.
+        auth_bearer (str): GameBus auth token of the player.
+        start_date (str): Optional ISO 8601 start date (YYYY-MM-DDTHH:MM:SSZ).
+        end_date (str): Optional ISO 8601 end date (YYYY-MM-DDTHH:MM:SSZ).
+
+    Returns:
+        list: Decoded activity records.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    return list(iter_activities(player_id, gds, auth_bearer, start_date, end_date))
@@ -1,13 +1,38 @@
+import calendar
 import requests
 import logging
+from datetime import datetime
+from HDT_CORE_INFRASTRUCTURE import json_codec
 from HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_parse import parse_google_fit_walk_data
+from HDT_CORE_INFRASTRUCTURE.http_client import http_get
+from HDT_CORE_INFRASTRUCTURE.activity_cache import cached_fetch
 
 logger = logging.getLogger(__name__)
 
-GOOGLE_FIT_ENDPOINT_TEMPLATE = "https://www.googleapis.com/fitness/v1/users/{player_id}/dataSources/derived:com.google.step_count.delta:com.google.android.gms:merge_step_deltas/datasets/{start_time}-{end_time}"
+GOOGLE_FIT_STEP_COUNT_DATA_SOURCE = "derived:com.google.step_count.delta:com.google.android.gms:merge_step_deltas"
+GOOGLE_FIT_ENDPOINT_TEMPLATE = "https://www.googleapis.com/fitness/v1/users/{player_id}/dataSources/" + GOOGLE_FIT_STEP_COUNT_DATA_SOURCE + "/datasets/{start_time}-{end_time}"
 
+# Dataset bounds in nanoseconds since the epoch covering all data (1970 up to 2100)
+GOOGLE_FIT_MIN_TIME = 0
+GOOGLE_FIT_MAX_TIME = 4102444800000000000
 
-def fetch_google_fit_walk_data(player_id, auth_bearer, start_time=0, end_time=4102444800000000000):
+
+def to_google_fit_time_range(start_date=None, end_date=None):
+    """
+    Convert an ISO 8601 date range (YYYY-MM-DDTHH:MM:SSZ) to the nanosecond bounds of a Google Fit dataset.
+
+    Missing bounds cover all data. The end second is included.
+    """
+    start_time, end_time = GOOGLE_FIT_MIN_TIME, GOOGLE_FIT_MAX_TIME
+    if start_date:
+        start_time = calendar.timegm(datetime.strptime(start_date, "%Y-%m-%dT%H:%M:%SZ").timetuple()) * 10**9
+    if end_date:
+        end_time = (calendar.timegm(datetime.strptime(end_date, "%Y-%m-%dT%H:%M:%SZ").timetuple()) + 1) * 10**9 - 1
+    return start_time, end_time
+
+
+@cached_fetch("Google Fit", GOOGLE_FIT_STEP_COUNT_DATA_SOURCE)
+def fetch_google_fit_walk_data(player_id, auth_bearer, start_time=GOOGLE_FIT_MIN_TIME, end_time=GOOGLE_FIT_MAX_TIME, columnar=False):
     """
     Fetch step count data from Google Fit and parse it.
 
@@ -16,6 +41,7 @@ def fetch_google_fit_walk_data(player_id, auth_bearer, start_time=0, end_time=41
         auth_bearer (str): Authorization token for Google Fit API.
         start_time (str): Start time in nanoseconds (default is '0' for all data).
         end_time (str): End time in nanoseconds (default is maximum for all data).
+        columnar (bool): Return the data as columns (see walk_columns).
 
     Returns:
         list: Parsed walk activity data or None if an error occurs.
@@ -24,12 +50,12 @@ def fetch_google_fit_walk_data(player_id, auth_bearer, start_time=0, end_time=41
     url = GOOGLE_FIT_ENDPOINT_TEMPLATE.format(player_id=player_id, start_time=start_time, end_time=end_time)
 
     try:
-        response = requests.get(url, headers=headers)
+        response = http_get(url, headers=headers)
         response.raise_for_status()
-        raw_data = response.json()
+        raw_data = json_codec.loads(response.content)
 
-        return parse_google_fit_walk_data(raw_data)
-    except requests.RequestException as e:
+        return parse_google_fit_walk_data(raw_data, columnar=columnar)
+    except (requests.RequestException, json_codec.JSONDecodeError) as e:
         logger.error(f"Error fetching Google Fit walk data for player {player_id}: {e}")
         return None
 
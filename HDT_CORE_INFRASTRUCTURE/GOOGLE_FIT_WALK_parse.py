@@ -1,17 +1,23 @@
 from datetime import datetime, timezone, timedelta
 from pytz import timezone as pytz_timezone
 
+from HDT_CORE_INFRASTRUCTURE.walk_columns import new_walk_columns
 
-def parse_google_fit_walk_data(google_fit_data):
+
+def parse_google_fit_walk_data(google_fit_data, columnar=False):
     """
     Parse Google Fit step count data into a format similar to GameBus walk data.
 
     Args:
         google_fit_data (dict): Raw response from the Google Fit API.
+        columnar (bool): Return one list per field instead of one dict per data point (see walk_columns).
 
     Returns:
-        list: Parsed walk activity data.
+        list: Parsed walk activity data (dict of columns with columnar=True).
     """
+    if columnar:
+        return parse_google_fit_walk_columns(google_fit_data)
+
     parsed_activities = []
     amsterdam_tz = pytz_timezone('Europe/Amsterdam')
 
@@ -41,3 +47,22 @@ def parse_google_fit_walk_data(google_fit_data):
 
     return parsed_activities
 
+
+def parse_google_fit_walk_columns(google_fit_data):
+    """
+    Parse Google Fit step count data into walk columns, with epoch timestamps and durations in seconds.
+    """
+    columns = new_walk_columns()
+
+    for point in google_fit_data.get("point", []):
+        start_time_ns = int(point["startTimeNanos"])
+        end_time_ns = int(point["endTimeNanos"])
+        duration_seconds = (end_time_ns - start_time_ns) / 1e9
+
+        columns["timestamp"].append(start_time_ns // 10**6)
+        columns["steps"].append(next((value["intVal"] for value in point["value"] if "intVal" in value), None))
+        columns["distance_meters"].append(None)  # Google Fit step count doesn't include distance
+        columns["duration_seconds"].append(duration_seconds if duration_seconds > 0 else None)
+        columns["kcalories"].append(None)  # This data is not available in step count API
+
+    return columns
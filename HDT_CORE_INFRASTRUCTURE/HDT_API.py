@@ -1,8 +1,16 @@
-from flask import Flask, jsonify, request, abort, send_from_directory
-from functools import wraps
+from flask import Flask, Response, jsonify, request, abort, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from functools import wraps, partial
+from collections import namedtuple
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import importlib
+import threading
 import logging
 import json
 import os
+import sqlite3
 import sys
 
 # Add the project root to the Python path if running the file directly
@@ -13,47 +21,168 @@ if __name__ == "__main__":
 # Try both import styles to support running as a module or directly
 try:
     # When run as a module
-    from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch import fetch_trivia_data, fetch_sugarvita_data
-    from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_fetch import fetch_walk_data
-    from HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_fetch import fetch_google_fit_walk_data
-    from HDT_CORE_INFRASTRUCTURE.auth import authenticate_and_authorize
-    from config.config import load_external_parties, load_user_permissions
+    from HDT_CORE_INFRASTRUCTURE.auth import authenticate_and_authorize, authorize_api_key, AuthorizationError, PermissionIndex
+    from HDT_CORE_INFRASTRUCTURE.activity_cache import get_cache_stats
+    from HDT_CORE_INFRASTRUCTURE.single_flight import get_single_flight_stats
+    from HDT_CORE_INFRASTRUCTURE.config_watcher import ConfigWatcher
+    from HDT_CORE_INFRASTRUCTURE.score_storage import get_score_store
+    from HDT_CORE_INFRASTRUCTURE.scoring_scheduler import ScoringScheduler, load_scoring_settings
+    from HDT_CORE_INFRASTRUCTURE import json_codec
+    from config.config import configure_logging, load_environment, load_external_parties, load_user_permissions, load_endpoint_concurrency
 except ImportError:
     # When run directly
-    from GAMEBUS_DIABETES_fetch import fetch_trivia_data, fetch_sugarvita_data
-    from GAMEBUS_WALK_fetch import fetch_walk_data
-    from GOOGLE_FIT_WALK_fetch import fetch_google_fit_walk_data
-    from auth import authenticate_and_authorize
+    from auth import authenticate_and_authorize, authorize_api_key, AuthorizationError, PermissionIndex
+    from activity_cache import get_cache_stats
+    from single_flight import get_single_flight_stats
+    from config_watcher import ConfigWatcher
+    from score_storage import get_score_store
+    from scoring_scheduler import ScoringScheduler, load_scoring_settings
+    import json_codec
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-    from config.config import load_external_parties, load_user_permissions
+    from config.config import configure_logging, load_environment, load_external_parties, load_user_permissions, load_endpoint_concurrency
 
-app = Flask(__name__)
+configure_logging()
+load_environment()
+
+
+def lazy_function(module_name, function_name):
+    """
+    Return a stand-in for module_name.function_name that imports the module on its first call.
+
+    The connector modules pull in the HTTP stack and the parsers; importing them on first use keeps
+    the start-up of the API (and of short-lived workers) fast.
+    """
+    function = None
+
+    def call(*args, **kwargs):
+        nonlocal function
+        if function is None:
+            function = getattr(importlib.import_module(module_name), function_name)
+        return function(*args, **kwargs)
+
+    call.__name__ = function_name
+    call.__qualname__ = function_name
+    call.module_name = module_name
+    return call
+
+
+# Connectors and upstream HTTP client, loaded on first use
+fetch_trivia_data = lazy_function("HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch", "fetch_trivia_data")
+fetch_sugarvita_data = lazy_function("HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch", "fetch_sugarvita_data")
+fetch_walk_data = lazy_function("HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_fetch", "fetch_walk_data")
+fetch_google_fit_walk_data = lazy_function("HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_fetch", "fetch_google_fit_walk_data")
+to_google_fit_time_range = lazy_function("HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_fetch", "to_google_fit_time_range")
+sync_trivia_data = lazy_function("HDT_CORE_INFRASTRUCTURE.incremental_sync", "sync_trivia_data")
+sync_sugarvita_data = lazy_function("HDT_CORE_INFRASTRUCTURE.incremental_sync", "sync_sugarvita_data")
+get_http_stats = lazy_function("HDT_CORE_INFRASTRUCTURE.http_client", "get_http_stats")
+get_rate_limit_stats = lazy_function("HDT_CORE_INFRASTRUCTURE.rate_limiter", "get_rate_limit_stats")
+count_walk_rows = lazy_function("HDT_CORE_INFRASTRUCTURE.walk_columns", "count_walk_rows")
+encode_walk_npz = lazy_function("HDT_CORE_INFRASTRUCTURE.walk_columns", "encode_walk_npz")
+get_walk_rollups = lazy_function("HDT_CORE_INFRASTRUCTURE.walk_rollups", "get_walk_rollups")
+open_session = lazy_function("HDT_CORE_INFRASTRUCTURE.connectors", "open_session")
+get_connector = lazy_function("HDT_CORE_INFRASTRUCTURE.connectors", "get_connector")
+gather_bounded = lazy_function("HDT_CORE_INFRASTRUCTURE.connectors", "gather_bounded")
+
+LAZY_MODULES = sorted({
+    fetch.module_name for fetch in (
+        fetch_trivia_data, fetch_walk_data, fetch_google_fit_walk_data, sync_trivia_data, get_http_stats, encode_walk_npz,
+        get_walk_rollups, get_rate_limit_stats, open_session,
+    )
+})
+
+# Long-running servers can import the connectors up front (HDT_EAGER_IMPORTS=1), so that the
+# first request does not pay for the imports
+if os.getenv("HDT_EAGER_IMPORTS", "").lower() in ("1", "true", "yes"):
+    for module_name in LAZY_MODULES:
+        importlib.import_module(module_name)
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider encoding responses with json_codec (orjson when installed).
+
+    Keeps Flask's defaults: sorted keys, `default` for datetimes and other types, and indented
+    output in debug mode.
+    """
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return json_codec.dumps(obj, default=self.default, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = json_codec.dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
 
-# Load configurations securely
-external_parties = load_external_parties()
-user_permissions = load_user_permissions()
+
+app = Flask(__name__)
+app.json = CodecJSONProvider(app)
 
 # Define the path to the static directory
 static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
 
-# Load users from config/users.json
-# Use absolute path for users.json
+# Use absolute paths for the configuration files
 config_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config'))
 users_file = os.path.join(config_dir, 'users.json')
-with open(users_file) as f:
-    users = {user["user_id"]: user for user in json.load(f)["users"]}
+external_parties_file = os.path.join(config_dir, 'external_parties.json')
+user_permissions_file = os.path.join(config_dir, 'user_permissions.json')
+env_file = os.path.join(config_dir, '.env')
+
+# Users, external parties and permissions are loaded together and replaced as a whole on reload
+ConfigSnapshot = namedtuple("ConfigSnapshot", ["users", "external_parties", "user_permissions", "permission_index"])
+
+
+def load_config_snapshot(strict=True):
+    """
+    Load users, external parties and user permissions, and build the permission index.
+    With strict=True (used on reload), any unreadable file raises so the previous snapshot is kept.
+    """
+    # Re-read .env, which holds the API keys of the external parties
+    load_environment()
+
+    # Load configurations securely
+    external_parties = load_external_parties(external_parties_file, strict=strict)
+    user_permissions = load_user_permissions(user_permissions_file, strict=strict)
+
+    # Load users from config/users.json
+    with open(users_file) as f:
+        users = {user["user_id"]: user for user in json_codec.load(f)["users"]}
+
+    # API key and permission lookups, shared by the auth decorator and the endpoints
+    return ConfigSnapshot(users, external_parties, user_permissions, PermissionIndex(external_parties, user_permissions))
+
+
+# Reload the configuration in the background when one of its files changes.
+# Started by the API server below, not on import
+config_watcher = ConfigWatcher(
+    [users_file, external_parties_file, user_permissions_file, env_file],
+    load_config_snapshot,
+    snapshot=load_config_snapshot(strict=False),
+)
+
+
+def get_config():
+    """
+    Return the current configuration snapshot. Read it once per operation for a consistent view.
+    """
+    return config_watcher.snapshot
+
+
+def get_permission_index():
+    return config_watcher.snapshot.permission_index
 
 
 def get_users_by_permission(client_id, required_permission):
     """
     Identify users who have granted the requesting client access to the required permission.
     """
-    accessible_users = []
-    for user_id, permissions in user_permissions.items():
-        if client_id in permissions["allowed_clients"]:
-            if required_permission in permissions["allowed_clients"][client_id]:
-                accessible_users.append(int(user_id))
-    return accessible_users
+    return get_permission_index().get_user_ids(client_id, required_permission)
 
 
 def get_connected_app_info(user_id, app_type):
@@ -67,7 +196,7 @@ def get_connected_app_info(user_id, app_type):
     Returns:
         tuple: (connected_application, player_id, auth_bearer) or ("Unknown", None, None) if not found.
     """
-    user = users.get(user_id)
+    user = get_config().users.get(user_id)
     if not user:
         return "Unknown", None, None
 
@@ -93,6 +222,12 @@ def metadata_model_developer_apis():
                 "method": "GET",
                 "description": "Retrieve trivia data for virtual twin model training.",
                 "expected_input": {
+                    "query_params": {
+                        "start": "optional, start of the date range (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "end": "optional, end of the date range, inclusive (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "sync": "optional, 'incremental' to only fetch activities newer than the last sync (cannot be combined with start/end)",
+                        "stream": "optional, 'true' to stream one NDJSON record per user as it completes (or send Accept: application/x-ndjson)"
+                    },
                     "headers": {
                         "Authorization": "Bearer <API_KEY>"
                     }
@@ -113,6 +248,12 @@ def metadata_model_developer_apis():
                 "method": "GET",
                 "description": "Retrieve SugarVita data for virtual twin model training.",
                 "expected_input": {
+                    "query_params": {
+                        "start": "optional, start of the date range (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "end": "optional, end of the date range, inclusive (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "sync": "optional, 'incremental' to only fetch activities newer than the last sync (cannot be combined with start/end)",
+                        "stream": "optional, 'true' to stream one NDJSON record per user as it completes (or send Accept: application/x-ndjson)"
+                    },
                     "headers": {
                         "Authorization": "Bearer <API_KEY>"
                     }
@@ -133,6 +274,13 @@ def metadata_model_developer_apis():
                 "method": "GET",
                 "description": "Retrieve walk data for virtual twin model training.",
                 "expected_input": {
+                    "query_params": {
+                        "start": "optional, start of the date range (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "end": "optional, end of the date range, inclusive (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ)",
+                        "stream": "optional, 'true' to stream one NDJSON record per user as it completes (or send Accept: application/x-ndjson)",
+                        "format": "optional, 'rows' (default), 'columnar' for one array per field, or 'npz' for a NumPy .npz archive of all users in long format (cannot be streamed)",
+                        "granularity": "optional, 'hour', 'day' or 'week' to return steps, distance, duration and kcal summed per period in Europe/Amsterdam time (not with format=npz)"
+                    },
                     "headers": {
                         "Authorization": "Bearer <API_KEY>"
                     }
@@ -149,6 +297,24 @@ def metadata_model_developer_apis():
                             "kcalories": "float or None"
                         }
                     ],
+                    "data (granularity=hour|day|week)": [
+                        {
+                            "timestamp": "integer (start of the period, milliseconds since the epoch)",
+                            "period_start": "string (ISO 8601 local time with UTC offset)",
+                            "steps": "number or None",
+                            "distance_meters": "float or None",
+                            "duration_seconds": "float or None",
+                            "kcalories": "float or None",
+                            "records": "integer (number of aggregated walk records)"
+                        }
+                    ],
+                    "data (format=columnar)": {
+                        "timestamp": "list of integers (milliseconds since the epoch, UTC)",
+                        "steps": "list of numbers or None",
+                        "distance_meters": "list of floats or None",
+                        "duration_seconds": "list of floats or None",
+                        "kcalories": "list of floats or None"
+                    },
                     "error": "Error message if something goes wrong."
                 }
             }
@@ -220,6 +386,40 @@ def metadata_app_developer_apis():
                     "error": "Error message if something goes wrong."
                 },
                 "potential_use": "Use these scores to assess user education or recommend personalized educational content."
+            },
+            {
+                "name": "get_sugarvita_player_types_bulk",
+                "url": "/get_sugarvita_player_types_bulk",
+                "method": "GET",
+                "description": "Retrieve player type scores of many users in one request.",
+                "expected_input": {
+                    "query_params": {
+                        "user_ids": "comma-separated integers, or 'all' (default) for every user the client may access"
+                    },
+                    "headers": {
+                        "Authorization": "Bearer <API_KEY>"
+                    }
+                },
+                "functionality": "Resolves the latest player type scores of all requested users in one pass over the score storage.",
+                "output": "List with one get_sugarvita_player_types result per requested user; users that cannot be accessed or have no data carry an 'error' instead.",
+                "potential_use": "Refresh dashboards covering many users without one request per user."
+            },
+            {
+                "name": "get_health_literacy_diabetes_bulk",
+                "url": "/get_health_literacy_diabetes_bulk",
+                "method": "GET",
+                "description": "Retrieve diabetes health literacy scores of many users in one request.",
+                "expected_input": {
+                    "query_params": {
+                        "user_ids": "comma-separated integers, or 'all' (default) for every user the client may access"
+                    },
+                    "headers": {
+                        "Authorization": "Bearer <API_KEY>"
+                    }
+                },
+                "functionality": "Resolves the latest health literacy scores of all requested users in one pass over the score storage.",
+                "output": "List with one get_health_literacy_diabetes result per requested user; users that cannot be accessed or have no data carry an 'error' instead.",
+                "potential_use": "Refresh dashboards covering many users without one request per user."
             }
         ]
     }
@@ -227,6 +427,25 @@ def metadata_app_developer_apis():
     return jsonify(metadata), 200
 
 
+# Operational metrics of the HDT API
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Provide counters of the upstream connections (requests, retries, connection pool usage), of the
+    upstream rate limiting per connected application (delayed requests, queue wait time),
+    of the upstream activity cache (hits, misses, size), of request coalescing (duplicate calls avoided),
+    of configuration hot reloads (version, reload count and latency) and of the background scoring
+    jobs (users checked and scored, queue depth, latency).
+    """
+    return jsonify({
+        "upstream_http": get_http_stats(),
+        "rate_limiter": get_rate_limit_stats(),
+        "activity_cache": get_cache_stats(),
+        "single_flight": get_single_flight_stats(),
+        "config_reload": config_watcher.stats(),
+        "scoring_scheduler": scoring_scheduler.stats()
+    }), 200
+
 
 # Below are the API endpoints that virtual twin model developers can call to retrieve user data for specific domains (e.g., trivia, SugarVita, walking).
 #
@@ -242,6 +461,8 @@ def metadata_app_developer_apis():
 # 3. **Data Fetching**:
 #    - Call the appropriate fetch function (e.g., fetch_trivia_data, fetch_sugarvita_data, fetch_walk_data) to query the external application.
 #    - Fetch and preprocess the raw data using external application-specific logic.
+#    - Users are fetched concurrently on a bounded per-endpoint worker pool (see load_endpoint_concurrency);
+#      the response keeps the order of the accessible user IDs.
 #
 # 4. **Error Handling**:
 #    - Handle unsupported applications or missing configurations gracefully by providing clear error messages in the response.
@@ -251,36 +472,393 @@ def metadata_app_developer_apis():
 #
 # Each endpoint is tailored for a specific domain (e.g., trivia, SugarVita, walking), leveraging the flexibility and modularity of the system architecture.
 
+# Worker pools used to fan out per-user fetches, one bounded pool per endpoint
+_endpoint_executors = {}
+_endpoint_executors_lock = threading.Lock()
+
+
+def get_endpoint_executor(endpoint_name):
+    """
+    Return the shared worker pool of an endpoint, creating it on first use.
+
+    Returns None when the endpoint is configured to run sequentially.
+    """
+    with _endpoint_executors_lock:
+        if endpoint_name not in _endpoint_executors:
+            max_workers = load_endpoint_concurrency(endpoint_name)
+            _endpoint_executors[endpoint_name] = (
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hdt-{endpoint_name}")
+                if max_workers > 1 else None
+            )
+        return _endpoint_executors[endpoint_name]
+
+
+def fan_out_users(endpoint_name, user_ids, collect_user_data):
+    """
+    Call collect_user_data for every user, using the endpoint's bounded worker pool.
+
+    Results are returned in the same order as user_ids, regardless of completion order.
+    """
+    executor = get_endpoint_executor(endpoint_name)
+    if executor is None or len(user_ids) <= 1:
+        return [collect_user_data(user_id) for user_id in user_ids]
+    return list(executor.map(collect_user_data, user_ids))
+
+
+def iter_users_as_completed(endpoint_name, user_ids, collect_user_data):
+    """
+    Yield the result of collect_user_data for every user as soon as it is available.
+
+    At most twice the pool size of users is in flight at a time, so memory does not grow with the
+    number of users. A failing user yields an error entry instead of ending the stream.
+    """
+    executor = get_endpoint_executor(endpoint_name)
+    if executor is None:
+        for user_id in user_ids:
+            yield collect_user_data_safely(collect_user_data, user_id)
+        return
+
+    max_in_flight = 2 * load_endpoint_concurrency(endpoint_name)
+    user_ids = iter(user_ids)
+    pending = set()
+    try:
+        while True:
+            for user_id in user_ids:
+                pending.add(executor.submit(collect_user_data_safely, collect_user_data, user_id))
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # The client may disconnect mid-stream; do not fetch data nobody will read
+        for future in pending:
+            future.cancel()
+
+
+def collect_user_data_safely(collect_user_data, user_id):
+    try:
+        return collect_user_data(user_id)
+    except Exception as e:
+        logging.error(f"Error collecting data of user {user_id}: {e}")
+        return {"user_id": user_id, "error": "Internal server error"}
+
+
+def wants_ndjson():
+    """
+    Whether the client opted into streaming, with ?stream=true or an Accept: application/x-ndjson header.
+    """
+    if request.args.get("stream", "").lower() == "true":
+        return True
+    return request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"]) == "application/x-ndjson"
+
+
+def load_async_fetch_limit():
+    """
+    Load the number of users fetched at once on one event loop with the async connectors
+    (HDT_ASYNC_FETCH); 0 (default) fetches them on the endpoint's worker pool.
+    """
+    value = os.getenv("HDT_ASYNC_FETCH", "0")
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logging.error(f"Invalid value '{value}' for HDT_ASYNC_FETCH. Expected an integer.")
+        return 0
+
+
+# App type of the connected application each data endpoint fetches from
+ENDPOINT_APP_TYPES = {"get_trivia_data": "diabetes_data", "get_sugarvita_data": "diabetes_data", "get_walk_data": "walk_data"}
+
+
+async def collect_user_data_async(session, endpoint_name, user_id, collect_user_data, start_date=None, end_date=None, columnar=False):
+    """
+    Fetch the data of a single user with the async connector of its connected application and wrap
+    it in the same response entry as the blocking collect_user_data.
+    """
+    app_name, player_id, auth_bearer = get_connected_app_info(user_id, ENDPOINT_APP_TYPES[endpoint_name])
+    connector = get_connector(app_name, session)
+    try:
+        if endpoint_name == "get_trivia_data" and app_name == "GameBus":
+            data, latest_activity_info = await connector.fetch_trivia_data(player_id, start_date, end_date, auth_bearer=auth_bearer)
+            return trivia_entry(user_id, data, latest_activity_info)
+        if endpoint_name == "get_sugarvita_data" and app_name == "GameBus":
+            data, latest_activity_info = await connector.fetch_sugarvita_data(player_id, start_date, end_date, auth_bearer=auth_bearer)
+            return sugarvita_entry(user_id, data, latest_activity_info)
+        if endpoint_name == "get_walk_data" and connector is not None:
+            data = await connector.fetch_walk_data(player_id, auth_bearer, start_date, end_date, columnar=columnar)
+            return walk_entry(user_id, data)
+    except Exception as e:
+        logging.error(f"Error collecting data of user {user_id}: {e}")
+        return {"user_id": user_id, "error": "Internal server error"}
+    # No connector for the user's application: the blocking path only builds the error entry
+    return collect_user_data_safely(collect_user_data, user_id)
+
+
+def fan_out_users_async(endpoint_name, user_ids, collect_user_data, limit, async_options):
+    """
+    Fetch all users concurrently on one event loop with the async connectors (connectors.py),
+    at most `limit` at a time. Results are returned in the same order as user_ids.
+    """
+    async def collect_all():
+        async with open_session(limit=limit) as session:
+            return await gather_bounded(
+                [collect_user_data_async(session, endpoint_name, user_id, collect_user_data, **async_options) for user_id in user_ids],
+                limit,
+            )
+
+    return asyncio.run(collect_all())
+
+
+def collect_users(endpoint_name, user_ids, collect_user_data, async_options=None):
+    """
+    Collect the data of all users, in the order of user_ids.
+
+    Requests served by the async connectors pass their fetch options (start_date, end_date and
+    columnar) as async_options; with HDT_ASYNC_FETCH set they are fetched on one event loop instead
+    of the endpoint's worker pool. The async connectors page, cache and coalesce like the blocking
+    fetchers.
+    """
+    limit = load_async_fetch_limit()
+    if limit and async_options is not None and len(user_ids) > 1:
+        try:
+            return fan_out_users_async(endpoint_name, user_ids, collect_user_data, limit, async_options)
+        except ImportError as e:
+            logging.error(f"Async fetching is unavailable, using the worker pool: {e}")
+    return fan_out_users(endpoint_name, user_ids, collect_user_data)
+
+
+def users_response(endpoint_name, user_ids, collect_user_data, async_options=None):
+    """
+    Respond with the data of all users: a JSON array by default, or newline-delimited JSON (one
+    record per user, in completion order) streamed as each user's fetch finishes.
+    """
+    if not wants_ndjson():
+        return jsonify(collect_users(endpoint_name, user_ids, collect_user_data, async_options)), 200
+
+    def generate():
+        for entry in iter_users_as_completed(endpoint_name, user_ids, collect_user_data):
+            yield app.json.dumps(entry) + "\n"
+
+    return Response(generate(), status=200, mimetype="application/x-ndjson")
+
+
+def parse_date_param(name, end_of_day=False):
+    """
+    Parse an optional date query parameter, given as YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ.
+
+    A plain date is read as the start of the day, or as its last second with end_of_day=True, so
+    that an end date includes the whole day.
+
+    Returns:
+        str: The date as YYYY-MM-DDTHH:MM:SSZ, or None if the parameter is absent.
+
+    Raises:
+        ValueError: If the parameter is not a valid date.
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        pass
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid '{name}' parameter '{value}'. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ.")
+    return day.strftime("%Y-%m-%dT23:59:59Z" if end_of_day else "%Y-%m-%dT00:00:00Z")
+
+
+def get_date_range():
+    """
+    Parse and validate the start/end query parameters of the model developer endpoints.
+
+    Returns:
+        tuple: (start_date, end_date), each an ISO 8601 string or None.
+
+    Raises:
+        ValueError: If a date is invalid, start is after end, or a range is combined with sync=incremental.
+    """
+    start_date = parse_date_param("start")
+    end_date = parse_date_param("end", end_of_day=True)
+    if start_date and end_date and start_date > end_date:
+        raise ValueError("'start' must not be after 'end'.")
+    if (start_date or end_date) and request.args.get("sync") == "incremental":
+        raise ValueError("'start'/'end' cannot be combined with sync=incremental.")
+    return start_date, end_date
+
+
+WALK_FORMATS = ("rows", "columnar", "npz")
+
+
+def get_walk_format():
+    """
+    Parse and validate the format query parameter of /get_walk_data.
+
+    Raises:
+        ValueError: If the format is unknown, or npz is combined with streaming.
+    """
+    walk_format = request.args.get("format", "rows").lower()
+    if walk_format not in WALK_FORMATS:
+        raise ValueError(f"'format' must be one of {', '.join(WALK_FORMATS)}.")
+    if walk_format == "npz" and wants_ndjson():
+        raise ValueError("format=npz cannot be streamed.")
+    return walk_format
+
+
+WALK_GRANULARITIES = ("hour", "day", "week")
+
+
+def get_walk_granularity(walk_format):
+    """
+    Parse and validate the granularity query parameter of /get_walk_data.
+
+    Returns:
+        str: hour, day or week, or None for the individual walk records.
+
+    Raises:
+        ValueError: If the granularity is unknown or combined with format=npz.
+    """
+    granularity = request.args.get("granularity")
+    if granularity is None:
+        return None
+    granularity = granularity.lower()
+    if granularity not in WALK_GRANULARITIES:
+        raise ValueError(f"'granularity' must be one of {', '.join(WALK_GRANULARITIES)}.")
+    if walk_format == "npz":
+        raise ValueError("'granularity' cannot be combined with format=npz.")
+    return granularity
+
+
+def walk_npz_response(user_ids, collect_user_data, async_options=None):
+    """
+    Respond with the columnar walk data of all users as a single NumPy .npz archive.
+    """
+    entries = collect_users("get_walk_data", user_ids, collect_user_data, async_options)
+    try:
+        body = encode_walk_npz(entries)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 501
+    return Response(
+        body, status=200, mimetype="application/octet-stream",
+        headers={"Content-Disposition": "attachment; filename=walk_data.npz"},
+    )
+
+
+def trivia_entry(user_id, data, latest_activity_info):
+    if data:
+        return {
+            "user_id": user_id,
+            "data": {
+                "trivia_results": data,
+                "latest_activity_info": latest_activity_info
+            }
+        }
+    return {"user_id": user_id, "error": f"No data found for user {user_id}"}
+
+
+def sugarvita_entry(user_id, data, latest_activity_info):
+    if data:
+        return {
+            "user_id": user_id,
+            "data": {
+                "sugarvita_results": data,
+                "latest_activity_info": latest_activity_info
+            }
+        }
+    return {"user_id": user_id, "error": f"No data found for user {user_id}"}
+
+
+def walk_entry(user_id, data):
+    if data and count_walk_rows(data):
+        return {"user_id": user_id, "data": data}
+    return {"user_id": user_id, "error": f"No data found for user {user_id}"}
+
+
+def collect_trivia_data(user_id, incremental=False, start_date=None, end_date=None):
+    """
+    Fetch the trivia data of a single user and wrap it in a response entry.
+
+    With incremental=True only activities newer than the user's sync watermark are fetched;
+    otherwise start_date/end_date optionally limit the activities to a date range.
+    """
+    app_name, player_id, auth_bearer = get_connected_app_info(user_id, "diabetes_data")
+
+    if app_name == "GameBus":
+        if incremental:
+            data, latest_activity_info = sync_trivia_data(player_id, auth_bearer)
+        else:
+            data, latest_activity_info = fetch_trivia_data(player_id, start_date, end_date, auth_bearer=auth_bearer)
+        return trivia_entry(user_id, data, latest_activity_info)
+    elif app_name == "Placeholder diabetes app":
+        return {"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."}
+    return {"user_id": user_id, "error": f"User {user_id} does not have a connected diabetes application."}
+
+
+def collect_sugarvita_data(user_id, incremental=False, start_date=None, end_date=None):
+    """
+    Fetch the SugarVita data of a single user and wrap it in a response entry.
+
+    With incremental=True only activities newer than the user's sync watermarks are fetched;
+    otherwise start_date/end_date optionally limit the activities to a date range.
+    """
+    app_name, player_id, auth_bearer = get_connected_app_info(user_id, "diabetes_data")
+
+    if app_name == "GameBus":
+        if incremental:
+            data, latest_activity_info = sync_sugarvita_data(player_id, auth_bearer)
+        else:
+            data, latest_activity_info = fetch_sugarvita_data(player_id, start_date, end_date, auth_bearer=auth_bearer)
+        return sugarvita_entry(user_id, data, latest_activity_info)
+    elif app_name == "Placeholder diabetes app":
+        return {"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."}
+    return {"user_id": user_id, "error": f"User {user_id} does not have a connected diabetes application."}
+
+
+def collect_walk_data(user_id, start_date=None, end_date=None, columnar=False, granularity=None):
+    """
+    Fetch the walk data of a single user and wrap it in a response entry, optionally limited to a date range.
+    With columnar=True the data holds one list per field instead of one dict per activity; with a
+    granularity (hour, day or week) it holds the user's walk rollups instead of the individual records.
+    """
+    app_name, player_id, auth_bearer = get_connected_app_info(user_id, "walk_data")
+
+    if granularity and app_name in ("GameBus", "Google Fit"):
+        data = get_walk_rollups(app_name, player_id, auth_bearer, granularity, start_date, end_date, columnar=columnar)
+        if data is None:
+            return {"user_id": user_id, "error": f"Could not fetch walk data for user {user_id}"}
+        if count_walk_rows(data):
+            return {"user_id": user_id, "granularity": granularity, "data": data}
+        return {"user_id": user_id, "error": f"No data found for user {user_id}"}
+    elif app_name == "GameBus":
+        data = fetch_walk_data(player_id, auth_bearer=auth_bearer, start_date=start_date, end_date=end_date, columnar=columnar)
+        return walk_entry(user_id, data)
+    elif app_name == "Google Fit":
+        time_range = to_google_fit_time_range(start_date, end_date)
+        data = fetch_google_fit_walk_data(player_id, auth_bearer, *time_range, columnar=columnar)
+        return walk_entry(user_id, data)
+    elif app_name == "Placeholder walk app":
+        return {"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."}
+    return {"user_id": user_id, "error": f"User {user_id} does not have a connected walk application."}
+
+
 # Trivia endpoint
 @app.route("/get_trivia_data", methods=["GET"])
-@authenticate_and_authorize(external_parties, user_permissions, "get_trivia_data")
+@authenticate_and_authorize(get_permission_index, "get_trivia_data")
 def get_trivia_data():
     try:
         client_id = request.client["client_id"]
         accessible_user_ids = get_users_by_permission(client_id, "get_trivia_data")
-        response_data = []
-
-        for user_id in accessible_user_ids:
-            app_name, player_id, auth_bearer = get_connected_app_info(user_id, "diabetes_data")
-
-            if app_name == "GameBus":
-                data, latest_activity_info = fetch_trivia_data(player_id, auth_bearer=auth_bearer)
-                if data:
-                    response_data.append({
-                        "user_id": user_id,
-                        "data": {
-                            "trivia_results": data,
-                            "latest_activity_info": latest_activity_info
-                        }
-                    })
-                else:
-                    response_data.append({"user_id": user_id, "error": f"No data found for user {user_id}"})
-            elif app_name == "Placeholder diabetes app":
-                response_data.append({"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."})
-            else:
-                response_data.append({"user_id": user_id, "error": f"User {user_id} does not have a connected diabetes application."})
-
-        return jsonify(response_data), 200
+        incremental = request.args.get("sync") == "incremental"
+        try:
+            start_date, end_date = get_date_range()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        collect = partial(collect_trivia_data, incremental=incremental, start_date=start_date, end_date=end_date)
+        async_options = None if incremental else {"start_date": start_date, "end_date": end_date}
+        return users_response("get_trivia_data", accessible_user_ids, collect, async_options)
     except Exception as e:
         logging.error(f"Error in get_trivia_data endpoint: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -288,34 +866,19 @@ def get_trivia_data():
 
 # SugarVita endpoint
 @app.route("/get_sugarvita_data", methods=["GET"])
-@authenticate_and_authorize(external_parties, user_permissions, "get_sugarvita_data")
+@authenticate_and_authorize(get_permission_index, "get_sugarvita_data")
 def get_sugarvita_data():
     try:
         client_id = request.client["client_id"]
         accessible_user_ids = get_users_by_permission(client_id, "get_sugarvita_data")
-        response_data = []
-
-        for user_id in accessible_user_ids:
-            app_name, player_id, auth_bearer = get_connected_app_info(user_id, "diabetes_data")
-
-            if app_name == "GameBus":
-                data, latest_activity_info = fetch_sugarvita_data(player_id, auth_bearer=auth_bearer)
-                if data:
-                    response_data.append({
-                        "user_id": user_id,
-                        "data": {
-                            "sugarvita_results": data,
-                            "latest_activity_info": latest_activity_info
-                        }
-                    })
-                else:
-                    response_data.append({"user_id": user_id, "error": f"No data found for user {user_id}"})
-            elif app_name == "Placeholder diabetes app":
-                response_data.append({"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."})
-            else:
-                response_data.append({"user_id": user_id, "error": f"User {user_id} does not have a connected diabetes application."})
-
-        return jsonify(response_data), 200
+        incremental = request.args.get("sync") == "incremental"
+        try:
+            start_date, end_date = get_date_range()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        collect = partial(collect_sugarvita_data, incremental=incremental, start_date=start_date, end_date=end_date)
+        async_options = None if incremental else {"start_date": start_date, "end_date": end_date}
+        return users_response("get_sugarvita_data", accessible_user_ids, collect, async_options)
     except Exception as e:
         logging.error(f"Error in get_sugarvita_data endpoint: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -323,40 +886,26 @@ def get_sugarvita_data():
 
 # Walk endpoint
 @app.route("/get_walk_data", methods=["GET"])
-@authenticate_and_authorize(external_parties, user_permissions, "get_walk_data")
+@authenticate_and_authorize(get_permission_index, "get_walk_data")
 def get_walk():
     try:
         client_id = request.client["client_id"]
         accessible_user_ids = get_users_by_permission(client_id, "get_walk_data")
-        response_data = []
-
-        for user_id in accessible_user_ids:
-            app_name, player_id, auth_bearer = get_connected_app_info(user_id, "walk_data")
-
-            if app_name == "GameBus":
-                data = fetch_walk_data(player_id, auth_bearer=auth_bearer)
-                if data:
-                    response_data.append({
-                        "user_id": user_id,
-                        "data": data
-                    })
-                else:
-                    response_data.append({"user_id": user_id, "error": f"No data found for user {user_id}"})
-            elif app_name == "Google Fit":
-                data = fetch_google_fit_walk_data(player_id, auth_bearer)
-                if data:
-                    response_data.append({
-                        "user_id": user_id,
-                        "data": data
-                    })
-                else:
-                    response_data.append({"user_id": user_id, "error": f"No data found for user {user_id}"})
-            elif app_name == "Placeholder walk app":
-                response_data.append({"user_id": user_id, "error": f"Support for '{app_name}' is not yet implemented."})
-            else:
-                response_data.append({"user_id": user_id, "error": f"User {user_id} does not have a connected walk application."})
-
-        return jsonify(response_data), 200
+        try:
+            start_date, end_date = get_date_range()
+            walk_format = get_walk_format()
+            granularity = get_walk_granularity(walk_format)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        collect = partial(
+            collect_walk_data, start_date=start_date, end_date=end_date,
+            columnar=walk_format != "rows", granularity=granularity,
+        )
+        # Rollups are maintained by the incremental sync, not fetched by the connectors
+        async_options = None if granularity else {"start_date": start_date, "end_date": end_date, "columnar": walk_format != "rows"}
+        if walk_format == "npz":
+            return walk_npz_response(accessible_user_ids, collect, async_options)
+        return users_response("get_walk_data", accessible_user_ids, collect, async_options)
     except Exception as e:
         logging.error(f"Error in get_walk endpoint: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -364,11 +913,178 @@ def get_walk():
 
 
 
+# In-process access to the model developer data, for models running in the same environment as the HDT
+
+# Per-user data collection of the model developer endpoints
+USER_DATA_COLLECTORS = {
+    "get_trivia_data": collect_trivia_data,
+    "get_sugarvita_data": collect_sugarvita_data,
+    "get_walk_data": collect_walk_data,
+}
+
+
+def get_user_data(api_key, endpoint_name, **options):
+    """
+    Return the data of a model developer endpoint as Python objects, without an HTTP round trip.
+
+    Applies the same API key and permission checks as the endpoint and returns the entries its JSON
+    response would hold, in the same order. The data may be shared with concurrent requests (see
+    single_flight) and must be treated as read-only.
+
+    Args:
+        api_key (str): API key of the model developer.
+        endpoint_name (str): get_trivia_data, get_sugarvita_data or get_walk_data.
+        **options: Options of the endpoint's collect function, e.g. incremental=True,
+            start_date/end_date (YYYY-MM-DDTHH:MM:SSZ), columnar=True or granularity="day".
+
+    Raises:
+        AuthorizationError: If the API key is invalid or no user granted access to the endpoint.
+        ValueError: If the endpoint is unknown.
+    """
+    if endpoint_name not in USER_DATA_COLLECTORS:
+        raise ValueError(f"Unknown endpoint '{endpoint_name}'. Use one of {', '.join(USER_DATA_COLLECTORS)}.")
+    _, accessible_user_ids = authorize_api_key(get_permission_index(), api_key, endpoint_name)
+    collect = partial(USER_DATA_COLLECTORS[endpoint_name], **options)
+    return fan_out_users(endpoint_name, accessible_user_ids, collect)
+
+
+# Background scoring of the users with new GameBus activity (see scoring_scheduler)
+
+def scoring_user_ids():
+    """
+    Return the users who granted the scoring client access to both their trivia and SugarVita data.
+    """
+    client_id = load_scoring_settings()["HDT_SCORING_CLIENT_ID"]
+    sugarvita_user_ids = set(get_users_by_permission(client_id, "get_sugarvita_data"))
+    return [user_id for user_id in get_users_by_permission(client_id, "get_trivia_data") if user_id in sugarvita_user_ids]
+
+
+def collect_scoring_data(user_id):
+    """
+    Incrementally refresh the trivia and SugarVita data of a user, as entries of the data endpoints.
+    """
+    return (
+        collect_user_data_safely(partial(collect_trivia_data, incremental=True), user_id),
+        collect_user_data_safely(partial(collect_sugarvita_data, incremental=True), user_id),
+    )
+
+
+# Started by the API server below or by the scoring_scheduler daemon, not on import
+scoring_scheduler = ScoringScheduler(
+    scoring_user_ids, lambda user_ids: fan_out_users("scoring_scheduler", user_ids, collect_scoring_data)
+)
+
+
 # Below are endpoints that health app developers can use to obtain insights about its users via the virtual twin
 
+def player_types_result(user_id, user_found, latest_entry):
+    """
+    Build the player types result of a user from its latest score entry.
+
+    Returns:
+        tuple: (result, status_code)
+    """
+    if not user_found:
+        return {"error": f"No data found for user {user_id}"}, 404
+
+    # Check if entries exist
+    if latest_entry is None:
+        return {
+            "user_id": user_id,
+            "latest_update": None,
+            "player_types": {}
+        }, 200
+
+    player_types_labels = latest_entry.get("final_scores", {}).get("player_types_labels", {})
+    latest_date = latest_entry.get("date")
+
+    return {
+        "user_id": user_id,
+        "latest_update": latest_date,
+        "player_types": player_types_labels
+    }, 200
+
+
+def health_literacy_result(user_id, user_found, latest_entry):
+    """
+    Build the diabetes health literacy result of a user from its latest score entry.
+
+    Returns:
+        tuple: (result, status_code)
+    """
+    if not user_found:
+        return {"error": f"No data found for user {user_id}"}, 404
+
+    # Check if entries exist
+    if latest_entry is None:
+        return {
+            "user_id": user_id,
+            "latest_update": None,
+            "health_literacy_score": None
+        }, 200
+
+    health_literacy_score = latest_entry.get("final_scores", {}).get("health_literacy_score", {}).get("domain", None)
+    latest_date = latest_entry.get("date")
+
+    return {
+        "user_id": user_id,
+        "latest_update": latest_date,
+        "health_literacy_score": health_literacy_score
+    }, 200
+
+
+def get_requested_user_ids():
+    """
+    Parse the user_ids query parameter of the bulk endpoints.
+
+    Accepts comma-separated and/or repeated values (user_ids=1,2&user_ids=3). "all", or no parameter,
+    selects every user the client is permitted to see.
+
+    Returns:
+        list: The requested user IDs, or None if a value is not an integer.
+    """
+    values = [value.strip() for param in request.args.getlist("user_ids") for value in param.split(",") if value.strip()]
+    if not values or values == ["all"]:
+        return list(request.accessible_user_ids)
+    try:
+        # Keep the requested order, without duplicates
+        return list(dict.fromkeys(int(value) for value in values))
+    except ValueError:
+        return None
+
+
+def bulk_results(endpoint_name, build_result):
+    """
+    Resolve the latest score entries of all requested users in one pass over the score store.
+
+    Users the client is not permitted to see get a per-user error instead of failing the request.
+    """
+    user_ids = get_requested_user_ids()
+    if user_ids is None:
+        return jsonify({"error": "user_ids must be a comma-separated list of integers or 'all'"}), 400
+
+    authorized_ids = [user_id for user_id in user_ids if user_id in request.accessible_user_ids]
+    try:
+        latest_entries = get_score_store().get_latest_entries(authorized_ids)
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        logging.error(f"Error loading the score storage in {endpoint_name}: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+    results = []
+    for user_id in user_ids:
+        if user_id not in latest_entries:
+            logging.debug(f"Unauthorized bulk access attempt to user {user_id} in {endpoint_name}.")
+            results.append({"user_id": user_id, "error": "Unauthorized access to this user's data"})
+            continue
+        result, _ = build_result(user_id, *latest_entries[user_id])
+        results.append({"user_id": user_id, **result})
+
+    return jsonify(results), 200
+
+
 # Endpoint for app developers to retrieve the sugarvita player type scores of a user
 @app.route("/get_sugarvita_player_types", methods=["GET"])
-@authenticate_and_authorize(external_parties, user_permissions, "get_sugarvita_player_types")
+@authenticate_and_authorize(get_permission_index, "get_sugarvita_player_types")
 def get_sugarvita_player_types():
     try:
         # Extract user_id from query parameters
@@ -378,49 +1094,34 @@ def get_sugarvita_player_types():
             logging.debug(f"Unauthorized access attempt to player types for user {user_id}.")
             return jsonify({"error": "Unauthorized access to this user's data"}), 403
 
-        # Load diabetes_pt_hl_storage.json
+        # Retrieve the latest entry of the user from the score store
         try:
-            storage_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', "diabetes_pt_hl_storage.json"))
-            with open(storage_file, "r") as f:
-                storage_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logging.error(f"Error loading diabetes_pt_hl_storage.json: {e}")
+            user_found, latest_entry = get_score_store().get_latest_entry(user_id)
+        except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+            logging.error(f"Error loading the score storage: {e}")
             return jsonify({"error": "Internal server error"}), 500
 
-        # Retrieve the user data
-        user_data = storage_data.get("users", {}).get(str(user_id), {})
-        if not user_data:
-            return jsonify({"error": f"No data found for user {user_id}"}), 404
-
-        # Check if entries exist
-        if not user_data.get("entries"):
-            return jsonify({
-                "user_id": user_id,
-                "latest_update": None,
-                "player_types": {}
-            }), 200
-
-        # Get the latest entry
-        latest_entry = user_data["entries"][-1]
-        player_types_labels = latest_entry.get("final_scores", {}).get("player_types_labels", {})
-        latest_date = latest_entry.get("date")
-
-        # Prepare the response
-        response = {
-            "user_id": user_id,
-            "latest_update": latest_date,
-            "player_types": player_types_labels
-        }
-
-        return jsonify(response), 200
+        result, status_code = player_types_result(user_id, user_found, latest_entry)
+        return jsonify(result), status_code
     except Exception as e:
         logging.error(f"Error in get_sugarvita_player_types endpoint: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 
+# Endpoint for app developers to retrieve the sugarvita player type scores of many users at once
+@app.route("/get_sugarvita_player_types_bulk", methods=["GET"])
+@authenticate_and_authorize(get_permission_index, "get_sugarvita_player_types")
+def get_sugarvita_player_types_bulk():
+    try:
+        return bulk_results("get_sugarvita_player_types_bulk", player_types_result)
+    except Exception as e:
+        logging.error(f"Error in get_sugarvita_player_types_bulk endpoint: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
 # Endpoint for app developers to retrieve the diabetes related health literacy scores of a user
 @app.route("/get_health_literacy_diabetes", methods=["GET"])
-@authenticate_and_authorize(external_parties, user_permissions, "get_health_literacy_diabetes")
+@authenticate_and_authorize(get_permission_index, "get_health_literacy_diabetes")
 def get_health_literacy_diabetes():
     try:
         # Extract user_id from query parameters
@@ -430,46 +1131,31 @@ def get_health_literacy_diabetes():
             logging.debug(f"Unauthorized access attempt to health literacy for user {user_id}.")
             return jsonify({"error": "Unauthorized access to this user's data"}), 403
 
-        # Load diabetes_pt_hl_storage.json
+        # Retrieve the latest entry of the user from the score store
         try:
-            storage_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', "diabetes_pt_hl_storage.json"))
-            with open(storage_file, "r") as f:
-                storage_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logging.error(f"Error loading diabetes_pt_hl_storage.json: {e}")
+            user_found, latest_entry = get_score_store().get_latest_entry(user_id)
+        except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+            logging.error(f"Error loading the score storage: {e}")
             return jsonify({"error": "Internal server error"}), 500
 
-        # Retrieve the user data
-        user_data = storage_data.get("users", {}).get(str(user_id), {})
-        if not user_data:
-            return jsonify({"error": f"No data found for user {user_id}"}), 404
-
-        # Check if entries exist
-        if not user_data.get("entries"):
-            return jsonify({
-                "user_id": user_id,
-                "latest_update": None,
-                "health_literacy_score": None
-            }), 200
-
-        # Get the latest entry
-        latest_entry = user_data["entries"][-1]
-        health_literacy_score = latest_entry.get("final_scores", {}).get("health_literacy_score", {}).get("domain", None)
-        latest_date = latest_entry.get("date")
-
-        # Prepare the response
-        response = {
-            "user_id": user_id,
-            "latest_update": latest_date,
-            "health_literacy_score": health_literacy_score
-        }
-
-        return jsonify(response), 200
+        result, status_code = health_literacy_result(user_id, user_found, latest_entry)
+        return jsonify(result), status_code
     except Exception as e:
         logging.error(f"Error in get_health_literacy_diabetes endpoint: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 
+# Endpoint for app developers to retrieve the diabetes related health literacy scores of many users at once
+@app.route("/get_health_literacy_diabetes_bulk", methods=["GET"])
+@authenticate_and_authorize(get_permission_index, "get_health_literacy_diabetes")
+def get_health_literacy_diabetes_bulk():
+    try:
+        return bulk_results("get_health_literacy_diabetes_bulk", health_literacy_result)
+    except Exception as e:
+        logging.error(f"Error in get_health_literacy_diabetes_bulk endpoint: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
 
 # Root endpoint to serve the index.html file
 @app.route('/')
@@ -482,4 +1168,8 @@ def index():
 if __name__ == "__main__":
     print("Starting the HDT API server on http://localhost:5000")
     print("Press Ctrl+C to stop the server")
+    # With the debug reloader, only the serving child process runs the background threads
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        config_watcher.start()
+        scoring_scheduler.start()
     app.run(debug=True, host='0.0.0.0')
@@ -0,0 +1,283 @@
+"""
+Two-tier cache of upstream activity data, placed in front of the fetch functions.
+
+Entries are keyed by (connected application, player, gds, start, end). The in-memory tier is an
+LRU bounded by an approximate size in bytes; entries expire after a TTL. The optional disk tier
+stores the same entries as JSON files so that a restarted process starts warm.
+
+The cache is configured through environment variables (e.g. in config/.env):
+    HDT_CACHE_TTL_SECONDS  Time to live of an entry in seconds (default 300, 0 disables the cache).
+    HDT_CACHE_MAX_BYTES    Size bound of the in-memory tier (default 64 MiB).
+    HDT_CACHE_DIR          Directory of the disk tier (disabled when not set).
+"""
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from HDT_CORE_INFRASTRUCTURE import json_codec
+from HDT_CORE_INFRASTRUCTURE.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityCache:
+    """
+    In-memory LRU cache with TTL and size bound, backed by an optional on-disk tier.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, ttl_seconds=300, max_bytes=64 * 1024 * 1024, disk_dir=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+        self._entries = OrderedDict()  # key -> (stored_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def enabled(self):
+        return self.ttl_seconds > 0
+
+    def _is_fresh(self, stored_at):
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def get(self, key):
+        """
+        Look up a key in the memory tier, then in the disk tier.
+
+        Returns:
+            tuple: (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, size, value = entry
+                if self._is_fresh(stored_at):
+                    self._entries.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return True, value
+                del self._entries[key]
+                self._bytes -= size
+
+        if self.disk_dir:
+            stored_at, value = self._read_disk(key)
+            if stored_at is not None and self._is_fresh(stored_at):
+                self._put_memory(key, value, stored_at)
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                return True, value
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return False, None
+
+    def put(self, key, value):
+        """
+        Store a value in both tiers.
+        """
+        stored_at = time.time()
+        self._put_memory(key, value, stored_at)
+        if self.disk_dir:
+            self._write_disk(key, value, stored_at)
+
+    def _put_memory(self, key, value, stored_at):
+        size = len(json_codec.dumps_bytes(value, default=str))
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key} in memory: {size} bytes exceeds the cache size bound.")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (stored_at, size, value)
+            self._bytes += size
+
+            # Evict least recently used entries until the size bound holds again
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._counters["evictions"] += 1
+
+    def _read_disk(self, key):
+        try:
+            with open(self._disk_path(key), "r") as f:
+                record = json_codec.load(f)
+        except FileNotFoundError:
+            return None, None
+        except (OSError, json_codec.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache file for {key}: {e}")
+            return None, None
+
+        value = record["value"]
+        # JSON has no tuples; restore the (data, latest_activity_info) shape of the fetchers
+        return record["stored_at"], tuple(value) if record.get("tuple") else value
+
+    def _write_disk(self, key, value, stored_at):
+        path = self._disk_path(key)
+        record = {"key": key, "stored_at": stored_at, "tuple": isinstance(value, tuple), "value": value}
+        try:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json_codec.dump(record, f)
+            os.replace(tmp_path, path)  # atomic, so readers never see a partial file
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write cache file for {key}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters and the current size of the memory tier.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else None
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["max_bytes"] = self.max_bytes
+        stats["disk_tier"] = bool(self.disk_dir)
+        return stats
+
+
+def load_activity_cache():
+    """
+    Create the activity cache from the environment configuration.
+    """
+    try:
+        ttl_seconds = float(os.getenv("HDT_CACHE_TTL_SECONDS", 300))
+        max_bytes = int(os.getenv("HDT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    except ValueError as e:
+        logger.error(f"Invalid activity cache configuration ({e}). Using defaults.")
+        ttl_seconds, max_bytes = 300, 64 * 1024 * 1024
+    return ActivityCache(ttl_seconds=ttl_seconds, max_bytes=max_bytes, disk_dir=os.getenv("HDT_CACHE_DIR"))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_activity_cache():
+    """
+    Return the process-wide activity cache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = load_activity_cache()
+    return _cache
+
+
+def get_cache_stats():
+    return get_activity_cache().stats()
+
+
+def _is_cacheable(value):
+    # Fetchers signal failures with (None, None), None or an empty list; never cache those
+    if isinstance(value, tuple):
+        return value[0] is not None
+    return bool(value)
+
+
+# Arguments identifying the player and date range; they always make up the cache key
+KEY_ARGUMENTS = {"player_id", "auth_bearer", "start_date", "end_date", "start_time", "end_time"}
+
+
+def cached_fetch(connected_application, gds):
+    """
+    Decorator caching the result of a fetch function in the activity cache.
+
+    The wrapped function must take `player_id` and `auth_bearer` arguments and may take a date range
+    as `start_date`/`end_date` or `start_time`/`end_time`. The player is identified by its ID plus a
+    fingerprint of its auth token, because Google Fit addresses every player as "me". Any other
+    argument that differs from its default (e.g. columnar=True) is part of the key as well.
+    Concurrent misses for the same key are coalesced into one upstream fetch, also when the cache
+    is disabled. The uncached function stays available as `__wrapped__`.
+
+    Coroutine functions and methods (the async connectors) are wrapped in a coroutine with the same
+    cache keys, so the blocking fetchers and the connectors share cached entries.
+    """
+    def decorator(fetch):
+        signature = inspect.signature(fetch)
+        extra_parameters = [
+            parameter for name, parameter in signature.parameters.items()
+            if name not in KEY_ARGUMENTS and name != "self"
+        ]
+
+        def cache_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            auth_bearer = arguments.get("auth_bearer") or ""
+            player = f"{arguments['player_id']}:{hashlib.sha256(auth_bearer.encode('utf-8')).hexdigest()[:16]}"
+            start = arguments.get("start_date", arguments.get("start_time"))
+            end = arguments.get("end_date", arguments.get("end_time"))
+            key = (connected_application, player, gds, start, end)
+            # Only non-default extras, so that the keys of plain calls stay the same
+            extras = tuple(
+                (parameter.name, arguments[parameter.name]) for parameter in extra_parameters
+                if arguments[parameter.name] != parameter.default
+            )
+            if extras:
+                key += (extras,)
+            return key
+
+        if inspect.iscoroutinefunction(fetch):
+            @wraps(fetch)
+            async def cached_async(*args, **kwargs):
+                key = cache_key(args, kwargs)
+                cache = get_activity_cache()
+                if cache.enabled:
+                    hit, value = cache.get(key)
+                    if hit:
+                        return value
+
+                async def fetch_and_store():
+                    value = await fetch(*args, **kwargs)
+                    if cache.enabled and _is_cacheable(value):
+                        cache.put(key, value)
+                    return value
+
+                # On a miss, concurrent coroutines for the same key share one upstream fetch
+                return await get_single_flight().do_async(key, fetch_and_store)
+            return cached_async
+
+        @wraps(fetch)
+        def cached(*args, **kwargs):
+            key = cache_key(args, kwargs)
+            cache = get_activity_cache()
+            if cache.enabled:
+                hit, value = cache.get(key)
+                if hit:
+                    return value
+
+            def fetch_and_store():
+                value = fetch(*args, **kwargs)
+                if cache.enabled and _is_cacheable(value):
+                    cache.put(key, value)
+                return value
+
+            # On a miss, concurrent callers for the same key share one upstream fetch
+            return get_single_flight().do(key, fetch_and_store)
+        return cached
+    return decorator
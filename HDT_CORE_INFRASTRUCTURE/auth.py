@@ -1,11 +1,116 @@
+from bisect import bisect_left
 from functools import wraps
 from flask import request, jsonify
+import hashlib
 import logging
 
 
-def authenticate_and_authorize(external_parties, user_permissions, required_permission):
+def hash_api_key(api_key):
+    """
+    Hash an API key for lookup, so that plaintext keys are not used as index keys.
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class SortedUserIds(tuple):
+    """
+    Sorted, immutable sequence of user IDs with O(log n) membership tests.
+    """
+    def __contains__(self, user_id):
+        # e.g. None for a missing or non-integer user_id parameter; never a member
+        if not isinstance(user_id, int):
+            return False
+        i = bisect_left(self, user_id)
+        return i < len(self) and self[i] == user_id
+
+
+class PermissionIndex:
+    """
+    Precomputed lookup tables for authentication and authorization.
+
+    Built once from the external parties and user permissions, it maps the hashed API key of each
+    client to the client, and each (client_id, permission) pair to the sorted IDs of the users who
+    granted that permission to that client.
+    """
+    def __init__(self, external_parties, user_permissions):
+        self.clients_by_key_hash = {}
+        for client in external_parties:
+            if "api_key" not in client:
+                continue  # Clients without an API key cannot authenticate
+            self.clients_by_key_hash[hash_api_key(client["api_key"])] = client
+
+        user_ids = {}
+        for user_id_str, perms in user_permissions.items():
+            try:
+                user_id = int(user_id_str)
+            except ValueError:
+                logging.warning(f"Invalid user_id format: {user_id_str}")
+                continue
+            for client_id, permissions in perms.get("allowed_clients", {}).items():
+                for permission in permissions:
+                    user_ids.setdefault((client_id, permission), set()).add(user_id)
+
+        self.user_ids_by_permission = {key: SortedUserIds(sorted(ids)) for key, ids in user_ids.items()}
+
+    def get_client(self, api_key):
+        """
+        Return the client owning the API key, or None.
+        """
+        return self.clients_by_key_hash.get(hash_api_key(api_key))
+
+    def get_user_ids(self, client_id, permission):
+        """
+        Return the sorted IDs of the users who granted `permission` to the client.
+        """
+        return self.user_ids_by_permission.get((client_id, permission), SortedUserIds())
+
+
+class AuthorizationError(Exception):
+    """
+    Raised when an API key is invalid or grants no access, with the HTTP status of the failure.
+    """
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def authorize_api_key(index, api_key, required_permission):
+    """
+    Authenticate an API key and determine the users who granted its client the required permission.
+
+    Returns:
+        tuple: (client, accessible_user_ids)
+
+    Raises:
+        AuthorizationError: If the key is missing or invalid (401), or no user granted the permission (403).
+    """
+    if not api_key:
+        logging.debug("API key is missing in the request.")
+        raise AuthorizationError("API key is missing", 401)
+
+    # Verify API key
+    client = index.get_client(api_key)
+    if not client:
+        logging.debug("Invalid API key provided.")
+        raise AuthorizationError("Invalid API key", 401)
+
+    # Determine accessible user IDs based on required_permission
+    accessible_user_ids = index.get_user_ids(client["client_id"], required_permission)
+
+    if not accessible_user_ids:
+        logging.debug("No permissions set for this user.")
+        raise AuthorizationError("No permissions set for this user", 403)
+
+    logging.debug(f"Client '{client['client_id']}' has access to {len(accessible_user_ids)} user IDs for permission '{required_permission}'")
+    return client, accessible_user_ids
+
+
+def authenticate_and_authorize(permission_index, required_permission):
     """
     Decorator factory to authenticate and authorize based on required_permission.
+
+    `permission_index` is a PermissionIndex, or a callable returning the current one so that
+    reloaded configurations take effect without redecorating the endpoints.
     """
     def decorator(f):
         @wraps(f)
@@ -22,38 +127,18 @@ def authenticate_and_authorize(external_parties, user_permissions, required_perm
             if not api_key:
                 api_key = request.headers.get("X-API-KEY")
 
-            if not api_key:
-                logging.debug("API key is missing in the request.")
-                return jsonify({"error": "API key is missing"}), 401
-
-            # Verify API key
-            client = next((c for c in external_parties if c["api_key"] == api_key), None)
-            if not client:
-                logging.debug("Invalid API key provided.")
-                return jsonify({"error": "Invalid API key"}), 401
-
-            # Determine accessible user IDs based on required_permission
-            accessible_user_ids = []
-            for user_id_str, perms in user_permissions.items():
-                if client["client_id"] in perms.get("allowed_clients", {}):
-                    if required_permission in perms["allowed_clients"][client["client_id"]]:
-                        try:
-                            user_id = int(user_id_str)
-                            accessible_user_ids.append(user_id)
-                        except ValueError:
-                            logging.warning(f"Invalid user_id format: {user_id_str}")
-                            continue
-
-            if not accessible_user_ids:
-                logging.debug("No permissions set for this user.")
-                return jsonify({"error": "No permissions set for this user"}), 403
+            # Use one index for the whole check, even if a reload swaps it meanwhile
+            index = permission_index() if callable(permission_index) else permission_index
+
+            try:
+                client, accessible_user_ids = authorize_api_key(index, api_key, required_permission)
+            except AuthorizationError as e:
+                return jsonify({"error": str(e)}), e.status_code
 
             # Attach client info and accessible_user_ids to request context
             request.client = client
             request.accessible_user_ids = accessible_user_ids
 
-            logging.debug(f"Client '{client['client_id']}' has access to user IDs: {accessible_user_ids} for permission '{required_permission}'")
-
             return f(*args, **kwargs)
         return decorated_function
     return decorator
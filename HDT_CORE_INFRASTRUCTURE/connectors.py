@@ -0,0 +1,253 @@
+"""
+Asyncio-native connectors for the external applications the HDT fetches data from.
+
+Each connected application (e.g. GameBus, Google Fit) has a connector exposing async variants of
+the blocking fetch functions. All connectors share one aiohttp session, so hundreds of upstream
+requests can be in flight on a single event loop. Like the blocking fetchers, they page through
+GameBus activities (ActivityPaging), hand the responses to the same parse functions, report failed
+or malformed fetches the same way, and go through the activity cache with the same keys.
+
+Example:
+    async with open_session() as session:
+        gamebus = get_connector("GameBus", session)
+        data, latest_activity_info = await gamebus.fetch_trivia_data(player_id, auth_bearer=token)
+"""
+import asyncio
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed when the async connectors are used
+    aiohttp = None
+
+from HDT_CORE_INFRASTRUCTURE import json_codec
+from HDT_CORE_INFRASTRUCTURE.activity_cache import cached_fetch
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_activities import ActivityPaging
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch import TRIVIA_GDS, SUGARVITA_PLAYTHROUGH_GDS, SUGARVITA_ENGAGEMENT_GDS
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_parse import parse_trivia_activities, parse_sugarvita_activities
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_fetch import WALK_GDS
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_parse import parse_walk_activities
+from HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_fetch import (
+    GOOGLE_FIT_ENDPOINT_TEMPLATE,
+    GOOGLE_FIT_MAX_TIME,
+    GOOGLE_FIT_MIN_TIME,
+    GOOGLE_FIT_STEP_COUNT_DATA_SOURCE,
+    to_google_fit_time_range,
+)
+from HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_parse import parse_google_fit_walk_data
+from HDT_CORE_INFRASTRUCTURE.http_client import RETRY_STATUS_CODES, get_http_client
+from HDT_CORE_INFRASTRUCTURE.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamResponse:
+    """
+    Minimal response object exposing the body as `.text`, as expected by the parse functions.
+    """
+    def __init__(self, text):
+        self.text = text
+
+    def json(self):
+        return json_codec.loads(self.text)
+
+
+def open_session(limit=100):
+    """
+    Open the aiohttp session shared by all connectors.
+
+    The connect and read timeouts and the per-host connection limit are taken from the shared HTTP
+    client settings (see http_client.py).
+
+    Args:
+        limit (int): Maximum number of simultaneous upstream connections.
+
+    Returns:
+        aiohttp.ClientSession: Use it as an async context manager.
+    """
+    if aiohttp is None:
+        raise ImportError("The async connectors require aiohttp. Install it with 'pip install aiohttp'.")
+    settings = get_http_client().settings
+    timeout = aiohttp.ClientTimeout(sock_connect=settings["connect_timeout"], sock_read=settings["read_timeout"])
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=settings["pool_size"])
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+class Connector:
+    """
+    Common interface of the async connectors.
+
+    Subclasses implement the fetch coroutines supported by their connected application and raise
+    NotImplementedError for the others.
+    """
+    connected_application = None
+
+    def __init__(self, session):
+        self.session = session
+
+    async def get(self, url, auth_bearer):
+        """
+        Perform an authorized GET request and return the response body.
+
+        Transient failures are retried with the backoff policy of the shared HTTP client, and every
+        attempt waits for the rate limiter shared with the blocking fetchers.
+        """
+        client = get_http_client()
+        max_retries = client.settings["max_retries"]
+        headers = {"Authorization": f"Bearer {auth_bearer}"}
+
+        for attempt in range(max_retries + 1):
+            await get_rate_limiter().acquire_async(url, auth_bearer)
+            client.record("requests")
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    if response.status not in RETRY_STATUS_CODES or attempt == max_retries:
+                        if response.status in RETRY_STATUS_CODES:
+                            client.record("failures")
+                        response.raise_for_status()
+                        return UpstreamResponse(await response.text())
+                    delay = client.backoff_delay(attempt, response.headers.get("Retry-After"))
+                    logger.warning(f"Request to {url} returned {response.status}. Retrying in {delay:.2f}s.")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == max_retries:
+                    client.record("failures")
+                    raise
+                delay = client.backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}). Retrying in {delay:.2f}s.")
+
+            client.record("retries")
+            await asyncio.sleep(delay)
+
+    async def fetch_trivia_data(self, player_id, start_date=None, end_date=None, auth_bearer=None):
+        raise NotImplementedError(f"{self.connected_application} does not provide trivia data.")
+
+    async def fetch_sugarvita_data(self, player_id, start_date=None, end_date=None, auth_bearer=None):
+        raise NotImplementedError(f"{self.connected_application} does not provide SugarVita data.")
+
+    async def fetch_walk_data(self, player_id, auth_bearer, start_date=None, end_date=None, columnar=False):
+        raise NotImplementedError(f"{self.connected_application} does not provide walk data.")
+
+
+class GameBusConnector(Connector):
+    """
+    Async counterpart of the GAMEBUS_DIABETES_fetch and GAMEBUS_WALK_fetch modules.
+    """
+    connected_application = "GameBus"
+
+    async def fetch_activities(self, player_id, gds, auth_bearer, start_date=None, end_date=None):
+        """
+        Fetch all pages of the activities of a player for one game descriptor.
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: If a request fails.
+            ValueError: If a page is not a JSON array of activities.
+        """
+        paging = ActivityPaging(player_id, gds, start_date, end_date)
+        activities = []
+        while not paging.done:
+            response = await self.get(paging.endpoint(), auth_bearer)
+            page = response.json()
+            if not isinstance(page, list):
+                raise ValueError(f"Expected a JSON array of {gds} activities")
+            if paging.accept(page):
+                activities.extend(page)
+        return activities
+
+    @cached_fetch("GameBus", TRIVIA_GDS)
+    async def fetch_trivia_data(self, player_id, start_date=None, end_date=None, auth_bearer=None):
+        logger.info(f"Fetching trivia data for player {player_id}")
+
+        try:
+            activities = await self.fetch_activities(player_id, TRIVIA_GDS, auth_bearer, start_date, end_date)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching trivia data for player {player_id}: {e}")
+            return None, None
+        except ValueError as e:
+            # A malformed payload is a failed fetch, not a player without activities
+            logger.error(f"JSON decode error parsing trivia response: {str(e)}")
+            return None, None
+        return parse_trivia_activities(activities)
+
+    @cached_fetch("GameBus", f"{SUGARVITA_PLAYTHROUGH_GDS},{SUGARVITA_ENGAGEMENT_GDS}")
+    async def fetch_sugarvita_data(self, player_id, start_date=None, end_date=None, auth_bearer=None):
+        logger.info(f"Fetching sugarvita data for player {player_id}")
+
+        try:
+            # Playthroughs and engagement logs are independent, so request them concurrently
+            playthroughs, engagements = await asyncio.gather(
+                self.fetch_activities(player_id, SUGARVITA_PLAYTHROUGH_GDS, auth_bearer, start_date, end_date),
+                self.fetch_activities(player_id, SUGARVITA_ENGAGEMENT_GDS, auth_bearer, start_date, end_date),
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching sugarvita data for player {player_id}: {e}")
+            return None, None
+        except ValueError as e:
+            logger.error(f"Error parsing sugarvita response: {str(e)}")
+            return None, None
+        return parse_sugarvita_activities(playthroughs, engagements)
+
+    @cached_fetch("GameBus", WALK_GDS)
+    async def fetch_walk_data(self, player_id, auth_bearer, start_date=None, end_date=None, columnar=False):
+        try:
+            activities = await self.fetch_activities(player_id, WALK_GDS, auth_bearer, start_date, end_date)
+            return parse_walk_activities(activities, columnar=columnar)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching walk data for player {player_id}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error while parsing walk data for player {player_id}: {e}")
+            return []
+
+
+class GoogleFitConnector(Connector):
+    """
+    Async counterpart of the GOOGLE_FIT_WALK_fetch module.
+
+    Like the other connectors it takes an ISO 8601 date range, converted to Google Fit's nanosecond bounds.
+    """
+    connected_application = "Google Fit"
+
+    async def fetch_walk_data(self, player_id, auth_bearer, start_date=None, end_date=None, columnar=False):
+        start_time, end_time = to_google_fit_time_range(start_date, end_date)
+        return await self.fetch_google_fit_walk_data(player_id, auth_bearer, start_time, end_time, columnar=columnar)
+
+    # Same arguments as fetch_google_fit_walk_data, so both share the cached entries
+    @cached_fetch("Google Fit", GOOGLE_FIT_STEP_COUNT_DATA_SOURCE)
+    async def fetch_google_fit_walk_data(self, player_id, auth_bearer, start_time=GOOGLE_FIT_MIN_TIME, end_time=GOOGLE_FIT_MAX_TIME, columnar=False):
+        url = GOOGLE_FIT_ENDPOINT_TEMPLATE.format(player_id=player_id, start_time=start_time, end_time=end_time)
+
+        try:
+            response = await self.get(url, auth_bearer)
+            return parse_google_fit_walk_data(response.json(), columnar=columnar)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Error fetching Google Fit walk data for player {player_id}: {e}")
+            return None
+
+
+CONNECTORS = {
+    GameBusConnector.connected_application: GameBusConnector,
+    GoogleFitConnector.connected_application: GoogleFitConnector,
+}
+
+
+def get_connector(app_name, session):
+    """
+    Return the async connector of a connected application, or None if it is not supported.
+    """
+    connector_class = CONNECTORS.get(app_name)
+    return connector_class(session) if connector_class else None
+
+
+async def gather_bounded(coroutines, limit):
+    """
+    Await the given coroutines with at most `limit` of them running at once.
+
+    Results are returned in the order of the coroutines.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
@@ -0,0 +1,71 @@
+"""
+Table-driven extraction of the properties of GameBus activities.
+
+A GameBus activity carries its values as `propertyInstances`, each identified by the translationKey
+of its property. Parsers declare a PropertyTable (translationKey -> handler) once at module level;
+every property instance is then dispatched with a single dict lookup, and instances without a
+handler are skipped without further inspection.
+
+Properties holding nested JSON documents (e.g. PLAYTHROUGH_DATA, ENGAGEMENT_DATA) are only decoded
+when they are dispatched to a handler declared with `json_value`.
+"""
+import logging
+from functools import wraps
+
+from HDT_CORE_INFRASTRUCTURE import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+def json_value(handler):
+    """
+    Decorate the handler of a property whose value is a JSON document: the value is decoded when
+    the property is dispatched, and the handler receives the decoded document.
+    """
+    @wraps(handler)
+    def decode_and_handle(state, value, prop):
+        return handler(state, json_codec.loads(value), prop)
+    return decode_and_handle
+
+
+class PropertyTable:
+    """
+    Dispatches the propertyInstances of an activity to handlers keyed by translationKey.
+
+    A handler is called as handler(state, value, prop) with the parser's state, the raw value of
+    the property instance and its property (e.g. for the baseUnit). Property instances without a
+    translationKey are skipped.
+
+    Args:
+        name (str): Name of the parsed activities, used in log messages.
+        handlers (dict): translationKey -> handler.
+        log_errors (bool): Log a failing handler and continue with the next property (default);
+            when False, the error propagates to the caller.
+    """
+    def __init__(self, name, handlers, log_errors=True):
+        self.name = name
+        self.handlers = dict(handlers)
+        self.log_errors = log_errors
+
+    def extract(self, property_instances, state, record_index=None):
+        """
+        Dispatch each property instance of one activity to its handler, in order.
+        """
+        handlers = self.handlers
+        for element in property_instances:
+            try:
+                prop = element["property"]
+                handler = handlers.get(prop["translationKey"])
+            except (KeyError, TypeError):
+                continue
+            if handler is None:
+                continue
+
+            if not self.log_errors:
+                handler(state, element["value"], prop)
+                continue
+            try:
+                handler(state, element["value"], prop)
+            except Exception as e:
+                where = f" in record {record_index}" if record_index is not None else ""
+                logger.error(f"Error parsing {self.name} {prop['translationKey']}{where}: {str(e)}")
@@ -0,0 +1,190 @@
+"""
+Shared HTTP client used by all fetchers to call the external applications (GameBus, Google Fit).
+
+A single requests.Session keeps a pool of keep-alive connections per upstream host, so repeated
+calls skip the TCP and TLS handshakes. Every request has a connect and read timeout and is retried
+with jittered exponential backoff on connection errors, timeouts, 429 and 5xx responses. Every
+attempt is rate limited per connected application and auth token (see rate_limiter.py).
+
+The client is configured through environment variables (e.g. in config/.env):
+    HDT_HTTP_POOL_SIZE        Maximum keep-alive connections per host (default 20).
+    HDT_HTTP_CONNECT_TIMEOUT  Connect timeout in seconds (default 5).
+    HDT_HTTP_READ_TIMEOUT     Read timeout in seconds (default 60).
+    HDT_HTTP_MAX_RETRIES      Retries after the first attempt (default 3).
+    HDT_HTTP_BACKOFF_BASE     Base backoff delay in seconds (default 0.5).
+    HDT_HTTP_BACKOFF_MAX      Maximum backoff delay in seconds (default 30).
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from HDT_CORE_INFRASTRUCTURE.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def bearer_token(headers):
+    """
+    Return the token of the Authorization header, as passed to the async connectors as auth_bearer.
+    """
+    authorization = (headers or {}).get("Authorization", "")
+    return authorization[len("Bearer "):] if authorization.startswith("Bearer ") else authorization
+
+
+def _env_number(name, default, cast):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.error(f"Invalid value '{value}' for {name}. Using default {default}.")
+        return default
+
+
+def load_http_settings():
+    """
+    Load the HTTP client settings from the environment.
+    """
+    return {
+        "pool_size": _env_number("HDT_HTTP_POOL_SIZE", 20, int),
+        "connect_timeout": _env_number("HDT_HTTP_CONNECT_TIMEOUT", 5.0, float),
+        "read_timeout": _env_number("HDT_HTTP_READ_TIMEOUT", 60.0, float),
+        "max_retries": _env_number("HDT_HTTP_MAX_RETRIES", 3, int),
+        "backoff_base": _env_number("HDT_HTTP_BACKOFF_BASE", 0.5, float),
+        "backoff_max": _env_number("HDT_HTTP_BACKOFF_MAX", 30.0, float),
+    }
+
+
+class HttpClient:
+    """
+    Pooled, retrying HTTP client shared by the fetchers.
+    """
+    def __init__(self, settings=None):
+        self.settings = settings or load_http_settings()
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(
+            pool_connections=self.settings["pool_size"],
+            pool_maxsize=self.settings["pool_size"],
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0}
+
+    @property
+    def timeout(self):
+        return self.settings["connect_timeout"], self.settings["read_timeout"]
+
+    def record(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        Return the delay before retry number `attempt` (0-based).
+
+        Uses "full jitter": a random delay between 0 and the exponential backoff, so that workers
+        retrying the same upstream do not hit it in lockstep. A Retry-After header (in seconds)
+        sent by the upstream takes precedence.
+        """
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.settings["backoff_max"])
+            except ValueError:
+                pass  # HTTP-date values are not supported; fall back to exponential backoff
+        backoff = min(self.settings["backoff_max"], self.settings["backoff_base"] * (2 ** attempt))
+        return random.uniform(0, backoff)
+
+    def get(self, url, headers=None, params=None, stream=False):
+        """
+        Perform a GET request, retrying on transient failures.
+
+        Returns the last response, also when it still has a retryable status after all retries;
+        callers keep using response.raise_for_status(). Connection errors and timeouts are raised
+        once the retries are exhausted.
+        """
+        max_retries = self.settings["max_retries"]
+        rate_limiter, auth_bearer = get_rate_limiter(), bearer_token(headers)
+
+        for attempt in range(max_retries + 1):
+            rate_limiter.acquire(url, auth_bearer)
+            self.record("requests")
+            try:
+                response = self.session.get(url, headers=headers, params=params, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_retries:
+                    self.record("failures")
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}). Retrying in {delay:.2f}s.")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                    if response.status_code in RETRY_STATUS_CODES:
+                        self.record("failures")
+                    return response
+                delay = self.backoff_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"Request to {url} returned {response.status_code}. Retrying in {delay:.2f}s.")
+                response.close()
+
+            self.record("retries")
+            time.sleep(delay)
+
+    def stats(self):
+        """
+        Return request, retry and connection pool counters.
+
+        `pool_hits` counts requests served over an already open keep-alive connection.
+        """
+        pools = self.adapter.poolmanager.pools
+        connections_opened, pooled_requests = 0, 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+                pooled_requests += pool.num_requests
+
+        with self._lock:
+            stats = dict(self._counters)
+        stats["connections_opened"] = connections_opened
+        stats["pool_hits"] = max(0, pooled_requests - connections_opened)
+        stats["settings"] = dict(self.settings)
+        return stats
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Return the process-wide HTTP client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def http_get(url, headers=None, params=None, stream=False):
+    """
+    GET `url` through the shared, pooled and retrying HTTP client.
+    """
+    return get_http_client().get(url, headers=headers, params=params, stream=stream)
+
+
+def get_http_stats():
+    """
+    Return the counters of the shared HTTP client.
+    """
+    return get_http_client().stats()
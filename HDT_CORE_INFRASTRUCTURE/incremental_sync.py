@@ -0,0 +1,241 @@
+"""
+Incremental, watermark-based synchronisation of GameBus activities.
+
+For every player and game descriptor (gds) the sync state stores a watermark (the date and ID of the
+newest activity already processed) together with the parsed metrics computed so far. A refresh only
+requests activities from the watermark onwards, parses the new ones and merges them into the stored
+metrics, so its cost is proportional to the new activity rather than to the total history.
+
+The state is persisted as one small JSON file per player and metric stream in HDT_SYNC_STATE_DIR
+(default: sync_state/ in the project root).
+
+Activities added upstream with a date older than the watermark (back-filled data) are not picked up
+by an incremental refresh; delete the player's state file to force a full resync.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+import requests
+
+from HDT_CORE_INFRASTRUCTURE import json_codec
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_activities import iter_activities
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch import TRIVIA_GDS, SUGARVITA_PLAYTHROUGH_GDS, SUGARVITA_ENGAGEMENT_GDS
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_parse import parse_trivia_activities, parse_sugarvita_activities
+from HDT_CORE_INFRASTRUCTURE.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_STATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sync_state'))
+
+# The GameBus `start` parameter has day resolution; request one extra day so that activities on the
+# watermark's day are never missed because of time zone differences. They are filtered out again below.
+START_MARGIN = timedelta(days=1)
+
+
+class SyncStateStore:
+    """
+    Persists the watermarks and merged metrics of each player's metric streams.
+    """
+    def __init__(self, state_dir=None):
+        self.state_dir = state_dir or os.getenv("HDT_SYNC_STATE_DIR", DEFAULT_SYNC_STATE_DIR)
+        os.makedirs(self.state_dir, exist_ok=True)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def lock(self, key):
+        """
+        Return the lock serialising the syncs of one stream, so that activities are never merged twice.
+        """
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path(self, key):
+        return os.path.join(self.state_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".json")
+
+    def load(self, key):
+        try:
+            with open(self._path(key), "r") as f:
+                return json_codec.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable sync state '{key}', a full sync will run: {e}")
+            return None
+
+    def save(self, key, state):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json_codec.dump(state, f)
+        os.replace(tmp_path, path)  # atomic, so a crash never leaves a half-written state
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_sync_state_store():
+    """
+    Return the process-wide sync state store, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SyncStateStore()
+    return _store
+
+
+def get_watermark(activities, previous=None):
+    """
+    Return the (date, id) watermark of the newest activity, or `previous` if there are none.
+    """
+    watermark = previous
+    for activity in activities:
+        if watermark is None or (activity["date"], activity["id"]) > (watermark["date"], watermark["id"]):
+            watermark = {"date": activity["date"], "id": activity["id"]}
+    return watermark
+
+
+def newer_than(activities, watermark):
+    """
+    Keep only the activities that come after the watermark.
+
+    `activities` may be a generator; only the new activities are held in memory. Activities without a
+    date or ID cannot be placed relative to the watermark and are skipped.
+    """
+    new = []
+    for activity in activities:
+        if activity.get("date") is None or activity.get("id") is None:
+            logger.warning(f"Skipping activity without a date or ID during incremental sync: {activity.get('id')}")
+            continue
+        if watermark is None or (activity["date"], activity["id"]) > (watermark["date"], watermark["id"]):
+            new.append(activity)
+    return new
+
+
+def fetch_new_activities(player_id, gds, auth_bearer, watermark):
+    """
+    Fetch the activities of a stream that are newer than its watermark.
+    """
+    start_date = None
+    if watermark is not None:
+        start = datetime.utcfromtimestamp(watermark["date"] / 1000) - START_MARGIN
+        start_date = start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return newer_than(iter_activities(player_id, gds, auth_bearer, start_date=start_date), watermark)
+
+
+def merge_latest_activity_info(previous, new):
+    # The newest activity of the increment supersedes the stored one
+    return new if new.get("id") is not None else previous
+
+
+def merge_trivia_metrics(previous, new):
+    """
+    Merge trivia counters: all metrics are counts, so they add up.
+    """
+    return {
+        group: {name: previous.get(group, {}).get(name, 0) + count for name, count in counts.items()}
+        for group, counts in new.items()
+    }
+
+
+def merge_sugarvita_metrics(previous, new):
+    """
+    Merge SugarVita metrics: all metrics are per-session lists, so they concatenate.
+    """
+    return {name: previous.get(name, []) + values for name, values in new.items()}
+
+
+def sync_trivia_data(player_id, auth_bearer):
+    """
+    Incrementally refresh the trivia metrics of a player.
+
+    Returns:
+        tuple: (metrics, latest_activity_info) like fetch_trivia_data, or (None, None) if the fetch fails.
+    """
+    key = f"GameBus-{player_id}-{TRIVIA_GDS}"
+    # Concurrent refreshes of the same stream share one sync instead of queueing on its lock
+    return get_single_flight().do(("sync", key), lambda: _sync_trivia_data(key, player_id, auth_bearer))
+
+
+def _sync_trivia_data(key, player_id, auth_bearer):
+    store = get_sync_state_store()
+    with store.lock(key):
+        state = store.load(key)
+        watermark = state["watermarks"][TRIVIA_GDS] if state else None
+
+        try:
+            new_activities = fetch_new_activities(player_id, TRIVIA_GDS, auth_bearer, watermark)
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            logger.error(f"Error syncing trivia data for player {player_id}: {e}")
+            return None, None
+
+        if state and not new_activities:
+            return state["metrics"], state["latest_activity_info"]
+
+        metrics, latest_activity_info = parse_trivia_activities(new_activities)
+        if state:
+            metrics = merge_trivia_metrics(state["metrics"], metrics)
+            latest_activity_info = merge_latest_activity_info(state["latest_activity_info"], latest_activity_info)
+
+        store.save(key, {
+            "watermarks": {TRIVIA_GDS: get_watermark(new_activities, watermark)},
+            "metrics": metrics,
+            "latest_activity_info": latest_activity_info,
+        })
+        logger.info(f"Synced {len(new_activities)} new trivia activities for player {player_id}")
+        return metrics, latest_activity_info
+
+
+def sync_sugarvita_data(player_id, auth_bearer):
+    """
+    Incrementally refresh the SugarVita metrics of a player.
+
+    The playthrough and engagement streams have separate watermarks.
+
+    Returns:
+        tuple: (metrics, latest_activity_info) like fetch_sugarvita_data, or (None, None) if the fetch fails.
+    """
+    key = f"GameBus-{player_id}-SUGARVITA"
+    return get_single_flight().do(("sync", key), lambda: _sync_sugarvita_data(key, player_id, auth_bearer))
+
+
+def _sync_sugarvita_data(key, player_id, auth_bearer):
+    store = get_sync_state_store()
+    with store.lock(key):
+        state = store.load(key)
+        watermarks = state["watermarks"] if state else {}
+
+        try:
+            new_playthroughs = fetch_new_activities(player_id, SUGARVITA_PLAYTHROUGH_GDS, auth_bearer, watermarks.get(SUGARVITA_PLAYTHROUGH_GDS))
+            new_engagements = fetch_new_activities(player_id, SUGARVITA_ENGAGEMENT_GDS, auth_bearer, watermarks.get(SUGARVITA_ENGAGEMENT_GDS))
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            logger.error(f"Error syncing sugarvita data for player {player_id}: {e}")
+            return None, None
+
+        if state and not new_playthroughs and not new_engagements:
+            return state["metrics"], state["latest_activity_info"]
+
+        metrics, latest_activity_info = parse_sugarvita_activities(new_playthroughs, new_engagements)
+        if state:
+            metrics = merge_sugarvita_metrics(state["metrics"], metrics)
+            latest_activity_info = {
+                stream: merge_latest_activity_info(state["latest_activity_info"][stream], info)
+                for stream, info in latest_activity_info.items()
+            }
+
+        store.save(key, {
+            "watermarks": {
+                SUGARVITA_PLAYTHROUGH_GDS: get_watermark(new_playthroughs, watermarks.get(SUGARVITA_PLAYTHROUGH_GDS)),
+                SUGARVITA_ENGAGEMENT_GDS: get_watermark(new_engagements, watermarks.get(SUGARVITA_ENGAGEMENT_GDS)),
+            },
+            "metrics": metrics,
+            "latest_activity_info": latest_activity_info,
+        })
+        logger.info(f"Synced {len(new_playthroughs)} new playthroughs and {len(new_engagements)} new engagement logs for player {player_id}")
+        return metrics, latest_activity_info
@@ -0,0 +1,133 @@
+"""
+JSON codec shared by the HDT API responses, the GameBus parsers and the storage layers.
+
+Encoding and decoding use orjson when it is installed, and fall back to the standard library json
+module otherwise. Output is always compact (no indentation or spaces after separators). The
+backend can be forced with an environment variable (e.g. in config/.env):
+    HDT_JSON_CODEC  "auto" (default: orjson when available) or "json".
+
+The backend is selected on first use, so HDT_JSON_CODEC is also read from config/.env when that is
+loaded after this module is imported.
+
+Both backends accept the same inputs and produce the same documents: non-finite floats (NaN,
+Infinity) are written as null by either. Values orjson cannot encode (e.g. integers beyond 64 bits)
+and documents it cannot decode (e.g. NaN literals written by older versions) are handled by the
+standard library instead.
+"""
+import json
+import logging
+import math
+import os
+
+try:
+    import orjson
+except ImportError:  # the standard library codec is used without orjson
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def load_codec_name():
+    """
+    Select the JSON backend from HDT_JSON_CODEC and the installed packages.
+    """
+    requested = os.getenv("HDT_JSON_CODEC", "auto").lower()
+    if requested not in ("auto", "json", "orjson"):
+        logger.error(f"Unknown HDT_JSON_CODEC '{requested}'. Using auto.")
+        requested = "auto"
+    if requested == "json":
+        return "json"
+    if orjson is None:
+        if requested == "orjson":
+            logger.error("HDT_JSON_CODEC=orjson but orjson is not installed. Using the json module.")
+        return "json"
+    return "orjson"
+
+
+_codec = None
+
+if orjson is not None:
+    # Non-str keys are converted like json does; datetimes go through `default` like with json
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+
+def get_codec():
+    """
+    Return the name of the JSON backend ("orjson" or "json"), selecting it on first use.
+    """
+    global _codec
+    if _codec is None:
+        _codec = load_codec_name()
+    return _codec
+
+
+def _replace_non_finite(obj):
+    # Like orjson: NaN and Infinity become null
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return obj
+
+
+def _json_dumps(obj, default, sort_keys):
+    try:
+        return json.dumps(obj, default=default, sort_keys=sort_keys, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        # Only documents with non-finite floats pay for the copy
+        return json.dumps(_replace_non_finite(obj), default=default, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def dumps_bytes(obj, default=None, sort_keys=False):
+    """
+    Serialize obj to compact UTF-8 encoded JSON.
+    """
+    if get_codec() == "orjson":
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits; json raises itself if the value cannot be encoded
+    return _json_dumps(obj, default, sort_keys).encode("utf-8")
+
+
+def dumps(obj, default=None, sort_keys=False):
+    """
+    Serialize obj to a compact JSON string.
+    """
+    if get_codec() == "orjson":
+        return dumps_bytes(obj, default=default, sort_keys=sort_keys).decode("utf-8")
+    return _json_dumps(obj, default, sort_keys)
+
+
+def loads(data):
+    """
+    Deserialize a JSON document given as str or bytes.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed.
+    """
+    if get_codec() == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals; json raises itself if the document is malformed
+    return json.loads(data)
+
+
+def load(f):
+    """
+    Deserialize a JSON document from a file opened in text or binary mode.
+    """
+    return loads(f.read())
+
+
+def dump(obj, f, default=None):
+    """
+    Serialize obj as compact JSON into a file opened in text mode.
+    """
+    f.write(dumps(obj, default=default))
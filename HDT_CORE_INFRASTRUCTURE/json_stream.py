@@ -0,0 +1,110 @@
+"""
+Incremental decoding of JSON arrays, used to parse large upstream responses record by record.
+
+The GameBus activities endpoints return one JSON array per request. Instead of materialising the
+full response text and object tree, iter_json_array consumes the body chunk by chunk and yields each
+array element as soon as it is complete. Peak memory is bounded by the largest single element
+(plus one chunk), not by the size of the response.
+"""
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a JSON array delivered as an iterable of text or bytes chunks.
+
+    An empty body yields nothing.
+
+    Raises:
+        json.JSONDecodeError: If the body is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+
+    buffer = ""
+    pos = 0
+    exhausted = False
+    retry_at = 0  # buffer length to wait for before retrying an incomplete element
+    state = "start"
+
+    while True:
+        # Skip whitespace between tokens
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        needs_data = pos == len(buffer) or (state in ("first_value", "value") and len(buffer) < retry_at)
+        if needs_data and not exhausted:
+            # Drop the consumed prefix before growing the buffer
+            if pos:
+                buffer = buffer[pos:]
+                retry_at = max(0, retry_at - pos)
+                pos = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                buffer += text_decoder.decode(b"", final=True)
+            else:
+                buffer += text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            continue
+
+        if pos == len(buffer):
+            if state in ("start", "done"):
+                return  # empty body, or the array is complete
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            state = "first_value"
+        elif state == "first_value" and char == "]":
+            pos += 1
+            state = "done"
+        elif state in ("first_value", "value"):
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                # The element is incomplete; wait until the unconsumed data has doubled before
+                # decoding again, so large elements are not re-scanned for every chunk
+                retry_at = len(buffer) + max(len(buffer) - pos, CHUNK_SIZE)
+                continue
+            if not exhausted and buffer[end - 1] not in '}]"' and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                # A number is only complete once a delimiter follows; it may continue in the next chunk
+                retry_at = len(buffer) + 1
+                continue
+            retry_at = 0
+            pos = end
+            state = "separator"
+            yield element
+        elif state == "separator":
+            if char == ",":
+                state = "value"
+            elif char == "]":
+                state = "done"
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+        else:
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def iter_response_items(response, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of the JSON array in an HTTP response body.
+
+    requests responses are consumed incrementally (request them with stream=True to avoid buffering
+    the body); other response objects only need a `.text` attribute.
+    """
+    if hasattr(response, "iter_content"):
+        return iter_json_array(response.iter_content(chunk_size=chunk_size))
+    return iter_json_array([response.text or ""])
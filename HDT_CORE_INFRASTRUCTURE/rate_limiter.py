@@ -0,0 +1,212 @@
+"""
+Token-bucket rate limiting of the requests to the external applications (GameBus, Google Fit).
+
+Every upstream request, including retries, first takes a token from two buckets: the bucket of its
+auth token, so that each player's (or app's) token stays within its upstream quota, and the bucket of
+its connected application, so that the requests of all users together stay within the quota of the
+application however many users are fetched in parallel. Buckets refill continuously at `rate` tokens
+per second and hold at most `burst` tokens. When a bucket is empty, the request reserves the next
+token and waits for it; waiting requests are served in arrival order. The blocking fetchers
+(http_client.py) and the async connectors (connectors.py) share the same buckets.
+
+Rates are configured per connected application through environment variables (e.g. in config/.env),
+falling back to the defaults for all applications:
+    HDT_RATE_LIMIT_<APP>      Requests per second per auth token, e.g. HDT_RATE_LIMIT_GAMEBUS or
+                              HDT_RATE_LIMIT_GOOGLE_FIT (default HDT_RATE_LIMIT, or 10; 0 disables
+                              the per-token limit).
+    HDT_RATE_BURST_<APP>      Token bucket size: requests that may be sent at once after an idle period
+                              (default HDT_RATE_BURST, or the rate).
+    HDT_APP_RATE_LIMIT_<APP>  Requests per second of the application as a whole, over all auth tokens
+                              (default HDT_APP_RATE_LIMIT, or 50; 0 disables the application limit).
+    HDT_APP_RATE_BURST_<APP>  Application bucket size (default HDT_APP_RATE_BURST, or the rate).
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 10.0
+DEFAULT_APP_RATE = 50.0
+
+# Upstream host -> connected application; requests to other hosts are limited per host
+UPSTREAM_APPLICATIONS = {
+    "api3-new.gamebus.eu": "GameBus",
+    "www.googleapis.com": "Google Fit",
+}
+
+# Auth token buckets kept; beyond this the least recently used one is dropped
+MAX_TOKEN_BUCKETS = 10000
+
+
+def _env_float(names, default):
+    for name in names:
+        value = os.getenv(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            logger.error(f"Invalid value '{value}' for {name}. Expected a number.")
+    return default
+
+
+def load_rate_limit(application):
+    """
+    Load the per auth token and application-wide rates (requests per second, 0 for unlimited) and
+    bursts of a connected application.
+    """
+    suffix = re.sub(r"[^A-Z0-9]+", "_", application.upper()).strip("_")
+    rate = _env_float((f"HDT_RATE_LIMIT_{suffix}", "HDT_RATE_LIMIT"), DEFAULT_RATE)
+    burst = _env_float((f"HDT_RATE_BURST_{suffix}", "HDT_RATE_BURST"), rate)
+    app_rate = _env_float((f"HDT_APP_RATE_LIMIT_{suffix}", "HDT_APP_RATE_LIMIT"), DEFAULT_APP_RATE)
+    app_burst = _env_float((f"HDT_APP_RATE_BURST_{suffix}", "HDT_APP_RATE_BURST"), app_rate)
+    return {"rate": rate, "burst": max(1.0, burst), "app_rate": app_rate, "app_burst": max(1.0, app_burst)}
+
+
+def upstream_application(url):
+    host = urlsplit(url).hostname or ""
+    return UPSTREAM_APPLICATIONS.get(host, host)
+
+
+class TokenBucket:
+    """
+    A token bucket handing out reservations: reserve() takes a token, possibly one that has not been
+    refilled yet, and returns how long the caller has to wait until it is available.
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def reserve(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets per connected application and per (connected application, auth token), with wait
+    time statistics per application.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limits = {}
+        self._app_buckets = {}
+        self._buckets = OrderedDict()  # least recently used first
+        self._counters = {}
+
+    def _limit(self, application, now):
+        limit = self._limits.get(application)
+        if limit is None:
+            limit = self._limits[application] = load_rate_limit(application)
+            if limit["app_rate"]:
+                self._app_buckets[application] = TokenBucket(limit["app_rate"], limit["app_burst"], now)
+            self._counters[application] = {
+                "requests": 0,
+                "delayed": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+                "app_wait_seconds_total": 0.0,
+                "app_wait_seconds_max": 0.0,
+                "token_wait_seconds_total": 0.0,
+                "token_wait_seconds_max": 0.0,
+            }
+        return limit
+
+    def _token_bucket(self, key, limit, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TOKEN_BUCKETS:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = TokenBucket(limit["rate"], limit["burst"], now)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def reserve(self, url, auth_bearer=None):
+        """
+        Reserve a token of the application and of the auth token for a request and return the
+        seconds to wait before sending it: the longer of the two waits.
+        """
+        application = upstream_application(url)
+        # Only a digest of the auth token is kept in memory
+        key = (application, hashlib.sha256((auth_bearer or "").encode("utf-8")).digest())
+        now = time.monotonic()
+
+        with self._lock:
+            limit = self._limit(application, now)
+            counters = self._counters[application]
+            counters["requests"] += 1
+
+            app_bucket = self._app_buckets.get(application)
+            app_wait = app_bucket.reserve(now) if app_bucket else 0.0
+            token_wait = self._token_bucket(key, limit, now).reserve(now) if limit["rate"] else 0.0
+            wait = max(app_wait, token_wait)
+
+            if wait > 0:
+                counters["delayed"] += 1
+                for level, level_wait in (("", wait), ("app_", app_wait), ("token_", token_wait)):
+                    counters[f"{level}wait_seconds_total"] += level_wait
+                    counters[f"{level}wait_seconds_max"] = max(counters[f"{level}wait_seconds_max"], level_wait)
+        return wait
+
+    def acquire(self, url, auth_bearer=None):
+        """
+        Block until the request may be sent.
+        """
+        wait = self.reserve(url, auth_bearer)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url, auth_bearer=None):
+        """
+        Wait, without blocking the event loop, until the request may be sent.
+        """
+        wait = self.reserve(url, auth_bearer)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        """
+        Return per connected application the requests, how many were delayed, the total and maximum
+        queue wait in seconds (overall, and caused by the application and the auth token buckets),
+        the number of auth token buckets and the configured rates and bursts.
+        """
+        with self._lock:
+            stats = {application: dict(counters) for application, counters in self._counters.items()}
+            bucket_counts = {}
+            for application, _ in self._buckets:
+                bucket_counts[application] = bucket_counts.get(application, 0) + 1
+            for application, application_stats in stats.items():
+                for name, value in application_stats.items():
+                    if name.endswith(("_total", "_max")):
+                        application_stats[name] = round(value, 6)
+                application_stats["buckets"] = bucket_counts.get(application, 0)
+                application_stats["settings"] = dict(self._limits[application])
+        return stats
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide rate limiter shared by the blocking fetchers and the async connectors.
+    """
+    return _rate_limiter
+
+
+def get_rate_limit_stats():
+    return _rate_limiter.stats()
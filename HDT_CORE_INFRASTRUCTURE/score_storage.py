@@ -0,0 +1,272 @@
+"""
+Storage backends for the scores computed by the virtual twin models (player types, health literacy).
+
+Every model run appends one entry per user; the app developer endpoints read the latest entry of a
+user. Two backends are available, selected with environment variables (e.g. in config/.env):
+    HDT_SCORE_STORE       "json" (default) or "sqlite".
+    HDT_SCORE_STORE_PATH  Storage file (default: diabetes_pt_hl_storage.json or
+                          diabetes_pt_hl_storage.sqlite3 in the project root).
+
+The JSON backend keeps the original diabetes_pt_hl_storage.json layout. The SQLite backend stores one
+row per entry, indexed on user_id, so that the latest-entry lookup is an index seek and an append
+inserts a single row. In both backends the latest entry is the last one appended. An existing JSON file is migrated once with:
+    python -m HDT_CORE_INFRASTRUCTURE.score_storage migrate [json_path] [sqlite_path]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+
+from HDT_CORE_INFRASTRUCTURE import json_codec
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_JSON_PATH = os.path.join(PROJECT_ROOT, "diabetes_pt_hl_storage.json")
+DEFAULT_SQLITE_PATH = os.path.join(PROJECT_ROOT, "diabetes_pt_hl_storage.sqlite3")
+
+
+class ScoreStore:
+    """
+    Interface of the score storage backends. User IDs may be given as int or str.
+    """
+    def get_latest_entry(self, user_id):
+        """
+        Return (user_found, latest_entry); latest_entry is None if the user has no entries.
+
+        Only the JSON backend can hold a user without entries ((True, None)); SQLite stores entries
+        only, so such a user is reported as not found ((False, None)).
+        """
+        raise NotImplementedError
+
+    def get_latest_entries(self, user_ids):
+        """
+        Return {user_id: (user_found, latest_entry)} for many users in one pass over the store.
+        """
+        return {user_id: self.get_latest_entry(user_id) for user_id in user_ids}
+
+    def append_entries(self, entries_by_user):
+        """
+        Append new entries, given as {user_id: [entry, ...]}, in a single write.
+        """
+        raise NotImplementedError
+
+    def iter_users(self):
+        """
+        Yield (user_id, entries) for every stored user, with user_id as str.
+        """
+        raise NotImplementedError
+
+
+class JsonScoreStore(ScoreStore):
+    """
+    Score store backed by a single JSON file ({"users": {user_id: {"entries": [...]}}}).
+
+    The parsed file is kept in memory and only re-read when the file changes on disk.
+    """
+    def __init__(self, path=DEFAULT_JSON_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._data = {"users": {}}
+
+    def _load(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return {"users": {}}
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if signature != self._signature:
+                with open(self.path, "r") as f:
+                    content = f.read().strip()
+                self._data = json_codec.loads(content) if content else {"users": {}}
+                self._signature = signature
+            return self._data
+
+    def get_latest_entry(self, user_id):
+        return self._latest_entry(self._load(), user_id)
+
+    def get_latest_entries(self, user_ids):
+        data = self._load()  # one read of the file for all users
+        return {user_id: self._latest_entry(data, user_id) for user_id in user_ids}
+
+    @staticmethod
+    def _latest_entry(data, user_id):
+        user_data = data.get("users", {}).get(str(user_id), {})
+        if not user_data:
+            return False, None
+        entries = user_data.get("entries")
+        return True, entries[-1] if entries else None
+
+    def append_entries(self, entries_by_user):
+        try:
+            data = self._load()
+        except json_codec.JSONDecodeError:
+            logger.error(f"Score storage {self.path} is corrupted or invalid; starting a new file.")
+            data = {"users": {}}
+
+        with self._lock:
+            # Build a new document instead of mutating the cached one, which readers may be iterating
+            users = dict(data.get("users", {}))
+            for user_id, entries in entries_by_user.items():
+                user_storage = users.get(str(user_id), {})
+                users[str(user_id)] = {**user_storage, "entries": user_storage.get("entries", []) + list(entries)}
+            new_data = {**data, "users": users}
+
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json_codec.dump(new_data, f)
+            os.replace(tmp_path, self.path)  # atomic, so readers never see a partial file
+            stat = os.stat(self.path)
+            self._data = new_data
+            self._signature = (stat.st_mtime_ns, stat.st_size)
+
+    def iter_users(self):
+        for user_id, user_data in self._load().get("users", {}).items():
+            yield user_id, user_data.get("entries", [])
+
+
+class SqliteScoreStore(ScoreStore):
+    """
+    Score store backed by an embedded SQLite database in WAL mode.
+
+    The latest entry of a user is the one inserted last, like the end of the JSON entries list.
+    Each thread uses its own connection; WAL lets readers proceed while the model appends.
+    """
+    # Insertion order, like the JSON entries list: local date strings do not sort across the DST fall-back hour
+    LATEST_ENTRY_QUERY = "SELECT payload FROM entries WHERE user_id = ? ORDER BY id DESC LIMIT 1"
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " id INTEGER PRIMARY KEY,"
+                " user_id TEXT NOT NULL,"
+                " date TEXT,"
+                " payload TEXT NOT NULL)"
+            )
+            # Index entries hold the rowid, so each user's entries are in insertion order
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_user ON entries (user_id)")
+            connection.execute("DROP INDEX IF EXISTS entries_user_date")
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_latest_entry(self, user_id):
+        # A single seek to the last user_id index entry
+        return self._latest_entry(self._connect(), user_id)
+
+    def get_latest_entries(self, user_ids):
+        connection = self._connect()
+        # One read transaction, so all users are resolved against the same snapshot
+        connection.execute("BEGIN")
+        try:
+            return {user_id: self._latest_entry(connection, user_id) for user_id in user_ids}
+        finally:
+            connection.commit()
+
+    def _latest_entry(self, connection, user_id):
+        row = connection.execute(self.LATEST_ENTRY_QUERY, (str(user_id),)).fetchone()
+        if row is None:
+            return False, None
+        return True, json_codec.loads(row[0])
+
+    def append_entries(self, entries_by_user):
+        rows = [
+            (str(user_id), entry.get("date"), json_codec.dumps(entry))
+            for user_id, entries in entries_by_user.items()
+            for entry in entries
+        ]
+        with self._connect() as connection:  # one transaction
+            connection.executemany("INSERT INTO entries (user_id, date, payload) VALUES (?, ?, ?)", rows)
+
+    def iter_users(self):
+        user_id, entries = None, []
+        rows = self._connect().execute("SELECT user_id, payload FROM entries ORDER BY user_id, id")
+        for row_user_id, payload in rows:
+            if row_user_id != user_id:
+                if user_id is not None:
+                    yield user_id, entries
+                user_id, entries = row_user_id, []
+            entries.append(json_codec.loads(payload))
+        if user_id is not None:
+            yield user_id, entries
+
+    def count_entries(self):
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+SCORE_STORES = {
+    "json": (JsonScoreStore, DEFAULT_JSON_PATH),
+    "sqlite": (SqliteScoreStore, DEFAULT_SQLITE_PATH),
+}
+
+
+def load_score_store():
+    """
+    Create the score store configured with HDT_SCORE_STORE and HDT_SCORE_STORE_PATH.
+    """
+    backend = os.getenv("HDT_SCORE_STORE", "json").lower()
+    if backend not in SCORE_STORES:
+        logger.error(f"Unknown HDT_SCORE_STORE '{backend}'. Using the JSON score store.")
+        backend = "json"
+    store_class, default_path = SCORE_STORES[backend]
+    return store_class(os.getenv("HDT_SCORE_STORE_PATH") or default_path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_score_store():
+    """
+    Return the process-wide score store, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = load_score_store()
+    return _store
+
+
+def migrate_json_to_sqlite(json_path=DEFAULT_JSON_PATH, sqlite_path=DEFAULT_SQLITE_PATH):
+    """
+    Copy all entries of a JSON score store into a SQLite score store, preserving their order.
+
+    Refuses to run if the SQLite store already holds entries, so the migration is never applied twice.
+
+    Returns:
+        int: Number of migrated entries.
+    """
+    target = SqliteScoreStore(sqlite_path)
+    if target.count_entries():
+        raise RuntimeError(f"{sqlite_path} already contains entries; not migrating again.")
+
+    entries_by_user = dict(JsonScoreStore(json_path).iter_users())
+    target.append_entries(entries_by_user)
+    return sum(len(entries) for entries in entries_by_user.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the HDT score storage.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="Migrate the JSON score storage to SQLite.")
+    migrate_parser.add_argument("json_path", nargs="?", default=DEFAULT_JSON_PATH)
+    migrate_parser.add_argument("sqlite_path", nargs="?", default=DEFAULT_SQLITE_PATH)
+    args = parser.parse_args()
+
+    count = migrate_json_to_sqlite(args.json_path, args.sqlite_path)
+    print(f"Migrated {count} entries from {args.json_path} to {args.sqlite_path}.")
+    print("Set HDT_SCORE_STORE=sqlite to use the migrated store.")
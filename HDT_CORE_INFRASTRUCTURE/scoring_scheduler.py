@@ -0,0 +1,350 @@
+"""
+Background re-scoring of the diabetes twin models for users with new GameBus activity.
+
+Instead of re-scoring every user in a manual run of Virtual_Twin_Models/HDT_DIABETES_model.py, the
+scheduler periodically refreshes the trivia and SugarVita data of the users with the incremental sync
+(only new activities are fetched) and compares the IDs of their latest activities with those of their
+last scoring. Only users whose latest activities changed ("dirty" users) are queued and re-scored; the
+new score entries are appended to the score store.
+
+Scoring runs on its own worker thread, in batches, behind a bounded queue. When the queue is full the
+check stops early and the remaining users are checked on the next run, so a slow scorer is never
+flooded with work. The latest activity IDs of the last scoring are kept in the sync state store, so
+a restart does not re-score unchanged users.
+
+Settings (e.g. in config/.env):
+    HDT_SCORING_INTERVAL    Seconds between checks (default 0: the scheduler does not run in the API server).
+    HDT_SCORING_QUEUE_SIZE  Users that may wait for scoring (default 256).
+    HDT_SCORING_BATCH_SIZE  Users scored together and checked per upstream fan-out (default 32).
+    HDT_SCORING_CLIENT_ID   Client whose trivia and SugarVita permissions select the users (default MODEL_DEVELOPER_1).
+
+Run it as a daemon next to the API (e.g. with several API workers) with:
+    python -m HDT_CORE_INFRASTRUCTURE.scoring_scheduler [--once]
+"""
+import argparse
+import importlib
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+from HDT_CORE_INFRASTRUCTURE.score_storage import get_score_store
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODELS_DIR = os.path.join(PROJECT_ROOT, "Virtual_Twin_Models")
+
+DEFAULT_SETTINGS = {
+    "HDT_SCORING_INTERVAL": 0.0,
+    "HDT_SCORING_QUEUE_SIZE": 256,
+    "HDT_SCORING_BATCH_SIZE": 32,
+}
+DEFAULT_SCORING_CLIENT_ID = "MODEL_DEVELOPER_1"
+
+# Sync state key of the latest activity IDs each user was last scored with
+FINGERPRINTS_KEY = "SCORING-latest_activity_ids"
+
+
+def load_scoring_settings():
+    """
+    Load the scheduler settings from the environment, falling back to the defaults on invalid values.
+    """
+    settings = {}
+    for env_var, default in DEFAULT_SETTINGS.items():
+        value = os.getenv(env_var)
+        try:
+            settings[env_var] = max(0, type(default)(value)) if value is not None else default
+        except ValueError:
+            logger.error(f"Invalid value '{value}' for {env_var}. Using {default}.")
+            settings[env_var] = default
+    settings["HDT_SCORING_QUEUE_SIZE"] = max(1, settings["HDT_SCORING_QUEUE_SIZE"])
+    settings["HDT_SCORING_BATCH_SIZE"] = max(1, settings["HDT_SCORING_BATCH_SIZE"])
+    settings["HDT_SCORING_CLIENT_ID"] = os.getenv("HDT_SCORING_CLIENT_ID", DEFAULT_SCORING_CLIENT_ID)
+    return settings
+
+
+def get_sync_state_store():
+    # Imported on first use: the incremental sync pulls in the connectors, which the API loads lazily
+    from HDT_CORE_INFRASTRUCTURE.incremental_sync import get_sync_state_store
+    return get_sync_state_store()
+
+
+def latest_activity_ids(trivia_entry, sugarvita_entry):
+    """
+    Return the IDs of a user's latest trivia, playthrough and engagement activities, or None if the
+    user cannot be scored (an entry carries an error instead of data).
+    """
+    if "data" not in trivia_entry or "data" not in sugarvita_entry:
+        return None
+    trivia_info = trivia_entry["data"]["latest_activity_info"]
+    sugarvita_info = sugarvita_entry["data"]["latest_activity_info"]
+    return [trivia_info.get("id"), sugarvita_info["playthrough"].get("id"), sugarvita_info["engagement"].get("id")]
+
+
+def score_users(trivia_data, sugarvita_data):
+    """
+    Score users with the diabetes model and append the new entries to the score store.
+
+    The model (and NumPy) is imported on the first call, keeping it out of the API start-up.
+    """
+    if MODELS_DIR not in sys.path:
+        sys.path.insert(0, MODELS_DIR)
+    process_user_data = importlib.import_module("HDT_DIABETES_model").process_user_data
+
+    storage_data = {"users": {}}
+    process_user_data(storage_data, trivia_data, sugarvita_data)
+    get_score_store().append_entries(
+        {user_id: user_storage["entries"] for user_id, user_storage in storage_data["users"].items()}
+    )
+
+
+class ScoringScheduler:
+    """
+    Periodically re-scores the users whose latest GameBus activities changed since their last scoring.
+
+    Args:
+        list_users (callable): Returns the IDs of the users to keep scored.
+        collect_users (callable): Takes a list of user IDs and returns, in the same order, a
+            (trivia entry, SugarVita entry) pair per user as returned by the data endpoints.
+        score (callable): Scores the trivia and SugarVita entries of a batch of users and stores the results.
+        interval (float): Seconds between checks; 0 disables the background threads.
+        queue_size (int): Users that may wait for scoring before checks are deferred.
+        batch_size (int): Users scored together, and checked per call of collect_users.
+    """
+    def __init__(self, list_users, collect_users, score=score_users, interval=None, queue_size=None, batch_size=None):
+        settings = load_scoring_settings()
+        self.list_users = list_users
+        self.collect_users = collect_users
+        self.score = score
+        self.interval = settings["HDT_SCORING_INTERVAL"] if interval is None else interval
+        self.batch_size = settings["HDT_SCORING_BATCH_SIZE"] if batch_size is None else batch_size
+        self._queue = queue.Queue(maxsize=settings["HDT_SCORING_QUEUE_SIZE"] if queue_size is None else queue_size)
+
+        self._lock = threading.Lock()
+        self._pending = set()  # users queued or being scored
+        self._fingerprints = None  # user ID (str) -> latest activity IDs of the last scoring
+        self._stop = threading.Event()
+        self._threads = []
+        self._counters = {
+            "checks": 0,
+            "users_checked": 0,
+            "dirty_users": 0,
+            "deferred_users": 0,
+            "batches": 0,
+            "users_scored": 0,
+            "failures": 0,
+            "last_check_ms": None,
+            "last_check_at": None,
+            "last_batch_ms": None,
+            "last_error": None,
+        }
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, increment in increments.items():
+                self._counters[name] += increment
+
+    def _load_fingerprints(self):
+        if self._fingerprints is None:
+            state = get_sync_state_store().load(FINGERPRINTS_KEY)
+            self._fingerprints = state["users"] if state else {}
+        return self._fingerprints
+
+    def check(self):
+        """
+        Refresh the data of all users and queue the dirty ones for scoring.
+
+        Returns:
+            int: The number of users queued.
+        """
+        started = time.perf_counter()
+        user_ids = list(self.list_users())
+        fingerprints = self._load_fingerprints()
+        queued = checked = 0
+
+        for offset in range(0, len(user_ids), self.batch_size):
+            if self._stop.is_set():
+                break
+            if self._queue.full():
+                # Backpressure: check the remaining users once the scorer has caught up
+                self._count(deferred_users=len(user_ids) - offset)
+                logger.warning(f"Scoring queue is full, deferring {len(user_ids) - offset} users to the next check")
+                break
+
+            with self._lock:
+                chunk = [user_id for user_id in user_ids[offset:offset + self.batch_size] if user_id not in self._pending]
+            if not chunk:
+                continue
+            for user_id, (trivia_entry, sugarvita_entry) in zip(chunk, self.collect_users(chunk)):
+                checked += 1
+                activity_ids = latest_activity_ids(trivia_entry, sugarvita_entry)
+                if activity_ids is None or fingerprints.get(str(user_id)) == activity_ids:
+                    continue
+                with self._lock:
+                    self._pending.add(user_id)
+                try:
+                    self._queue.put_nowait((user_id, trivia_entry, sugarvita_entry, activity_ids))
+                except queue.Full:
+                    with self._lock:
+                        self._pending.discard(user_id)
+                        self._counters["deferred_users"] += 1
+                    continue
+                queued += 1
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._counters["checks"] += 1
+            self._counters["users_checked"] += checked
+            self._counters["dirty_users"] += queued
+            self._counters["last_check_ms"] = round(elapsed_ms, 3)
+            self._counters["last_check_at"] = time.time()
+        logger.info(f"Scoring check: {checked} users checked, {queued} queued for scoring in {elapsed_ms:.1f} ms")
+        return queued
+
+    def score_pending(self, timeout=None):
+        """
+        Score one batch of queued users, waiting up to `timeout` seconds for the first one
+        (None: do not wait).
+
+        Returns:
+            int: The number of users taken from the queue (also when scoring them failed).
+        """
+        try:
+            batch = [self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()]
+        except queue.Empty:
+            return 0
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        started = time.perf_counter()
+        try:
+            self.score([trivia_entry for _, trivia_entry, _, _ in batch], [sugarvita_entry for _, _, sugarvita_entry, _ in batch])
+        except Exception as e:
+            # The users stay dirty and are queued again by the next check
+            with self._lock:
+                self._counters["failures"] += 1
+                self._counters["last_error"] = str(e)
+                self._pending.difference_update(user_id for user_id, _, _, _ in batch)
+            logger.error(f"Error scoring {len(batch)} users: {e}")
+            return len(batch)
+
+        fingerprints = self._load_fingerprints()
+        for user_id, _, _, activity_ids in batch:
+            fingerprints[str(user_id)] = activity_ids
+        get_sync_state_store().save(FINGERPRINTS_KEY, {"users": fingerprints})
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._pending.difference_update(user_id for user_id, _, _, _ in batch)
+            self._counters["batches"] += 1
+            self._counters["users_scored"] += len(batch)
+            self._counters["last_batch_ms"] = round(elapsed_ms, 3)
+        logger.info(f"Scored {len(batch)} users in {elapsed_ms:.1f} ms")
+        return len(batch)
+
+    def run_once(self):
+        """
+        Check all users and score the dirty ones on the calling thread, until no user is dirty.
+
+        Returns:
+            int: The number of users scored.
+        """
+        users_scored = self._counters["users_scored"]
+        self._score_queued()
+        while True:
+            failures, deferred = self._counters["failures"], self._counters["deferred_users"]
+            self.check()
+            self._score_queued()
+            # Only a check deferred by a full queue is repeated; a failing batch would be queued forever
+            if self._counters["deferred_users"] == deferred or self._counters["failures"] > failures:
+                return self._counters["users_scored"] - users_scored
+
+    def _score_queued(self):
+        while self.score_pending():
+            pass
+
+    def start(self):
+        """
+        Start the check and scoring threads (daemon threads).
+        """
+        if self.interval <= 0 or self._threads:
+            return
+        self._threads = [
+            threading.Thread(target=self._run_checks, name="hdt-scoring-check", daemon=True),
+            threading.Thread(target=self._run_scoring, name="hdt-scoring-worker", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _run_checks(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                self._count(failures=1)
+                logger.error(f"Scoring check error: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def _run_scoring(self):
+        while not self._stop.is_set():
+            try:
+                self.score_pending(timeout=1.0)
+            except Exception as e:
+                logger.error(f"Scoring worker error: {e}")
+
+    def stats(self):
+        """
+        Return the check and scoring counters, the latency of the last check and batch, and the queue depth.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["pending_users"] = len(self._pending)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["queue_size"] = self._queue.maxsize
+        stats["batch_size"] = self.batch_size
+        stats["interval_seconds"] = self.interval
+        stats["running"] = bool(self._threads)
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score the users with new GameBus activity.")
+    parser.add_argument("--once", action="store_true", help="check and score all users once, then exit")
+    parser.add_argument("--interval", type=float, help="seconds between checks (default: HDT_SCORING_INTERVAL)")
+    args = parser.parse_args()
+
+    # The API module provides the permission-checked user selection and the data collection
+    from HDT_CORE_INFRASTRUCTURE.HDT_API import scoring_scheduler
+
+    if args.once:
+        print(f"Scored {scoring_scheduler.run_once()} users.")
+        return
+
+    if args.interval is not None:
+        scoring_scheduler.interval = args.interval
+    if scoring_scheduler.interval <= 0:
+        parser.error("set --interval or HDT_SCORING_INTERVAL to a positive number of seconds")
+    scoring_scheduler.start()
+    print(f"Scoring users with new activity every {scoring_scheduler.interval:g} seconds. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scoring_scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Coalescing of identical in-flight upstream requests ("single flight").
+
+When several callers ask for the same upstream resource at the same time (e.g. model developers and
+MCP tools hitting /get_sugarvita_data together), only the first caller performs the fetch. The others
+wait for it and receive the same parsed result, or the same exception. Coroutines (the async
+connectors) are coalesced per event loop with do_async.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its outcome with concurrent callers.
+
+    Shared results must be treated as read-only.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._tasks = {}  # (event loop, key) -> task of do_async
+        self._lock = threading.Lock()
+        self._counters = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        """
+        Return fn(), or the result of an identical call already in flight for `key`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._counters["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, fn):
+        """
+        Return await fn(), or the result of an identical call already in flight for `key` on the
+        running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is not None:
+                self._counters["coalesced"] += 1
+            else:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                self._counters["executed"] += 1
+                task.add_done_callback(lambda _: self._forget_task(task_key))
+        # A cancelled caller must not cancel the fetch the other callers are waiting for
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key):
+        with self._lock:
+            del self._tasks[task_key]
+
+    def stats(self):
+        """
+        Return how many calls were executed and how many duplicate calls were avoided.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._calls) + len(self._tasks)
+        return stats
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """
+    Return the process-wide single-flight group used by the fetchers.
+    """
+    return _single_flight
+
+
+def get_single_flight_stats():
+    return _single_flight.stats()
@@ -0,0 +1,99 @@
+"""
+Columnar representation of walk data, requested with /get_walk_data?format=columnar or format=npz.
+
+Instead of one dict per activity with formatted strings, the walk parsers can return one list per
+field, holding machine-readable values:
+    timestamp         Start of the activity in milliseconds since the epoch (UTC).
+    steps             Step count.
+    distance_meters   Distance in meters.
+    duration_seconds  Duration in seconds.
+    kcalories         Energy in kcal.
+Missing values are None. The columns load directly into a dataframe, e.g. pandas.DataFrame(data).
+
+format=npz encodes the walk data of all users as a single NumPy .npz archive in long format: the
+columns above plus a user_id column, with missing values as NaN, and the users that could not be
+fetched in `error_user_ids` and `errors`.
+"""
+import io
+
+try:
+    import numpy as np
+except ImportError:  # format=npz is unavailable without NumPy
+    np = None
+
+WALK_COLUMNS = ("timestamp", "steps", "distance_meters", "duration_seconds", "kcalories")
+
+
+def new_walk_columns():
+    return {column: [] for column in WALK_COLUMNS}
+
+
+def count_walk_rows(data):
+    """
+    Return the number of activities in walk data given as rows (list) or as columns (dict).
+    """
+    if isinstance(data, dict):
+        return len(data["timestamp"])
+    return len(data) if data else 0
+
+
+class ColumnRow:
+    """
+    The last row of a set of walk columns, assignable like the dict of a single activity.
+    """
+    __slots__ = ("columns",)
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def append(self, timestamp):
+        """
+        Start a new row; its values are None until they are assigned.
+        """
+        for values in self.columns.values():
+            values.append(None)
+        self.columns["timestamp"][-1] = timestamp
+
+    def __setitem__(self, column, value):
+        self.columns[column][-1] = value
+
+
+def encode_walk_npz(entries):
+    """
+    Encode the walk entries of several users ({"user_id", "data"} with columnar data, or
+    {"user_id", "error"}) as a NumPy .npz archive in long format.
+
+    Returns:
+        bytes: The archive.
+
+    Raises:
+        RuntimeError: If NumPy is not installed.
+    """
+    if np is None:
+        raise RuntimeError("format=npz requires NumPy")
+
+    user_ids, columns = [], new_walk_columns()
+    error_user_ids, errors = [], []
+    for entry in entries:
+        if "data" not in entry:
+            error_user_ids.append(entry["user_id"])
+            errors.append(entry.get("error", ""))
+            continue
+        data = entry["data"]
+        user_ids.extend([entry["user_id"]] * count_walk_rows(data))
+        for column in WALK_COLUMNS:
+            columns[column].extend(data[column])
+
+    arrays = {
+        "user_id": np.asarray(user_ids, dtype=np.int64),
+        "timestamp": np.asarray(columns["timestamp"], dtype=np.int64),
+        "error_user_ids": np.asarray(error_user_ids, dtype=np.int64),
+        "errors": np.asarray(errors, dtype=str),
+    }
+    for column in WALK_COLUMNS[1:]:
+        # None becomes NaN
+        arrays[column] = np.asarray(columns[column], dtype=np.float64)
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
@@ -0,0 +1,211 @@
+"""
+Hourly, daily and weekly walk rollups, requested with /get_walk_data?granularity=hour|day|week.
+
+Steps, distance, duration and kcal of the walk records of GameBus and Google Fit are summed per period
+in Europe/Amsterdam local time (days and weeks follow daylight saving time; weeks start on Monday).
+
+The rollups of every player are maintained incrementally: they are persisted together with a
+watermark in the sync state store (see incremental_sync), and a request only fetches and adds the
+walk records that came after the watermark. The first request of a player fetches its full history.
+As with the incremental sync, records back-filled upstream with a date before the watermark are not
+picked up; delete the player's state file to rebuild its rollups.
+"""
+import calendar
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import requests
+
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_fetch import WALK_GDS
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_parse import DUTCH_TIMEZONE, parse_walk_activities
+from HDT_CORE_INFRASTRUCTURE.GOOGLE_FIT_WALK_fetch import GOOGLE_FIT_MAX_TIME, GOOGLE_FIT_MIN_TIME, fetch_google_fit_walk_data
+from HDT_CORE_INFRASTRUCTURE.incremental_sync import fetch_new_activities, get_sync_state_store, get_watermark
+from HDT_CORE_INFRASTRUCTURE.single_flight import get_single_flight
+from HDT_CORE_INFRASTRUCTURE.walk_columns import count_walk_rows
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day", "week")
+ROLLUP_FIELDS = ("steps", "distance_meters", "duration_seconds", "kcalories")
+
+HOUR_MS = 3600 * 1000
+
+
+@lru_cache(maxsize=4096)
+def local_midnight_ms(day):
+    """
+    Return the start of a local (Europe/Amsterdam) calendar day in milliseconds since the epoch.
+    """
+    return int(DUTCH_TIMEZONE.localize(datetime(day.year, day.month, day.day)).timestamp() * 1000)
+
+
+def period_bounds(timestamp, granularity):
+    """
+    Return the (start, end) in epoch milliseconds of the local period containing a timestamp.
+    """
+    timestamp = int(timestamp)
+    if granularity == "hour":
+        # Amsterdam is a whole number of hours off UTC, so local hours coincide with UTC hours
+        start = timestamp - timestamp % HOUR_MS
+        return start, start + HOUR_MS
+
+    day = datetime.fromtimestamp(timestamp / 1000, tz=DUTCH_TIMEZONE).date()
+    length = timedelta(days=1)
+    if granularity == "week":
+        day -= timedelta(days=day.weekday())
+        length = timedelta(days=7)
+    return local_midnight_ms(day), local_midnight_ms(day + length)
+
+
+def new_rollups():
+    # granularity -> {period start (str, for JSON): [period end, steps, distance, duration, kcal, records]}
+    return {granularity: {} for granularity in GRANULARITIES}
+
+
+def add_to_rollups(rollups, columns):
+    """
+    Add walk records, given as columns (see walk_columns), to the rollups of all granularities.
+    Sums stay None while no record of the period has a value for the field.
+    """
+    values = [columns[field] for field in ROLLUP_FIELDS]
+    for index, timestamp in enumerate(columns["timestamp"]):
+        for granularity in GRANULARITIES:
+            start, end = period_bounds(timestamp, granularity)
+            bucket = rollups[granularity].setdefault(str(start), [end, None, None, None, None, 0])
+            for position, field_values in enumerate(values, start=1):
+                value = field_values[index]
+                if value is not None:
+                    bucket[position] = value if bucket[position] is None else bucket[position] + value
+            bucket[-1] += 1
+
+
+def fetch_new_gamebus_walks(player_id, auth_bearer, watermark):
+    """
+    Fetch the GameBus walk activities after the (date, id) watermark.
+
+    Returns:
+        tuple: (columns, new watermark)
+    """
+    activities = fetch_new_activities(player_id, WALK_GDS, auth_bearer, watermark)
+    return parse_walk_activities(activities, columnar=True), get_watermark(activities, watermark)
+
+
+def fetch_new_google_fit_walks(player_id, auth_bearer, watermark):
+    """
+    Fetch the Google Fit step count points starting after the watermark (start of the newest point).
+
+    Returns:
+        tuple: (columns, new watermark)
+    """
+    start_time = (watermark["timestamp"] + 1) * 10**6 if watermark else GOOGLE_FIT_MIN_TIME
+    # Bypass the activity cache: every increment has a different range and is used only once
+    columns = fetch_google_fit_walk_data.__wrapped__(player_id, auth_bearer, start_time, GOOGLE_FIT_MAX_TIME, columnar=True)
+    if columns is None:
+        raise requests.exceptions.RequestException(f"Google Fit walk data of player {player_id} could not be fetched")
+
+    if watermark:
+        # The dataset also returns points that started before the range but end inside it
+        keep = [index for index, timestamp in enumerate(columns["timestamp"]) if timestamp > watermark["timestamp"]]
+        columns = {name: [values[index] for index in keep] for name, values in columns.items()}
+    if columns["timestamp"]:
+        watermark = {"timestamp": max(columns["timestamp"])}
+    return columns, watermark
+
+
+FETCH_NEW_WALKS = {
+    "GameBus": fetch_new_gamebus_walks,
+    "Google Fit": fetch_new_google_fit_walks,
+}
+
+
+def rollup_state_key(connected_application, player_id, auth_bearer):
+    # Google Fit addresses every player as "me", so the player is told apart by its token
+    token = hashlib.sha256((auth_bearer or "").encode("utf-8")).hexdigest()[:16]
+    return f"{connected_application}-{player_id}-{token}-WALK_ROLLUPS"
+
+
+def sync_walk_rollups(connected_application, player_id, auth_bearer):
+    """
+    Add the walk records that came after the watermark to the player's stored rollups.
+
+    Returns:
+        dict: The rollups of all granularities, or None if the new records could not be fetched.
+    """
+    key = rollup_state_key(connected_application, player_id, auth_bearer)
+    return get_single_flight().do(
+        ("sync", key), lambda: _sync_walk_rollups(key, connected_application, player_id, auth_bearer)
+    )
+
+
+def _sync_walk_rollups(key, connected_application, player_id, auth_bearer):
+    store = get_sync_state_store()
+    with store.lock(key):
+        state = store.load(key)
+        watermark = state["watermark"] if state else None
+
+        try:
+            columns, watermark = FETCH_NEW_WALKS[connected_application](player_id, auth_bearer, watermark)
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error syncing walk rollups for player {player_id}: {e}")
+            return None
+
+        new_records = count_walk_rows(columns)
+        if state and not new_records:
+            return state["rollups"]
+
+        rollups = state["rollups"] if state else new_rollups()
+        add_to_rollups(rollups, columns)
+        store.save(key, {"watermark": watermark, "rollups": rollups})
+        logger.info(f"Added {new_records} walk records to the rollups of {connected_application} player {player_id}")
+        return rollups
+
+
+def iso_to_ms(date):
+    return calendar.timegm(datetime.strptime(date, "%Y-%m-%dT%H:%M:%SZ").timetuple()) * 1000
+
+
+def select_rollups(rollups, granularity, start_date=None, end_date=None, columnar=False):
+    """
+    Return the periods of one granularity that overlap the ISO 8601 date range, in chronological order.
+
+    Each period has its start as `timestamp` (epoch milliseconds) and as local `period_start`
+    (ISO 8601 with UTC offset), the summed fields and the number of `records` it aggregates.
+    """
+    range_start = iso_to_ms(start_date) if start_date else None
+    range_end = iso_to_ms(end_date) + 999 if end_date else None  # the end second is included
+
+    periods = []
+    buckets = rollups[granularity]
+    for start in sorted(int(period) for period in buckets):
+        end, steps, distance, duration, kcalories, records = buckets[str(start)]
+        if (range_start is not None and end <= range_start) or (range_end is not None and start > range_end):
+            continue
+        periods.append({
+            "timestamp": start,
+            "period_start": datetime.fromtimestamp(start / 1000, tz=DUTCH_TIMEZONE).isoformat(),
+            "steps": steps,
+            "distance_meters": distance,
+            "duration_seconds": duration,
+            "kcalories": kcalories,
+            "records": records,
+        })
+
+    if not columnar:
+        return periods
+    names = ("timestamp", "period_start") + ROLLUP_FIELDS + ("records",)
+    return {name: [period[name] for period in periods] for name in names}
+
+
+def get_walk_rollups(connected_application, player_id, auth_bearer, granularity, start_date=None, end_date=None, columnar=False):
+    """
+    Bring the player's rollups up to date and return the periods of one granularity (see select_rollups).
+
+    Returns:
+        list: The periods (dict of columns with columnar=True), or None if the walk data could not be fetched.
+    """
+    rollups = sync_walk_rollups(connected_application, player_id, auth_bearer)
+    if rollups is None:
+        return None
+    return select_rollups(rollups, granularity, start_date, end_date, columnar)
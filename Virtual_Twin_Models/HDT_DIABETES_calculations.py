@@ -1,5 +1,27 @@
+import sys
 from statistics import mean, pstdev
-from sklearn.preprocessing import MinMaxScaler
+import numpy as np
+
+# Ranges below this are treated as 1 when normalizing (the threshold of sklearn's MinMaxScaler)
+NEAR_ZERO_RANGE = 10 * sys.float_info.epsilon
+
+# Metric overview keys, in the order of the dictionaries built by the manipulate_initial_metrics_* functions
+TRIVIA_HL_METRICS = ["avg_hint", "avg_correct", "avg_incorrect"]
+SUGARVITA_PT_METRICS = [
+    "avg_score", "sd_score", "avg_playtimes", "sd_playtimes", "avg_days_session", "sd_days_session",
+    "total_home_path", "total_outdoors_path", "total_work_path",
+]
+SUGARVITA_HL_METRICS = ["avg_glucose_accuracy", "trips_to_hospital_per_game", "avg_glucose_critical_value_response"]
+
+# Score weights
+TRIVIA_HL_WEIGHTS = {"avg_hint": -0.15, "avg_correct": 1, "avg_incorrect": -0.85}
+SUGARVITA_HL_WEIGHTS = {"avg_glucose_critical_value_response": 0.15, "trips_to_hospital_per_game": -1, "avg_glucose_accuracy": 0.85}
+FINAL_HL_WEIGHTS = {"trivia": 0.6, "sugarvita": 0.4}
+PLAYER_TYPE_WEIGHTS = {
+    "Socializer": {"total_home_path": 0.5, "total_outdoors_path": 0.5},
+    "Competitive": {"avg_score": 0.3, "sd_score": 0.05},
+    "Explorer": {"avg_playtimes": 0.3, "avg_days_session": 0.15},
+}
 
 # Manipulate initial metrics for trivia
 def manipulate_initial_metrics_trivia(metrics_cleaned):
@@ -76,10 +98,19 @@ def manipulate_initial_metrics_sugarvita(metrics_cleaned):
 
 # Normalize metrics
 def normalize_metrics(metrics_overview):
-    values = [[value] for value in metrics_overview.values()]
-    scaler = MinMaxScaler()
-    normalized_values = scaler.fit_transform(values)
-    return {key: normalized_value[0] for key, normalized_value in zip(metrics_overview.keys(), normalized_values)}
+    """
+    Min-max scale the values of a metric overview to [0, 1].
+
+    Gives exactly the results of sklearn's MinMaxScaler().fit_transform on the values (a near zero
+    range is treated as 1; values are transformed as x * scale + min_), without importing sklearn.
+    """
+    values = [float(value) for value in metrics_overview.values()]
+    finite = [value for value in values if value == value]  # like the scaler, ignore NaN when fitting
+    data_min, data_max = (min(finite), max(finite)) if finite else (float("nan"), float("nan"))
+    data_range = data_max - data_min
+    scale = 1.0 / (1.0 if data_range < NEAR_ZERO_RANGE else data_range)
+    min_ = 0.0 - data_min * scale
+    return {key: value * scale + min_ for key, value in zip(metrics_overview.keys(), values)}
 
 # Calculate the final scores
 def calculate_score(weights, metrics_normalized):
@@ -92,21 +123,89 @@ def calculate_score(weights, metrics_normalized):
     return positive + negative
 
 def get_health_literacy_score_trivia(metrics_normalized):
-    weights = {"avg_hint": -0.15, "avg_correct": 1, "avg_incorrect": -0.85}
-    return calculate_score(weights, metrics_normalized)
+    return calculate_score(TRIVIA_HL_WEIGHTS, metrics_normalized)
 
 def get_health_literacy_score_sugarvita(metrics_normalized):
-    weights = {"avg_glucose_critical_value_response": 0.15, "trips_to_hospital_per_game": -1, "avg_glucose_accuracy": 0.85}
-    return calculate_score(weights, metrics_normalized)
+    return calculate_score(SUGARVITA_HL_WEIGHTS, metrics_normalized)
 
 def get_final_health_literacy_score(trivia_score, sugarvita_score):
-    weights = {"trivia": 0.6, "sugarvita": 0.4}
+    weights = FINAL_HL_WEIGHTS
     return (weights["trivia"] * trivia_score) + (weights["sugarvita"] * sugarvita_score)
 
 def get_player_types(metrics_normalized):
-    types = {
-        "Socializer": {"total_home_path": 0.5, "total_outdoors_path": 0.5},
-        "Competitive": {"avg_score": 0.3, "sd_score": 0.05},
-        "Explorer": {"avg_playtimes": 0.3, "avg_days_session": 0.15},
+    return {ptype: calculate_score(weights, metrics_normalized) for ptype, weights in PLAYER_TYPE_WEIGHTS.items()}
+
+
+# Batch scoring
+#
+# The functions below score many users at once. Each metric overview becomes one row of a matrix
+# (columns in the order of the *_METRICS lists), and normalization and scoring are array operations
+# over all rows. They give exactly the same results as the per-user functions above.
+
+def metrics_matrix(metrics_overviews, keys):
+    """
+    Stack metric overview dictionaries into a float matrix with one row per overview.
+    """
+    return np.array([[overview[key] for key in keys] for overview in metrics_overviews], dtype=np.float64).reshape(-1, len(keys))
+
+def normalize_metrics_batch(matrix):
+    """
+    Min-max scale every row of the matrix to [0, 1], like normalize_metrics does for one overview.
+
+    Uses the same arithmetic: a (near) zero range is treated as 1, and values are transformed as
+    x * scale + min_ with scale = 1 / range and min_ = 0 - row_min * scale.
+    """
+    row_min = np.nanmin(matrix, axis=1, keepdims=True)
+    row_max = np.nanmax(matrix, axis=1, keepdims=True)
+    data_range = row_max - row_min
+    data_range[data_range < NEAR_ZERO_RANGE] = 1.0
+    scale = 1.0 / data_range
+    min_ = 0.0 - row_min * scale
+    return matrix * scale + min_
+
+def calculate_score_batch(weights, normalized, keys):
+    """
+    Vectorized calculate_score over all rows; positive and negative terms are accumulated
+    separately and in weight order, as in calculate_score.
+    """
+    columns = {key: i for i, key in enumerate(keys)}
+    positive = np.zeros(normalized.shape[0])
+    negative = np.zeros(normalized.shape[0])
+    for key, value in weights.items():
+        if value > 0:
+            positive = positive + value * normalized[:, columns[key]]
+        else:
+            negative = negative + value * normalized[:, columns[key]]
+    return positive + negative
+
+def score_users_batch(trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews):
+    """
+    Compute the health literacy scores and player types of many users at once.
+
+    Args:
+        trivia_overviews (list): Trivia metric overviews (from manipulate_initial_metrics_trivia), one per user.
+        sugarvita_pt_overviews (list): SugarVita player type metric overviews, in the same user order.
+        sugarvita_hl_overviews (list): SugarVita health literacy metric overviews, in the same user order.
+
+    Returns:
+        dict: Arrays with one value per user: "trivia_score", "sugarvita_score", "final_score",
+            and "player_types", a dict of arrays per player type.
+    """
+    normalized_trivia = normalize_metrics_batch(metrics_matrix(trivia_overviews, TRIVIA_HL_METRICS))
+    normalized_sugarvita_pt = normalize_metrics_batch(metrics_matrix(sugarvita_pt_overviews, SUGARVITA_PT_METRICS))
+    normalized_sugarvita_hl = normalize_metrics_batch(metrics_matrix(sugarvita_hl_overviews, SUGARVITA_HL_METRICS))
+
+    trivia_score = calculate_score_batch(TRIVIA_HL_WEIGHTS, normalized_trivia, TRIVIA_HL_METRICS)
+    sugarvita_score = calculate_score_batch(SUGARVITA_HL_WEIGHTS, normalized_sugarvita_hl, SUGARVITA_HL_METRICS)
+    final_score = get_final_health_literacy_score(trivia_score, sugarvita_score)
+
+    player_types = {
+        ptype: calculate_score_batch(weights, normalized_sugarvita_pt, SUGARVITA_PT_METRICS)
+        for ptype, weights in PLAYER_TYPE_WEIGHTS.items()
+    }
+    return {
+        "trivia_score": trivia_score,
+        "sugarvita_score": sugarvita_score,
+        "final_score": final_score,
+        "player_types": player_types,
     }
-    return {ptype: calculate_score(weights, metrics_normalized) for ptype, weights in types.items()}
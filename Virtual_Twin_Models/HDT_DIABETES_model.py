@@ -1,5 +1,10 @@
+import argparse
 import json
+import logging
+import numpy as np
 import requests
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from HDT_DIABETES_calculations import *
 from dotenv import load_dotenv
@@ -7,35 +12,37 @@ import os
 from pytz import timezone
 import pytz
 
+# Add the project root to the Python path to use the shared score storage
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from HDT_CORE_INFRASTRUCTURE.score_storage import get_score_store
+
 # Load environment variables
 load_dotenv(dotenv_path=os.path.join("config", ".env"))
 MODEL_DEVELOPER_1_API_KEY = os.getenv("MODEL_DEVELOPER_1_API_KEY")
 
-# File paths
-JSON_FILE = "diabetes_pt_hl_storage.json"
-API_URL_TRIVIA = "http://localhost:5000/get_trivia_data"
-API_URL_SUGARVITA = "http://localhost:5000/get_sugarvita_data"
 
-# Load JSON storage file
-def load_json():
+def load_int_setting(env_var, default):
+    value = os.getenv(env_var)
+    if value is None:
+        return default
     try:
-        with open(JSON_FILE, "r") as f:
-            content = f.read().strip()
-            if not content:
-                return {"users": {}}
-            return json.loads(content)
-    except FileNotFoundError:
-        return {"users": {}}
-    except json.JSONDecodeError:
-        print("Error: JSON file is corrupted or invalid.")
-        return {"users": {}}
+        return max(1, int(value))
+    except ValueError:
+        logging.error(f"Invalid value '{value}' for {env_var}. Expected an integer.")
+        return default
 
 
-# Save JSON storage file
-def save_json(data):
-    with open(JSON_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+# Parallel scoring: worker processes (1 scores in the main process) and users per task
+SCORING_WORKERS = load_int_setting("HDT_SCORING_WORKERS", 1)
+SCORING_CHUNKSIZE = load_int_setting("HDT_SCORING_CHUNKSIZE", 256)
 
+# API endpoints
+API_URL_TRIVIA = "http://localhost:5000/get_trivia_data"
+API_URL_SUGARVITA = "http://localhost:5000/get_sugarvita_data"
+
+# Data source: "http" (the running HDT API) or "direct" (the HDT API data functions, in this process)
+DATA_SOURCES = ("http", "direct")
+DATA_SOURCE = os.getenv("HDT_MODEL_DATA_SOURCE", "http").lower()
 
 # Fetch data from the API
 def fetch_data_from_api(api_url):
@@ -50,11 +57,68 @@ def fetch_data_from_api(api_url):
         return None
 
 
+# Compute the metric overviews and scores of a chunk of users (runs in a worker process in parallel mode)
+def score_user_chunk(results):
+    trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews = [], [], []
+    for trivia_results, sugarvita_results in results:
+        sugarvita_pt_metrics, sugarvita_hl_metrics = manipulate_initial_metrics_sugarvita(sugarvita_results)
+        trivia_overviews.append(manipulate_initial_metrics_trivia(trivia_results))
+        sugarvita_pt_overviews.append(sugarvita_pt_metrics)
+        sugarvita_hl_overviews.append(sugarvita_hl_metrics)
+
+    # Normalize metrics, compute scores and determine player types for all users of the chunk at once
+    scores = score_users_batch(trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews)
+    return trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews, scores
+
+
+# Score all users, sharded over a process pool when there is more than one chunk
+def score_users(results, workers=None, chunksize=None):
+    workers = workers or SCORING_WORKERS
+    chunksize = chunksize or SCORING_CHUNKSIZE
+    if workers <= 1 or len(results) <= chunksize:
+        return score_user_chunk(results)
+
+    chunks = [results[i:i + chunksize] for i in range(0, len(results), chunksize)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        # map returns the chunks in submission order, so the merged result equals the serial one;
+        # normalization and scoring are per user, so chunking does not change any value
+        chunk_results = list(executor.map(score_user_chunk, chunks))
+
+    trivia_overviews = [overview for chunk in chunk_results for overview in chunk[0]]
+    sugarvita_pt_overviews = [overview for chunk in chunk_results for overview in chunk[1]]
+    sugarvita_hl_overviews = [overview for chunk in chunk_results for overview in chunk[2]]
+    chunk_scores = [chunk[3] for chunk in chunk_results]
+    scores = {
+        name: np.concatenate([chunk[name] for chunk in chunk_scores])
+        for name in ("trivia_score", "sugarvita_score", "final_score")
+    }
+    scores["player_types"] = {
+        ptype: np.concatenate([chunk["player_types"][ptype] for chunk in chunk_scores])
+        for ptype in PLAYER_TYPE_WEIGHTS
+    }
+    return trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews, scores
+
+
+# Fetch data in-process, with the same permission checks as the API endpoint
+def fetch_data_direct(endpoint_name):
+    from HDT_CORE_INFRASTRUCTURE import HDT_API
+    from HDT_CORE_INFRASTRUCTURE.auth import AuthorizationError
+
+    try:
+        return HDT_API.get_user_data(MODEL_DEVELOPER_1_API_KEY, endpoint_name)
+    except AuthorizationError as e:
+        print(f"Error fetching data from {endpoint_name}: {e}")
+        return None
+
+
 # Process user data
-def process_user_data(storage_data, trivia_data, sugarvita_data):
+def process_user_data(storage_data, trivia_data, sugarvita_data, workers=None, chunksize=None):
     # Convert SugarVita data to a dictionary for easier lookup
     sugarvita_dict = {user["user_id"]: user for user in sugarvita_data if "data" in user}
 
+    # Trivia and SugarVita results of the users that can be scored, in the same order
+    user_ids, results = [], []
+
     for user in trivia_data:
         user_id = user["user_id"]
 
@@ -69,29 +133,23 @@ def process_user_data(storage_data, trivia_data, sugarvita_data):
             continue
 
         # Extract trivia and SugarVita metrics
-        trivia_results = user["data"]["trivia_results"]
-        sugarvita_results = sugarvita_dict[user_id]["data"]["sugarvita_results"]
+        user_ids.append(user_id)
+        results.append((user["data"]["trivia_results"], sugarvita_dict[user_id]["data"]["sugarvita_results"]))
 
-        # Manipulate and normalize metrics
-        trivia_metrics = manipulate_initial_metrics_trivia(trivia_results)
-        sugarvita_pt_metrics, sugarvita_hl_metrics = manipulate_initial_metrics_sugarvita(sugarvita_results)
+    # Manipulate and normalize metrics, compute scores and determine player types
+    trivia_overviews, sugarvita_pt_overviews, sugarvita_hl_overviews, scores = score_users(results, workers, chunksize)
+    # One timestamp for the whole run, also when users are scored in parallel
+    date = datetime.now(tz=timezone('Europe/Amsterdam')).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Normalize metrics
-        normalized_trivia = normalize_metrics(trivia_metrics)
-        normalized_sugarvita_pt = normalize_metrics(sugarvita_pt_metrics)
-        normalized_sugarvita_hl = normalize_metrics(sugarvita_hl_metrics)
-
-        # Compute scores
-        trivia_score = get_health_literacy_score_trivia(normalized_trivia)
-        sugarvita_score = get_health_literacy_score_sugarvita(normalized_sugarvita_hl)
-        final_score = get_final_health_literacy_score(trivia_score, sugarvita_score)
-
-        # Determine player types
-        player_types = get_player_types(normalized_sugarvita_pt)
+    for i, user_id in enumerate(user_ids):
+        trivia_score = scores["trivia_score"][i]
+        sugarvita_score = scores["sugarvita_score"][i]
+        final_score = scores["final_score"][i]
+        player_types = {ptype: values[i] for ptype, values in scores["player_types"].items()}
 
         # Prepare new entry for JSON storage
         new_entry = {
-            "date": datetime.now(tz=timezone('Europe/Amsterdam')).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "date": date,
             "final_scores": {
                 "health_literacy_score": {
                     "domain": {"name": "diabetes", "score": final_score, "sources": {"trivia": trivia_score, "sugarvita": sugarvita_score}}
@@ -99,8 +157,8 @@ def process_user_data(storage_data, trivia_data, sugarvita_data):
                 "player_types_labels": player_types,
             },
             "metrics_overviews": {
-                "trivia": trivia_metrics,
-                "sugarvita": {"pt": sugarvita_pt_metrics, "hl": sugarvita_hl_metrics},
+                "trivia": trivia_overviews[i],
+                "sugarvita": {"pt": sugarvita_pt_overviews[i], "hl": sugarvita_hl_overviews[i]},
             },
         }
 
@@ -109,18 +167,29 @@ def process_user_data(storage_data, trivia_data, sugarvita_data):
         user_storage["entries"].append(new_entry)
 
 
-def main():
-    # Load storage data
-    storage_data = load_json()
+def main(data_source=None):
+    data_source = data_source or DATA_SOURCE
+    if data_source not in DATA_SOURCES:
+        print(f"Unknown data source '{data_source}'. Use one of {', '.join(DATA_SOURCES)}. Exiting.")
+        return
+
+    # New entries of this run; they are appended to the score store in one write
+    storage_data = {"users": {}}
 
     # Fetch trivia data
-    trivia_data = fetch_data_from_api(API_URL_TRIVIA)
+    if data_source == "direct":
+        trivia_data = fetch_data_direct("get_trivia_data")
+    else:
+        trivia_data = fetch_data_from_api(API_URL_TRIVIA)
     if not trivia_data:
         print("Failed to fetch trivia data. Exiting.")
         return
 
     # Fetch SugarVita data
-    sugarvita_data = fetch_data_from_api(API_URL_SUGARVITA)
+    if data_source == "direct":
+        sugarvita_data = fetch_data_direct("get_sugarvita_data")
+    else:
+        sugarvita_data = fetch_data_from_api(API_URL_SUGARVITA)
     if not sugarvita_data:
         print("Failed to fetch SugarVita data. Exiting.")
         return
@@ -128,10 +197,15 @@ def main():
     # Process user data
     process_user_data(storage_data, trivia_data, sugarvita_data)
 
-    # Save updated storage data
-    save_json(storage_data)
+    # Save the new entries (diabetes_pt_hl_storage.json unless HDT_SCORE_STORE selects another backend)
+    get_score_store().append_entries(
+        {user_id: user_storage["entries"] for user_id, user_storage in storage_data["users"].items()}
+    )
     print("User data successfully processed and saved.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Score the diabetes twin models of all permitted users.")
+    parser.add_argument("--source", choices=DATA_SOURCES, help="fetch the data over HTTP from the running API (default) "
+                        "or directly in this process, without an API server (default: HDT_MODEL_DATA_SOURCE)")
+    main(parser.parse_args().source)
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of the glucose critical-value response computation on long SugarVita sessions.
+
+Compares the previous nested-loop implementation with the single-pass and the NumPy ragged-batch
+implementations, and checks that all three return identical results.
+
+Usage (from the project root):
+    python benchmarks/glucose_response_benchmark.py [--playthroughs 200] [--turns 5000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_parse import (  # noqa: E402
+    BLOOD_GLUCOSE_COLORED_REGIONS,
+    critical_value_response_batch,
+    critical_value_response_single_pass,
+)
+
+
+def nested_loop_response(glucose_levels, times):
+    """
+    The previous implementation: for every red candidate, re-scan the range table and the rest of the session.
+    """
+    regions = BLOOD_GLUCOSE_COLORED_REGIONS
+    responses = []
+    for glucose_playthrough, times_playthrough in zip(glucose_levels, times):
+        if not glucose_playthrough or not times_playthrough:
+            continue
+        values = {"red_glucose_value": -1, "closest_green_glucose_value": -1, "time_red": -1, "time_closest_green": -1}
+        for i, glucose in enumerate(glucose_playthrough):
+            is_red = any(low <= glucose <= high for low, high in regions["red"])
+            if is_red and values["red_glucose_value"] == -1:
+                values["red_glucose_value"] = glucose
+                values["time_red"] = times_playthrough[i]
+                for j in range(i + 1, len(glucose_playthrough)):
+                    if any(low <= glucose_playthrough[j] <= high for low, high in regions["green"]):
+                        values["closest_green_glucose_value"] = glucose_playthrough[j]
+                        values["time_closest_green"] = times_playthrough[j]
+                        break
+                if values["red_glucose_value"] != -1 and values["closest_green_glucose_value"] != -1:
+                    response_time = values["time_closest_green"] - values["time_red"]
+                    if response_time > 0:
+                        responses.append(response_time)
+                    break
+    return responses
+
+
+def make_sessions(playthroughs, turns, seed=42):
+    """
+    Generate long playthroughs whose first red value, if any, comes late and is rarely followed by green.
+    """
+    rng = random.Random(seed)
+    glucose_levels, times = [], []
+    for _ in range(playthroughs):
+        glucose = [round(rng.uniform(8.5, 14.5), 1) for _ in range(turns)]
+        if rng.random() < 0.8:
+            red_at = rng.randrange(turns // 2, turns)
+            glucose[red_at] = round(rng.uniform(15, 20), 1)
+            if rng.random() < 0.5:
+                glucose[rng.randrange(red_at, turns)] = round(rng.uniform(4.5, 8), 1)
+        glucose_levels.append(glucose)
+        times.append(list(range(0, 5 * turns, 5)))
+    return glucose_levels, times
+
+
+def time_call(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the glucose critical-value response computation.")
+    parser.add_argument("--playthroughs", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5000, help="glucose readings per playthrough")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per implementation (the median is reported)")
+    args = parser.parse_args()
+
+    glucose_levels, times = make_sessions(args.playthroughs, args.turns)
+    playthroughs = list(zip(glucose_levels, times))
+    implementations = {
+        "nested loop": lambda: nested_loop_response(glucose_levels, times),
+        "single pass": lambda: critical_value_response_single_pass(playthroughs, BLOOD_GLUCOSE_COLORED_REGIONS),
+        "numpy batch": lambda: critical_value_response_batch(playthroughs, BLOOD_GLUCOSE_COLORED_REGIONS),
+    }
+
+    print(f"{args.playthroughs} playthroughs x {args.turns} readings")
+    baseline_ms, expected = None, None
+    for name, fn in implementations.items():
+        median_ms, result = time_call(fn, args.runs)
+        if expected is None:
+            baseline_ms, expected = median_ms, result
+        elif result != expected:
+            print(f"{name} returned different results")
+            sys.exit(1)
+        print(f"{name:<12} median {median_ms:9.1f} ms  speedup {baseline_ms / median_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Micro-benchmark of the GameBus parsers: parses synthetic, already decoded activities and reports the
+throughput per parser in activities per second.
+
+Compares the previous if/elif parsers with the current table-driven ones, and checks that both
+return identical results.
+
+Usage (from the project root):
+    python benchmarks/parse_benchmark.py [--activities 20000] [--runs 5]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_parse import (  # noqa: E402
+    get_glucose_critical_value_response,
+    latest_of,
+    parse_sugarvita_activities,
+    parse_trivia_activities,
+)
+from HDT_CORE_INFRASTRUCTURE.GAMEBUS_WALK_parse import parse_walk_activities  # noqa: E402
+
+
+def utc_timestamp(activity):
+    return datetime.utcfromtimestamp(activity["date"] / 1000).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def previous_parse_trivia(activities):
+    """
+    The previous trivia parser: every property instance is compared with each translationKey in turn.
+    """
+    metrics = {"WITH_HINT": {"TRUE": 0, "FALSE": 0}, "NO_HINT_TYPE_OF_ANSWER": {"CORRECT": 0, "INCORRECT": 0}}
+    latest_activity = None
+    for record in activities:
+        through_hint = None
+        latest_activity = latest_of(latest_activity, record)
+        for element in record["propertyInstances"]:
+            if "property" not in element or "translationKey" not in element["property"]:
+                continue
+            if element["property"]["translationKey"] == "THROUGH_HINT":
+                if element["value"] == "true":
+                    metrics["WITH_HINT"]["TRUE"] += 1
+                    through_hint = True
+                elif element["value"] == "false":
+                    metrics["WITH_HINT"]["FALSE"] += 1
+                    through_hint = False
+            if element["property"]["translationKey"] == "QUESTION_CORRECT" and through_hint is False:
+                if element["value"] == "true":
+                    metrics["NO_HINT_TYPE_OF_ANSWER"]["CORRECT"] += 1
+                elif element["value"] == "false":
+                    metrics["NO_HINT_TYPE_OF_ANSWER"]["INCORRECT"] += 1
+    return metrics, {"id": latest_activity["id"], "timestamp": utc_timestamp(latest_activity)}
+
+
+def previous_parse_sugarvita(playthroughs, engagements):
+    """
+    The previous SugarVita parser: if-chains per property instance, nested documents decoded with json.
+    """
+    metrics_per_session = {key: [] for key in (
+        "SCORES", "PLAYTIMES", "DAYS_PLAYED", "HOME_PATH", "WORK_PATH", "OUTDOORS_PATH", "GLUCOSE_ACCURACY",
+        "GLUCOSE_LEVELS", "SCORE_VARIATION", "TOTAL_TRIPS_HOSPITAL", "GLUCOSE_CRITICAL_VALUE_RESPONSE", "TURN_TIME",
+    )}
+    latest_activity_info = {"playthrough": {"id": None, "timestamp": None}, "engagement": {"id": None, "timestamp": None}}
+    latest_playthrough, latest_engagement = None, None
+
+    for record in playthroughs:
+        latest_playthrough = latest_of(latest_playthrough, record)
+        for element in record["propertyInstances"]:
+            key = element["property"]["translationKey"]
+            if key == "SCORE":
+                metrics_per_session["SCORES"].append(int(element["value"]))
+            if key == "PLAYTIME":
+                metrics_per_session["PLAYTIMES"].append(int(element["value"]))
+            if key == "GLUCOSE_RANGE_PERCENTAGE":
+                metrics_per_session["GLUCOSE_ACCURACY"].append(int(element["value"]))
+            if key == "PLAYTHROUGH_DATA":
+                playthrough_data = json.loads(element["value"])
+                metrics_per_session["DAYS_PLAYED"].append(playthrough_data["daysPlayed"])
+                home_path, outdoors_path, work_path = 0, 0, 0
+                for turn in playthrough_data["turns"]:
+                    if turn["DestinationPathType"] == 1:
+                        home_path += 1
+                    elif turn["DestinationPathType"] == 2:
+                        outdoors_path += 1
+                    elif turn["DestinationPathType"] == 3:
+                        work_path += 1
+                metrics_per_session["HOME_PATH"].append(home_path)
+                metrics_per_session["WORK_PATH"].append(work_path)
+                metrics_per_session["OUTDOORS_PATH"].append(outdoors_path)
+    if latest_playthrough is not None:
+        latest_activity_info["playthrough"] = {"id": latest_playthrough["id"], "timestamp": utc_timestamp(latest_playthrough)}
+
+    for record in engagements:
+        latest_engagement = latest_of(latest_engagement, record)
+        current_score, glucose_values_each_turn, turn_time, is_hospitalised = [], [], [], 0
+        for element in record["propertyInstances"]:
+            if element["property"]["translationKey"] != "ENGAGEMENT_DATA":
+                continue
+            for gameplaydata in json.loads(element["value"])["GameplayData"]:
+                gameplaydata_values = json.loads(gameplaydata["Values"][0])
+                if gameplaydata_values["aborted"] is False:
+                    for turn in gameplaydata_values["turns"]:
+                        if turn["CurrentScore"] != 0:
+                            current_score.append(turn["CurrentScore"])
+                        if turn["IsHospitalised"]:
+                            is_hospitalised += 1
+                        if glucose_values_each_turn == [] and turn_time == []:
+                            glucose_values_each_turn.append(turn["GlucoseValueStart"])
+                            if turn["GlucoseValueEnd"] != 0.0:
+                                glucose_values_each_turn.append(turn["GlucoseValueEnd"])
+                            turn_time.append(turn["MinutesStart"])
+                            if turn["MinutesEnd"] != 0:
+                                turn_time.append(turn["MinutesEnd"])
+                        else:
+                            glucose_values_each_turn.append(turn["GlucoseValueEnd"])
+                            turn_time.append(turn["MinutesEnd"])
+                    if current_score and turn_time and glucose_values_each_turn:
+                        metrics_per_session["SCORE_VARIATION"].append(current_score[:-1] if current_score[-1] == 0 else current_score)
+                        metrics_per_session["TURN_TIME"].append(turn_time[:-1] if turn_time[-1] == 0 else turn_time)
+                        metrics_per_session["GLUCOSE_LEVELS"].append(glucose_values_each_turn[:-1] if glucose_values_each_turn[-1] == 0 else glucose_values_each_turn)
+                        metrics_per_session["TOTAL_TRIPS_HOSPITAL"].append(is_hospitalised)
+    if latest_engagement is not None:
+        latest_activity_info["engagement"] = {"id": latest_engagement["id"], "timestamp": utc_timestamp(latest_engagement)}
+
+    metrics_per_session["GLUCOSE_CRITICAL_VALUE_RESPONSE"] = get_glucose_critical_value_response(
+        metrics_per_session["GLUCOSE_LEVELS"], metrics_per_session["TURN_TIME"]
+    )
+    return metrics_per_session, latest_activity_info
+
+
+def previous_parse_walk(activities_json):
+    """
+    The previous walk parser: a pytz conversion per activity and an if/elif chain per property instance.
+    """
+    parsed_activities = []
+    for activity in activities_json:
+        utc_time = datetime.utcfromtimestamp(activity['date'] / 1000).replace(tzinfo=pytz.utc)
+        activity_data = {'date': utc_time.astimezone(pytz.timezone('Europe/Amsterdam')).strftime('%Y-%m-%d %H:%M:%S')}
+        steps = distance = duration = kcalories = None
+        for property_instance in activity.get('propertyInstances', []):
+            prop_key = property_instance['property']['translationKey']
+            value = property_instance['value']
+            base_unit = property_instance['property']['baseUnit']
+            if prop_key == 'STEPS':
+                steps = float(value)
+            elif prop_key == 'DISTANCE':
+                if base_unit == 'meters':
+                    distance = float(value)
+                elif base_unit == 'centimeters':
+                    distance = float(value) / 100
+                elif base_unit == 'kilometers':
+                    distance = float(value) * 1000
+            elif prop_key == 'DURATION':
+                if base_unit == 'seconds':
+                    duration = str(timedelta(seconds=int(value)))
+                elif base_unit == 'minutes':
+                    duration = str(timedelta(seconds=int(float(value) * 60)))
+                elif base_unit == 'hours':
+                    duration = str(timedelta(seconds=int(float(value) * 3600)))
+            elif prop_key == 'KCALORIES':
+                kcalories = float(value)
+        activity_data.update(steps=steps, distance_meters=distance, duration=duration, kcalories=kcalories)
+        parsed_activities.append(activity_data)
+    return parsed_activities
+
+
+def property_instance(translation_key, value, base_unit=None):
+    return {
+        "id": random.randint(1, 10**9),
+        "value": value,
+        "property": {"id": random.randint(1, 1000), "translationKey": translation_key, "baseUnit": base_unit, "inputType": "STRING"},
+    }
+
+
+def activity(index, properties):
+    return {"id": index, "date": 1700000000000 + index * 60000, "gameDescriptor": {"id": 1}, "propertyInstances": properties}
+
+
+def trivia_activity(index, rng):
+    return activity(index, [
+        property_instance("QUESTION", f"Question {rng.randint(1, 500)}"),
+        property_instance("ANSWER", f"Answer {rng.randint(1, 4)}"),
+        property_instance("THROUGH_HINT", rng.choice(["true", "false"])),
+        property_instance("QUESTION_CORRECT", rng.choice(["true", "false"])),
+        property_instance("DIFFICULTY", str(rng.randint(1, 3))),
+        property_instance("DURATION", str(rng.randint(5, 60)), "seconds"),
+    ])
+
+
+def playthrough_activity(index, rng):
+    turns = [{"DestinationPathType": rng.randint(1, 3)} for _ in range(rng.randint(5, 15))]
+    return activity(index, [
+        property_instance("SCORE", str(rng.randint(0, 1000))),
+        property_instance("PLAYTIME", str(rng.randint(60, 900)), "seconds"),
+        property_instance("GLUCOSE_RANGE_PERCENTAGE", str(rng.randint(0, 100))),
+        property_instance("PLAYTHROUGH_DATA", json.dumps({"daysPlayed": rng.randint(1, 7), "turns": turns})),
+        property_instance("VERSION", "1.4.2"),
+        property_instance("PLATFORM", "android"),
+    ])
+
+
+def engagement_activity(index, rng):
+    turns = [
+        {
+            "CurrentScore": rng.randint(0, 100), "IsHospitalised": rng.random() < 0.05,
+            "GlucoseValueStart": round(rng.uniform(2, 20), 1), "GlucoseValueEnd": round(rng.uniform(2, 20), 1),
+            "MinutesStart": turn * 30, "MinutesEnd": turn * 30 + 30,
+        }
+        for turn in range(rng.randint(3, 8))
+    ]
+    gameplay = [{"Values": [json.dumps({"aborted": rng.random() < 0.1, "turns": turns})]}]
+    return activity(index, [
+        property_instance("ENGAGEMENT_DATA", json.dumps({"GameplayData": gameplay})),
+        property_instance("VERSION", "1.4.2"),
+    ])
+
+
+def walk_activity(index, rng):
+    return activity(index, [
+        property_instance("STEPS", str(rng.randint(100, 20000)), "count"),
+        property_instance("DISTANCE", str(rng.randint(100, 20000)), "meters"),
+        property_instance("DURATION", str(rng.randint(60, 7200)), "seconds"),
+        property_instance("KCALORIES", str(rng.randint(10, 900)), "kcal"),
+        property_instance("SPEED", str(rng.uniform(2, 6)), "km/h"),
+    ])
+
+
+def time_call(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GameBus parsers.")
+    parser.add_argument("--activities", type=int, default=20000, help="synthetic activities per parser")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per parser (the median is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    random.seed(42)
+    count = args.activities
+    trivia = [trivia_activity(i, rng) for i in range(count)]
+    playthroughs = [playthrough_activity(i, rng) for i in range(count)]
+    engagements = [engagement_activity(i, rng) for i in range(count)]
+    walks = [walk_activity(i, rng) for i in range(count)]
+
+    # name -> (previous parser, current parser)
+    parsers = {
+        "trivia": (lambda: previous_parse_trivia(trivia), lambda: parse_trivia_activities(trivia)),
+        "sugarvita playthrough": (lambda: previous_parse_sugarvita(playthroughs, []), lambda: parse_sugarvita_activities(playthroughs, [])),
+        "sugarvita engagement": (lambda: previous_parse_sugarvita([], engagements), lambda: parse_sugarvita_activities([], engagements)),
+        "walk": (lambda: previous_parse_walk(walks), lambda: parse_walk_activities(walks)),
+    }
+    print(f"{count} activities per parser")
+    for name, (previous, current) in parsers.items():
+        previous_seconds, expected = time_call(previous, args.runs)
+        seconds, result = time_call(current, args.runs)
+        if result != expected:
+            print(f"{name} returned different results")
+            sys.exit(1)
+        print(
+            f"{name:<22} previous {previous_seconds * 1000:8.1f} ms  current {seconds * 1000:8.1f} ms"
+            f"  {count / seconds:10.0f} activities/s  speedup {previous_seconds / seconds:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark of the diabetes model scoring: scores synthetic users with process_user_data for several
+worker counts, checks that every parallel run gives exactly the entries of the serial run, and
+reports the throughput in users per second.
+
+Usage (from the project root):
+    python benchmarks/scoring_benchmark.py [--users 20000] [--sessions 50] [--workers 1,2,4] [--chunksize 256] [--runs 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Virtual_Twin_Models"))
+
+from HDT_DIABETES_model import process_user_data  # noqa: E402
+
+SUGARVITA_LISTS = [
+    "SCORES", "PLAYTIMES", "DAYS_PLAYED", "HOME_PATH", "OUTDOORS_PATH", "WORK_PATH",
+    "GLUCOSE_ACCURACY", "TOTAL_TRIPS_HOSPITAL", "GLUCOSE_CRITICAL_VALUE_RESPONSE",
+]
+
+
+def synthetic_users(count, sessions, rng):
+    """
+    Return (trivia_data, sugarvita_data) shaped like the responses of the data endpoints.
+    """
+    trivia_data, sugarvita_data = [], []
+    for user_id in range(1, count + 1):
+        answers = rng.randint(0, 200)
+        with_hint = rng.randint(0, answers)
+        correct = rng.randint(0, answers - with_hint)
+        trivia_data.append({"user_id": user_id, "data": {"trivia_results": {
+            "WITH_HINT": {"TRUE": with_hint, "FALSE": answers - with_hint},
+            "NO_HINT_TYPE_OF_ANSWER": {"CORRECT": correct, "INCORRECT": answers - with_hint - correct},
+        }}})
+        sugarvita_results = {name: [rng.randint(0, 1000) for _ in range(rng.randint(0, sessions))] for name in SUGARVITA_LISTS}
+        sugarvita_data.append({"user_id": user_id, "data": {"sugarvita_results": sugarvita_results}})
+    return trivia_data, sugarvita_data
+
+
+def score(trivia_data, sugarvita_data, workers, chunksize):
+    storage_data = {"users": {}}
+    process_user_data(storage_data, trivia_data, sugarvita_data, workers=workers, chunksize=chunksize)
+    # The run date differs between runs; everything else must be identical
+    return {
+        user_id: [{key: value for key, value in entry.items() if key != "date"} for entry in user["entries"]]
+        for user_id, user in storage_data["users"].items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial and parallel diabetes model scoring.")
+    parser.add_argument("--users", type=int, default=20000, help="synthetic users")
+    parser.add_argument("--sessions", type=int, default=50, help="maximum sessions per SugarVita metric list")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})),
+                        help="comma-separated worker counts")
+    parser.add_argument("--chunksize", type=int, default=256, help="users per task")
+    parser.add_argument("--runs", type=int, default=3, help="repetitions per worker count (the median is reported)")
+    args = parser.parse_args()
+
+    trivia_data, sugarvita_data = synthetic_users(args.users, args.sessions, random.Random(42))
+    print(f"{args.users} users, chunksize {args.chunksize}, {os.cpu_count()} CPUs")
+
+    reference = score(trivia_data, sugarvita_data, 1, args.chunksize)
+    for workers in (int(n) for n in args.workers.split(",")):
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            entries = score(trivia_data, sugarvita_data, workers, args.chunksize)
+            timings.append(time.perf_counter() - started)
+        identical = entries == reference
+        seconds = statistics.median(timings)
+        print(f"workers {workers:>3}  {seconds * 1000:9.1f} ms  {args.users / seconds:10.0f} users/s  identical: {identical}")
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Start-up benchmark: measures the import time of the HDT entry points in fresh interpreters and fails
+when it exceeds its budget, or when a module that should be loaded lazily is imported at start-up.
+
+Usage (from the project root):
+    python benchmarks/startup_benchmark.py [--runs 5]
+
+Budgets in milliseconds can be overridden with environment variables:
+    HDT_IMPORT_BUDGET_MS_API           HDT API (default 600)
+    HDT_IMPORT_BUDGET_MS_CALCULATIONS  Diabetes model calculations (default 400)
+The exit code is 1 if any target is over budget, so the script can run in CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# name: (module, extra sys.path entry, budget env var, default budget in ms, modules that must not be loaded)
+TARGETS = {
+    "api": (
+        "HDT_CORE_INFRASTRUCTURE.HDT_API", None, "HDT_IMPORT_BUDGET_MS_API", 600,
+        ["sklearn", "aiohttp", "requests", "HDT_CORE_INFRASTRUCTURE.GAMEBUS_DIABETES_fetch"],
+    ),
+    "calculations": (
+        "HDT_DIABETES_calculations", os.path.join(PROJECT_ROOT, "Virtual_Twin_Models"), "HDT_IMPORT_BUDGET_MS_CALCULATIONS", 400,
+        ["sklearn"],
+    ),
+}
+
+MEASURE_SCRIPT = """
+import json, sys, time
+if {path!r}:
+    sys.path.insert(0, {path!r})
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{"elapsed_ms": elapsed_ms, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, path, forbidden):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        tuple: (import time in ms, forbidden modules that were loaded)
+    """
+    script = MEASURE_SCRIPT.format(module=module, path=path, forbidden=forbidden)
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    return result["elapsed_ms"], result["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the HDT entry points.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target (the median is reported)")
+    args = parser.parse_args()
+
+    failed = False
+    for name, (module, path, budget_env, default_budget, forbidden) in TARGETS.items():
+        budget_ms = float(os.getenv(budget_env, default_budget))
+        timings, loaded = [], set()
+        for _ in range(args.runs):
+            elapsed_ms, loaded_modules = measure(module, path, forbidden)
+            timings.append(elapsed_ms)
+            loaded.update(loaded_modules)
+
+        median_ms = statistics.median(timings)
+        status = "OK"
+        if median_ms > budget_ms:
+            status = "OVER BUDGET"
+            failed = True
+        if loaded:
+            status = f"EAGERLY LOADS {', '.join(sorted(loaded))}"
+            failed = True
+        print(f"{name:<14} {module:<36} median {median_ms:7.1f} ms  budget {budget_ms:7.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
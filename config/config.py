@@ -1,36 +1,74 @@
 import os
 import json
-from dotenv import load_dotenv
 import logging
 from logging import FileHandler
 
-# Configure logging
-# Use absolute path for log file
-log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logging.log')
-logging.basicConfig(
-    level=logging.INFO,  # Set global logging level to INFO
-    format='%(asctime)s [%(levelname)s] [%(name)s]: %(message)s',  # Ensure root logger uses the same format
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        FileHandler(log_file_path)  # Use absolute path for log file
-    ]
-)
-
-# Suppress debug logs from external libraries by setting their level to WARNING
-logging.getLogger("urllib3").setLevel(logging.WARNING)
-logging.getLogger("requests").setLevel(logging.WARNING)
-# Add any other external loggers you wish to suppress
-
-# Load environment variables from the .env file located in the config folder
-dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-load_dotenv(dotenv_path=dotenv_path)  # Use absolute path for .env file
-
-def load_external_parties(filepath=None):
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def configure_logging():
+    """
+    Configure the root logger to write to config/logging.log.
+
+    Called explicitly by the entry points (e.g. the HDT API) rather than on import, so that importing
+    this module has no side effects. Calling it again has no effect.
+    """
+    # Use absolute path for log file
+    log_file_path = os.path.join(CONFIG_DIR, 'logging.log')
+    logging.basicConfig(
+        level=logging.INFO,  # Set global logging level to INFO
+        format='%(asctime)s [%(levelname)s] [%(name)s]: %(message)s',  # Ensure root logger uses the same format
+        datefmt='%Y-%m-%d %H:%M:%S',
+        handlers=[
+            FileHandler(log_file_path)  # Use absolute path for log file
+        ]
+    )
+
+    # Suppress debug logs from external libraries by setting their level to WARNING
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    logging.getLogger("requests").setLevel(logging.WARNING)
+    # Add any other external loggers you wish to suppress
+
+
+# Names of the variables set outside the .env file, recorded on the first load_environment() call
+_process_environment = None
+# Names set from the .env file by the previous load, so that variables removed from it can be unset
+_dotenv_environment = set()
+
+
+def load_environment():
+    """
+    Load environment variables from the .env file located in the config folder.
+    Variables that are already set in the environment take precedence.
+
+    Calling it again (e.g. on a configuration reload) applies the variables added or changed in the
+    .env file since, and unsets those removed from it, still without touching those set outside it.
+    """
+    from dotenv import dotenv_values
+
+    global _process_environment, _dotenv_environment
+    if _process_environment is None:
+        _process_environment = set(os.environ)
+
+    dotenv_path = os.path.join(CONFIG_DIR, '.env')  # Use absolute path for .env file
+    loaded = set()
+    for name, value in dotenv_values(dotenv_path).items():
+        if value is not None and name not in _process_environment:
+            os.environ[name] = value
+            loaded.add(name)
+
+    for name in _dotenv_environment - loaded:
+        os.environ.pop(name, None)
+    _dotenv_environment = loaded
+
+
+def load_external_parties(filepath=None, strict=False):
     """
     Load external parties from the specified JSON file, adding API keys from environment variables.
+    With strict=True, a missing or malformed file raises instead of yielding an empty list.
     """
     if filepath is None:
-        filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'external_parties.json')
+        filepath = os.path.join(CONFIG_DIR, 'external_parties.json')
     try:
         with open(filepath, 'r') as f:
             external_parties = json.load(f)['external_parties']
@@ -47,23 +85,50 @@ def load_external_parties(filepath=None):
         return external_parties
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
+        if strict:
+            raise
         return []
     except json.JSONDecodeError:
         logging.error(f"Failed to parse JSON file: {filepath}")
+        if strict:
+            raise
         return []
 
-def load_user_permissions(filepath=None):
+def load_user_permissions(filepath=None, strict=False):
     """
     Load user permissions from the specified JSON file.
+    With strict=True, a missing or malformed file raises instead of yielding an empty dict.
     """
     if filepath is None:
-        filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'user_permissions.json')
+        filepath = os.path.join(CONFIG_DIR, 'user_permissions.json')
     try:
         with open(filepath, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
         logging.error(f"File not found: {filepath}")
+        if strict:
+            raise
         return {}
     except json.JSONDecodeError:
         logging.error(f"Failed to parse JSON file: {filepath}")
+        if strict:
+            raise
         return {}
+
+def load_endpoint_concurrency(endpoint_name, default=8):
+    """
+    Load the maximum number of users an endpoint may fetch concurrently.
+
+    The cap is read from the HDT_MAX_WORKERS_<ENDPOINT_NAME> environment variable (e.g.
+    HDT_MAX_WORKERS_GET_WALK_DATA), falling back to HDT_MAX_WORKERS and then to `default`.
+    A value of 1 restores the sequential behaviour.
+    """
+    for env_var in (f"HDT_MAX_WORKERS_{endpoint_name.upper()}", "HDT_MAX_WORKERS"):
+        value = os.getenv(env_var)
+        if value is None:
+            continue
+        try:
+            return max(1, int(value))
+        except ValueError:
+            logging.error(f"Invalid value '{value}' for {env_var}. Expected an integer.")
+    return default